@@ -0,0 +1,232 @@
+"""
+Seeded graph families and the benchmark cases run by benchmarks/run.py.
+
+Every case builds its graph outside the timed region, runs one public
+function and cross-checks the result against NetworkX (or a known answer),
+so a benchmark can never get faster by becoming wrong.
+"""
+import json
+import os
+import subprocess
+import sys
+import networkx as nx
+from graph_analysis import (analyze_graph, count_circuits, count_cycles, cyclomatic_number, generate_graph_with_conditions,
+                            generate_random_graph, has_eulerian_circuit, has_hamiltonian_cycle, minimum_cycle_basis)
+
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Seconds a bare `import graph_analysis` may take in a fresh interpreter
+IMPORT_BUDGET = 0.05
+
+# Seconds importing a name (and the submodules behind it) may take
+NAME_IMPORT_BUDGET = 1.0
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"time": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+class Case:
+    """
+    One benchmark: a graph builder, the timed call and its cross-check.
+
+    run(G, budget) is timed; the budget never limits anything, its step
+    counter is recorded as the number of operations. check(G, result) raises
+    AssertionError when the result disagrees with the reference.
+    """
+
+    def __init__(self, name, build, run, check):
+        self.name = name
+        self.build = build
+        self.run = run
+        self.check = check
+
+
+def gnp(n, p, seed, directed=False):
+    return lambda: nx.gnp_random_graph(n, p, seed=seed, directed=directed)
+
+
+def grid(rows, cols):
+    return lambda: nx.convert_node_labels_to_integers(nx.grid_2d_graph(rows, cols))
+
+
+FAMILIES = {
+    "gnp-10-0.3": gnp(10, 0.3, seed=1),
+    "gnp-14-0.3": gnp(14, 0.3, seed=2),
+    "gnp-18-0.2": gnp(18, 0.2, seed=3),
+    "gnp-20-0.3": gnp(20, 0.3, seed=4),
+    "complete-8": lambda: nx.complete_graph(8),
+    "complete-12": lambda: nx.complete_graph(12),
+    "complete-101": lambda: nx.complete_graph(101),
+    "cycle-200": lambda: nx.cycle_graph(200),
+    "ladder-8": lambda: nx.ladder_graph(8),
+    "grid-3x5": grid(3, 5),
+    "grid-4x4": grid(4, 4),
+    "grid-4x5": grid(4, 5),
+    "petersen": nx.petersen_graph,
+    "dodecahedral": nx.dodecahedral_graph,
+    "digraph-gnp-18-0.2": gnp(18, 0.2, seed=11, directed=True),
+    "digraph-gnp-30-0.2": gnp(30, 0.2, seed=12, directed=True),
+}
+
+
+def _reference_cycle_count(G):
+    return sum(1 for _ in nx.simple_cycles(G if G.is_directed() else nx.Graph(G)))
+
+
+def _check_cycle_count(G, result):
+    assert result == _reference_cycle_count(G), f"{result} cycles, NetworkX finds {_reference_cycle_count(G)}"
+
+
+def _check_subcubic_circuit_count(G, result):
+    # Without a vertex of degree 4 no closed trail can revisit a vertex, so circuits are cycles
+    assert max(dict(G.degree()).values()) <= 3
+    _check_cycle_count(G, result)
+
+
+def _check_cyclomatic(G, result):
+    expected = G.number_of_edges() - G.number_of_nodes() + nx.number_connected_components(G)
+    assert result == expected, f"cyclomatic number {result}, expected {expected}"
+
+
+def _check_minimum_cycle_basis(G, result):
+    _check_cyclomatic(G, len(result))
+    total = sum(len(cycle) for cycle in result)
+    expected = sum(len(cycle) for cycle in nx.minimum_cycle_basis(G))
+    assert total == expected, f"basis of total length {total}, NetworkX finds {expected}"
+
+
+def _check_hamiltonian(expected):
+    def check(G, result):
+        has_cycle, cycle = result
+        assert has_cycle == expected, f"has_hamiltonian_cycle returned {has_cycle}, expected {expected}"
+        if has_cycle:
+            assert sorted(cycle) == sorted(G.nodes()), "cycle does not visit every node once"
+            assert all(G.has_edge(cycle[i - 1], cycle[i]) for i in range(len(cycle))), "cycle uses a missing edge"
+    return check
+
+
+def _check_eulerian(G, result):
+    has_circuit, circuit = result
+    assert has_circuit == nx.is_eulerian(G), f"has_eulerian_circuit returned {has_circuit}, NetworkX disagrees"
+    if has_circuit:
+        walked = {frozenset(edge) for edge in zip(circuit, circuit[1:])}
+        assert len(circuit) == G.number_of_edges() + 1 and walked == {frozenset(edge) for edge in G.edges()}
+
+
+def _check_generated(num_nodes, conditions):
+    def check(G, result):
+        H, attempts, _ = result
+        assert H is not None, f"no graph generated in {attempts} attempts"
+        assert H.number_of_nodes() == num_nodes
+        if conditions.get('must_be_connected'):
+            assert nx.is_connected(H), "generated graph is not connected"
+        if conditions.get('all_verticies_even_degree'):
+            assert all(degree % 2 == 0 for _, degree in H.degree()), "generated graph has an odd degree"
+    return check
+
+
+def _check_random_graph(num_nodes, edge_probability):
+    def check(G, result):
+        assert result.number_of_nodes() == num_nodes
+        expected = edge_probability * num_nodes * (num_nodes - 1) / 2
+        assert abs(result.number_of_edges() - expected) < 5 * expected ** 0.5 + 1, "edge count far from n(n-1)p/2"
+    return check
+
+
+def _check_analysis(G, result):
+    is_connected, degrees, cycle_count = result[0], result[1], result[2]
+    assert is_connected == nx.is_connected(G)
+    assert degrees == dict(G.degree())
+    _check_cycle_count(G, cycle_count)
+
+
+def _run_import(statement):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC, os.environ.get("PYTHONPATH")])))
+    probe = subprocess.run([sys.executable, "-c", _IMPORT_PROBE.format(statement=statement)],
+                           env=env, capture_output=True, text=True, check=True)
+    return json.loads(probe.stdout)
+
+
+def _check_import(forbidden, budget):
+    def check(G, result):
+        loaded = [module for module in forbidden if module in result["modules"]]
+        assert not loaded, f"importing loads {', '.join(loaded)}"
+        assert result["time"] <= budget, f"import took {result['time']:.3f}s, budget {budget}s"
+    return check
+
+
+def _import_case(statement, forbidden, budget):
+    # The timed run includes interpreter startup; the budget applies to the import alone
+    return Case(f"import[{statement}]", lambda: None, lambda G, budget: _run_import(statement),
+                _check_import(forbidden, budget))
+
+
+def _cycles_case(family):
+    return Case(f"count_cycles[{family}]", FAMILIES[family],
+                lambda G, budget: count_cycles(G, budget=budget), _check_cycle_count)
+
+
+def _circuits_case(family):
+    return Case(f"count_circuits[{family}]", FAMILIES[family],
+                lambda G, budget: count_circuits(G, budget=budget), _check_subcubic_circuit_count)
+
+
+def _hamiltonian_case(family, expected):
+    return Case(f"has_hamiltonian_cycle[{family}]", FAMILIES[family],
+                lambda G, budget: has_hamiltonian_cycle(G, budget=budget), _check_hamiltonian(expected))
+
+
+def _generation_case(strategy, num_nodes, edge_probability, seed):
+    conditions = {'must_be_connected': True, 'all_verticies_even_degree': True}
+    return Case(f"generate_graph_with_conditions[{strategy}-{num_nodes}-{edge_probability}]", lambda: None,
+                lambda G, budget: generate_graph_with_conditions(num_nodes, edge_probability, conditions,
+                                                                 strategy=strategy, seed=seed),
+                _check_generated(num_nodes, conditions))
+
+
+def _random_graph_case(num_nodes, edge_probability, seed):
+    return Case(f"generate_random_graph[{num_nodes}-{edge_probability}]", lambda: None,
+                lambda G, budget: generate_random_graph(num_nodes, edge_probability, seed=seed),
+                _check_random_graph(num_nodes, edge_probability))
+
+
+CASES = [
+    _import_case("import graph_analysis", ("matplotlib", "networkx", "numpy"), IMPORT_BUDGET),
+    _import_case("from graph_analysis import generate_random_graph", ("matplotlib",), NAME_IMPORT_BUDGET),
+    _import_case("from graph_analysis import analyze_graph", ("matplotlib",), NAME_IMPORT_BUDGET),
+    *(_cycles_case(family) for family in ("gnp-10-0.3", "gnp-14-0.3", "gnp-18-0.2", "complete-8",
+                                          "cycle-200", "grid-4x5", "petersen", "digraph-gnp-18-0.2")),
+    *(_circuits_case(family) for family in ("cycle-200", "ladder-8", "petersen", "dodecahedral")),
+    _hamiltonian_case("complete-12", True),
+    _hamiltonian_case("cycle-200", True),
+    _hamiltonian_case("grid-4x4", True),
+    _hamiltonian_case("grid-3x5", False),
+    _hamiltonian_case("petersen", False),
+    _hamiltonian_case("dodecahedral", True),
+    _hamiltonian_case("gnp-20-0.3", True),
+    _hamiltonian_case("digraph-gnp-30-0.2", True),
+    Case("cyclomatic_number[gnp-2000-0.01]", gnp(2000, 0.01, seed=10),
+         lambda G, budget: cyclomatic_number(G), _check_cyclomatic),
+    Case("minimum_cycle_basis[grid-4x5]", FAMILIES["grid-4x5"],
+         lambda G, budget: minimum_cycle_basis(G), _check_minimum_cycle_basis),
+    Case("minimum_cycle_basis[gnp-20-0.3]", FAMILIES["gnp-20-0.3"],
+         lambda G, budget: minimum_cycle_basis(G), _check_minimum_cycle_basis),
+    Case("has_eulerian_circuit[complete-101]", FAMILIES["complete-101"],
+         lambda G, budget: has_eulerian_circuit(G), _check_eulerian),
+    Case("has_eulerian_circuit[grid-4x4]", FAMILIES["grid-4x4"],
+         lambda G, budget: has_eulerian_circuit(G), _check_eulerian),
+    # A copy, since analyze_graph reuses its results for a graph it has seen unchanged
+    Case("analyze_graph[gnp-10-0.3]", FAMILIES["gnp-10-0.3"],
+         lambda G, budget: analyze_graph(G.copy()), _check_analysis),
+    _generation_case("rejection", 8, 0.5, seed=5),
+    _generation_case("hybrid", 12, 0.3, seed=6),
+    _generation_case("constructive", 40, 0.1, seed=7),
+    _random_graph_case(2000, 0.01, seed=8),
+    _random_graph_case(300, 0.5, seed=9),
+]
@@ -0,0 +1,170 @@
+"""
+Run the benchmark cases and compare them with a stored baseline.
+
+    python benchmarks/run.py                  # run, cross-check and compare with baseline.json
+    python benchmarks/run.py --save           # run and store the results as the new baseline
+    python benchmarks/run.py -k hamiltonian   # only cases whose name contains "hamiltonian"
+
+For every case the wall time (best of --repeat runs), the peak memory
+(tracemalloc, in a separate run) and the number of search steps counted by
+the case's Budget are recorded. Times are scaled by a calibration loop
+timed on both machines before comparing. A case regresses when any of them exceeds
+its baseline by more than --threshold (plus --min-time of slack for times
+and 16 KiB for memory, so sub-millisecond noise never fails the run). The
+exit status is 1 if any case regressed or failed its cross-check, and 2 if
+there is no baseline to compare with (run with --save first). Cases missing
+from the baseline are reported as new and only cross-checked.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from graph_analysis import Budget  # noqa: E402
+from cases import CASES  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_TIME = 0.002
+
+
+def calibrate(repeat):
+    """
+    Time a fixed pure-Python workload, so timings from a slower or busier machine can be scaled.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total = 0
+        for i in range(200000):
+            total += i & 7
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_case(case, repeat):
+    """
+    Measure one case.
+
+    Returns:
+        dict: time (seconds, best run), peak_kib (peak traced memory), ops
+        (budget steps, None if the case does not take a budget) and error
+        (the failed cross-check, or None).
+    """
+    G = case.build()
+    best = None
+    for _ in range(repeat):
+        budget = Budget()
+        start = time.perf_counter()
+        result = case.run(G, budget)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    case.run(G, Budget())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    try:
+        case.check(G, result)
+        error = None
+    except AssertionError as failure:
+        error = str(failure) or "cross-check failed"
+    return {"time": best, "peak_kib": round(peak / 1024, 1), "ops": budget.steps or None, "error": error}
+
+
+def compare(measured, baseline, threshold, min_time, speed=1.0):
+    """
+    List the regressions of one case against its baseline entry.
+
+    speed is the baseline calibration time over the current one; baseline
+    times are divided by it before comparing.
+    """
+    regressions = []
+    limits = {"time": min_time, "peak_kib": 16, "ops": 0}
+    for field, slack in limits.items():
+        old, new = baseline.get(field), measured.get(field)
+        if old is None or new is None:
+            continue
+        if field == "time":
+            old /= speed
+        if new > old * (1 + threshold) + slack:
+            regressions.append(f"{field} {old:g} -> {new:g} (+{(new / old - 1) * 100 if old else float('inf'):.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis and generation hot paths.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", "--tolerance", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative slowdown before a case counts as regressed")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help="absolute slack in seconds added to the time limit")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case, the best one counts")
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases whose name contains this")
+    parser.add_argument("--output", help="also write the measured results to this JSON file")
+    args = parser.parse_args(argv)
+
+    baseline, baseline_calibration = {}, None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        baseline, baseline_calibration = stored["cases"], stored.get("calibration")
+    elif not args.save:
+        print(f"No baseline at {args.baseline}, run with --save to create one", file=sys.stderr)
+        return 2
+    calibration = calibrate(args.repeat)
+    speed = baseline_calibration / calibration if baseline_calibration else 1.0
+    print(f"Calibration {calibration * 1000:.2f} ms (baseline machine speed x{1 / speed:.2f})")
+
+    results = {}
+    failed = False
+    for case in CASES:
+        if args.pattern not in case.name:
+            continue
+        measured = results[case.name] = run_case(case, args.repeat)
+        problems = []
+        if measured["error"] is not None:
+            problems.append(f"cross-check: {measured['error']}")
+        if case.name in baseline and not args.save:
+            problems.extend(compare(measured, baseline[case.name], args.threshold, args.min_time, speed))
+        failed = failed or bool(problems)
+
+        status = "FAIL" if problems else "ok" if case.name in baseline or args.save else "new"
+        ops = "-" if measured["ops"] is None else measured["ops"]
+        print(f"{status:4} {case.name:60} {measured['time'] * 1000:10.2f} ms "
+              f"{measured['peak_kib']:10.1f} KiB {ops:>10}")
+        for problem in problems:
+            print(f"       {problem}")
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "calibration": calibration,
+        "cases": {name: {key: value for key, value in measured.items() if key != "error"}
+                  for name, measured in results.items()},
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.save:
+        # Cases filtered out with -k keep their previous baseline
+        report["cases"] = {**baseline, **report["cases"]}
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,8 @@ def main():
 
     G = generate_random_graph(num_vertices, edge_probability)
 
-    is_connected, degrees = analyze_graph(G)
+    result = analyze_graph(G, metrics=["connectivity", "degrees"])
+    is_connected, degrees = result.is_connected, result.degrees
 
     stats = calculate_degree_statistics(degrees)
 
@@ -15,14 +15,15 @@ print(f"Generating graph with conditions:")
 for condition, value in conditions.items():
     print(f" - {condition}")
 
-G, attempts = generate_graph_with_conditions(num_nodes, edge_probability, conditions)
+G, attempts, elapsed = generate_graph_with_conditions(num_nodes, edge_probability, conditions, strategy="constructive")
 
 if G is None:
     print(f"Failed to generate a graph that meets the specified conditions after {attempts} attempts.")
 
-print(f"Graph generated in {attempts} attempts.")
+print(f"Graph generated in {attempts} attempts ({elapsed:.2f}s).")
 
-is_connected, degrees = analyze_graph(G)
+result = analyze_graph(G, metrics=["connectivity", "degrees"])
+is_connected, degrees = result.is_connected, result.degrees
 
 visualize_graph(G, is_connected, degrees)
 
@@ -8,6 +8,7 @@ setup(
     install_requires=[
         "networkx>=2.8.0",
         "matplotlib>=3.5.0",
+        "numpy>=1.22.0",
     ],
     entry_points={
         'console_scripts': [
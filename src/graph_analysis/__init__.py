@@ -1,20 +1,116 @@
-from .generator import generate_random_graph
-from .analyzer import analyze_graph
-from .visualizer import visualize_graph
-from .conditions import check_graph_conditons, generate_graph_with_conditions
-from .cycles import count_cycles, has_hamiltonian_cycle
-from .circuits import find_circuits, count_circuits, has_eulerian_circuit, find_edge_disjoint_circuits
+import importlib
+
+# Public names and the submodule that defines each. Submodules are imported on
+# first access of one of their names (PEP 562), so importing the package does
+# not load NetworkX, NumPy or matplotlib.
+_EXPORTS = {
+    "Budget": "budget",
+    "CancellationToken": "budget",
+    "PartialCount": "budget",
+    "is_partial": "budget",
+    "Profile": "profiling",
+    "CompactGraph": "compact",
+    "as_compact": "compact",
+    "graph_fingerprint": "compact",
+    "DynamicGraph": "dynamic",
+    "generate_random_graph": "generator",
+    "random_edge_array": "generator",
+    "random_graph_csr": "generator",
+    "GraphAnalysis": "analyzer",
+    "analyze_graph": "analyzer",
+    "AnalysisCache": "cache",
+    "analyze_many": "corpus",
+    "read_graphs": "graph_io",
+    "write_graphs": "graph_io",
+    "visualize_graph": "visualizer",
+    "print_graph_info": "visualizer",
+    "graph_layout": "visualizer",
+    "save_graph_image": "visualizer",
+    "render_graphs": "visualizer",
+    "ConditionPipeline": "conditions",
+    "check_graph_conditons": "conditions",
+    "generate_graph_with_conditions": "conditions",
+    "generate_graphs_with_conditions": "conditions",
+    "find_cycles": "cycles",
+    "count_cycles": "cycles",
+    "has_hamiltonian_cycle": "cycles",
+    "hamiltonian_decision": "hamiltonian",
+    "count_cycles_by_length": "counting",
+    "count_directed_cycles_by_length": "directed",
+    "iter_directed_cycles": "directed",
+    "CycleSpace": "cycle_space",
+    "cyclomatic_number": "cycle_space",
+    "cycle_basis": "cycle_space",
+    "minimum_cycle_basis": "cycle_space",
+    "CountEstimate": "estimation",
+    "estimate_cycle_count": "estimation",
+    "estimate_circuit_count": "estimation",
+    "iter_circuits": "circuits",
+    "find_circuits": "circuits",
+    "count_circuits": "circuits",
+    "count_circuits_by_length": "circuits",
+    "has_eulerian_circuit": "circuits",
+    "find_edge_disjoint_circuits": "circuits",
+}
 
 __all__ = ["generate_random_graph", 
+           "random_edge_array",
+           "random_graph_csr",
            "analyze_graph", 
-           "visualize_graph"
+           "GraphAnalysis",
+           "AnalysisCache",
+           "analyze_many",
+           "DynamicGraph",
+           "read_graphs",
+           "write_graphs",
+           "visualize_graph",
            "print_graph_info",
+           "graph_layout",
+           "save_graph_image",
+           "render_graphs",
            "check_graph_conditons",
+           "ConditionPipeline",
            "generate_graph_with_conditions",
+           "generate_graphs_with_conditions",
+           "find_cycles",
            "count_cycles",
-           "has_hamiltonian_cycle"
+           "has_hamiltonian_cycle",
+           "hamiltonian_decision",
+           "count_cycles_by_length",
+           "count_directed_cycles_by_length",
+           "iter_directed_cycles",
+           "CycleSpace",
+           "cyclomatic_number",
+           "cycle_basis",
+           "minimum_cycle_basis",
+           "CountEstimate",
+           "estimate_cycle_count",
+           "estimate_circuit_count",
+           "iter_circuits",
            "find_circuits",
            "count_circuits",
+           "count_circuits_by_length",
            "has_eulerian_circuit", 
-           "find_edge_disjoint_circuits"
-           ]
\ No newline at end of file
+           "find_edge_disjoint_circuits",
+           "Budget",
+           "CancellationToken",
+           "PartialCount",
+           "is_partial",
+           "Profile",
+           "CompactGraph",
+           "as_compact",
+           "graph_fingerprint",
+           ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
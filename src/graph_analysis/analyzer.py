@@ -1,32 +1,298 @@
-import networkx as nx 
-from .cycles import count_cycles, has_hamiltonian_cycle
-from .circuits import count_circuits, has_eulerian_circuit
+import time
+import weakref
+from .budget import Budget, PartialCount, is_partial
+from .compact import CompactGraph, as_compact, graph_fingerprint
+from .counting import count_cycles_by_length
+from .cycle_space import CycleSpace, cyclomatic_number
+from .directed import count_directed_cycles_by_length
+from .circuits import count_circuits_by_length
+from .estimation import estimate_circuit_count, estimate_cycle_count
+from .eulerian import eulerian_circuit
+from .hamiltonian import hamiltonian_decision
+from .profiling import stage
 
-def analyze_graph(G):
+METRICS = ("connectivity", "degrees", "cycles", "circuits", "hamiltonian", "eulerian",
+           "cyclomatic", "cycle_basis", "minimum_cycle_basis", "cycle_estimate", "circuit_estimate")
+
+# Metrics behind the tuple returned by analyze_graph(G)
+TUPLE_METRICS = METRICS[:6]
+
+# Metrics with exponential worst cases, which get a budget of their own
+EXPONENTIAL_METRICS = ("cycles", "circuits", "hamiltonian")
+
+# Metrics estimated from random walks, which also get a budget of their own;
+# they depend on the sampling options, so they are recomputed on every call
+SAMPLED_METRICS = ("cycle_estimate", "circuit_estimate")
+
+# Sampling options of analyze_graph, so repeated analyses give the same estimates
+ESTIMATE_OPTIONS = {"seed": 0}
+
+# Metric results of the last analysis of each graph, dropped with the graph
+_previous_results = weakref.WeakKeyDictionary()
+
+
+class GraphAnalysis:
+    """
+    Result of analyze_graph for a selected set of metrics.
+
+    Attributes that belong to metrics which were not requested stay None.
+    partial lists the metrics whose budget ran out: their counts are lower
+    bounds (PartialCount) and an undecided Hamiltonian check is None.
+    hamiltonian_tier names the pre-filter or search that decided the
+    Hamiltonian check (see hamiltonian.TIERS). The estimates are
+    CountEstimate objects, from fewer samples when partial.
+    timings holds the seconds spent on each metric computed by this call
+    ("prepare" for the shared precomputation); reused metrics are absent.
+    """
+
+    FIELDS = ("is_connected", "num_components", "degrees", "cycle_count", "cycle_lengths",
+              "circuit_count", "circuit_lengths", "has_hamiltonian", "hamiltonian_cycle", "hamiltonian_tier",
+              "has_eulerian", "eulerian_circuit", "cyclomatic_number", "cycle_basis", "minimum_cycle_basis",
+              "cycle_estimate", "circuit_estimate")
+
+    def __init__(self, metrics, values, partial=(), timings=None):
+        self.metrics = tuple(metrics)
+        self.partial = tuple(partial)
+        self.timings = dict(timings or {})
+        for field in self.FIELDS:
+            setattr(self, field, values.get(field))
+
+    def to_dict(self):
+        """
+        Return the computed fields of the requested metrics as a dictionary.
+        """
+        return {field: getattr(self, field) for field in self.FIELDS if getattr(self, field) is not None}
+
+    def as_tuple(self):
+        """
+        Return the fields in the order of the tuple returned by analyze_graph(G).
+        """
+        return (self.is_connected, self.degrees, self.cycle_count, self.circuit_count,
+                self.has_hamiltonian, self.hamiltonian_cycle, self.has_eulerian, self.eulerian_circuit)
+
+    def __repr__(self):
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.to_dict().items())
+        return f"GraphAnalysis({fields})"
+
+
+class _SharedData:
+    """
+    Precomputation shared by every metric of one analyze_graph call.
+
+    Holds the CompactGraph every algorithm works on, the degree dictionary,
+    the connected components and the cycle space, each computed at most once.
+    """
+
+    def __init__(self, G, workers=None, estimate=None):
+        self.G = G
+        self.workers = workers
+        self.estimate = dict(ESTIMATE_OPTIONS, **(estimate or {}))
+        self.graph = as_compact(G)
+        self._degrees = None
+        self._components = None
+        self._cycle_space = None
+
+    @property
+    def degrees(self):
+        if self._degrees is None:
+            if isinstance(self.G, CompactGraph):
+                self._degrees = dict(zip(self.graph.nodes, self.graph.degrees.tolist()))
+            else:
+                self._degrees = dict(self.G.degree())
+        return self._degrees
+
+    @property
+    def components(self):
+        if self._components is None:
+            self._components = self.graph.components()
+        return self._components
+
+    @property
+    def cycle_space(self):
+        if self._cycle_space is None:
+            self._cycle_space = CycleSpace(self.graph)
+        return self._cycle_space
+
+    @property
+    def is_connected(self):
+        return len(self.components) == 1
+
+
+def _connectivity(shared):
+    return {"is_connected": shared.is_connected, "num_components": len(shared.components)}
+
+
+def _degrees(shared):
+    return {"degrees": shared.degrees}
+
+
+def _total(lengths):
+    if is_partial(lengths):
+        return PartialCount(sum(lengths.values()), lengths.reason)
+    return sum(lengths.values())
+
+
+def _cycles(shared, budget):
+    if shared.graph.directed:
+        lengths = count_directed_cycles_by_length(shared.graph, budget=budget, workers=shared.workers)
+    else:
+        lengths = count_cycles_by_length(shared.graph, budget=budget, workers=shared.workers)
+    return {"cycle_count": _total(lengths), "cycle_lengths": lengths}
+
+
+def _circuits(shared, budget):
+    lengths = count_circuits_by_length(shared.graph, budget=budget, workers=shared.workers)
+    return {"circuit_count": _total(lengths), "circuit_lengths": lengths}
+
+
+def _hamiltonian(shared, budget):
+    has_cycle, cycle, tier = hamiltonian_decision(shared.graph, budget=budget, workers=shared.workers)
+    return {"has_hamiltonian": has_cycle, "hamiltonian_cycle": cycle, "hamiltonian_tier": tier}
+
+
+def _eulerian(shared):
+    if not shared.is_connected or any(degree % 2 for degree in shared.degrees.values()):
+        return {"has_eulerian": False, "eulerian_circuit": None}
+    has_circuit, circuit = eulerian_circuit(shared.G)
+    return {"has_eulerian": has_circuit, "eulerian_circuit": circuit}
+
+
+def _cyclomatic(shared):
+    return {"cyclomatic_number": cyclomatic_number(shared.graph)}
+
+
+def _cycle_basis(shared):
+    space = shared.cycle_space
+    return {"cycle_basis": [space.cycle_nodes(vector) for vector in space.fundamental_basis()]}
+
+
+def _minimum_cycle_basis(shared):
+    space = shared.cycle_space
+    return {"minimum_cycle_basis": [space.cycle_nodes(vector) for vector in space.minimum_basis()]}
+
+
+def _cycle_estimate(shared, budget):
+    return {"cycle_estimate": estimate_cycle_count(shared.graph, budget=budget, **shared.estimate)}
+
+
+def _circuit_estimate(shared, budget):
+    return {"circuit_estimate": estimate_circuit_count(shared.graph, budget=budget, **shared.estimate)}
+
+
+_METRIC_FUNCTIONS = {
+    "connectivity": _connectivity,
+    "degrees": _degrees,
+    "cycles": _cycles,
+    "circuits": _circuits,
+    "hamiltonian": _hamiltonian,
+    "eulerian": _eulerian,
+    "cyclomatic": _cyclomatic,
+    "cycle_basis": _cycle_basis,
+    "minimum_cycle_basis": _minimum_cycle_basis,
+    "cycle_estimate": _cycle_estimate,
+    "circuit_estimate": _circuit_estimate,
+}
+
+
+def _stage_budget(name, timeout, cancel):
+    if isinstance(timeout, dict):
+        timeout = timeout.get(name)
+    if timeout is None and cancel is None:
+        return None
+    return Budget(timeout=timeout, cancel=cancel)
+
+
+def analyze_graph(G, metrics=None, timeout=None, cancel=None, cache=None, workers=None, estimate=None):
     """
     Analyze the graph for connectivity and vertex degrees
 
+    Without metrics the full legacy tuple is returned. With metrics only the
+    selected ones are computed, sharing one adjacency/degree/component pass,
+    and a GraphAnalysis is returned. Metrics of a graph that has not changed
+    since it was last analysed are reused instead of recomputed.
+
+    Each exponential metric (EXPONENTIAL_METRICS) runs under its own budget.
+    When it runs out the metric returns a partial result instead of hanging,
+    and the metric is analysed again from scratch on the next call. The
+    sampled estimates (SAMPLED_METRICS) run under a budget the same way, and
+    stop sampling early when it runs out.
+
+    With an AnalysisCache, metrics already known for an isomorphic graph are
+    taken from the cache and newly completed ones are added to it.
+
+    For directed graphs the cycles, the Hamiltonian cycle and the Eulerian
+    circuit follow the arcs; the other metrics treat the graph as undirected.
+
     Args:
-        G (object): A NetworkX graph object
+        G (object): A NetworkX graph object or CompactGraph
+        metrics (iterable, optional): Names from METRICS to compute: Defaults to None (TUPLE_METRICS, as a tuple).
+        timeout (float or dict, optional): Seconds allowed per exponential metric, or a dict of
+            seconds keyed by metric name: Defaults to None (unlimited).
+        cancel (CancellationToken, optional): Token that stops every remaining stage: Defaults to None.
+        cache (AnalysisCache, optional): Cache shared between graphs: Defaults to None.
+        workers (int, optional): Number of worker processes each exponential search is split
+            across: Defaults to None (search in this process).
+        estimate (dict, optional): Options of estimate_cycle_count and estimate_circuit_count, e.g.
+            {"samples": 5000, "confidence": 0.99}: Defaults to None (ESTIMATE_OPTIONS).
 
     Returns:
+        GraphAnalysis if metrics is given, otherwise the tuple
         is_connected: Boolean indicating if the graph is connected
         degrees: List of vertex degrees
+        cycle_count, circuit_count: Number of cycles and circuits
+        has_hamiltonian, hamiltonian_cycle: Hamiltonian cycle result
+        has_eulerian, eulerian_circuit: Eulerian circuit result
     """
+    requested = TUPLE_METRICS if metrics is None else tuple(metrics)
+    unknown = [name for name in requested if name not in _METRIC_FUNCTIONS]
+    if unknown:
+        raise ValueError(f"Unknown metrics {unknown}, expected names from {METRICS}")
 
-    is_connected = nx.is_connected(G)
-
-    degrees = dict(G.degree())
+    fingerprint = graph_fingerprint(G)
+    previous = _previous_results.get(G)
+    computed = previous[1] if previous is not None and previous[0] == fingerprint else {}
+    if cache is not None:
+        missing = [name for name in requested if name not in computed]
+        computed.update(cache.lookup(G, missing))
+    new = []
 
-    cycle_count = count_cycles(G)
+    shared = None
+    values = {}
+    partial = []
+    timings = {}
+    for name in requested:
+        if name in computed:
+            values.update(computed[name])
+            continue
+        if shared is None:
+            start = time.perf_counter()
+            with stage("analyze.prepare"):
+                shared = _SharedData(G, workers, estimate)
+            timings["prepare"] = time.perf_counter() - start
+        start = time.perf_counter()
+        with stage(f"analyze.{name}"):
+            if name in EXPONENTIAL_METRICS or name in SAMPLED_METRICS:
+                budget = _stage_budget(name, timeout, cancel)
+                stage_values = _METRIC_FUNCTIONS[name](shared, budget)
+                if budget is not None and budget.exhausted:
+                    partial.append(name)
+                elif name in EXPONENTIAL_METRICS:
+                    computed[name] = stage_values
+                    new.append(name)
+            else:
+                stage_values = computed[name] = _METRIC_FUNCTIONS[name](shared)
+                new.append(name)
+        timings[name] = time.perf_counter() - start
+        values.update(stage_values)
+    _previous_results[G] = (fingerprint, computed)
+    if cache is not None and new:
+        cache.store(G, {name: computed[name] for name in new})
 
-    circuit_count = count_circuits(G)
+    result = GraphAnalysis(requested, values, partial, timings)
+    if metrics is None:
+        return result.as_tuple()
+    return result
 
-    has_hamiltonian, hamiltonian_cycle = has_hamiltonian_cycle(G)
-
-    has_eulerian, eulerian_circuit = has_eulerian_circuit(G)
-
-    return is_connected, degrees, cycle_count, circuit_count, has_hamiltonian, hamiltonian_cycle, has_eulerian, eulerian_circuit
 
 def calculate_degree_statistics(degrees):
     """
@@ -34,7 +300,7 @@ def calculate_degree_statistics(degrees):
 
     Args:
         degrees (dict): A dictionary of vertex degrees
-    
+
     Returns:
         Statistics including min, max, and average degree.
     """
@@ -47,4 +313,4 @@ def calculate_degree_statistics(degrees):
             "min_degree": min_degree,
             "max_degree": max_degree,
             "avg_degree": avg_degree
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,145 @@
+import threading
+import time
+
+# Inner loops that run millions of cheap steps only consult their budget this often
+CHECK_INTERVAL = 1024
+
+
+class BudgetExhausted(TimeoutError):
+    """
+    Raised inside a search when its budget runs out; public functions turn it into a partial result.
+    """
+
+
+class CancellationToken:
+    """
+    Flag that lets another thread (or process, given a multiprocessing Event) stop a running search.
+    """
+
+    def __init__(self, event=None):
+        self._event = threading.Event() if event is None else event
+
+    def cancel(self):
+        """
+        Ask every search watching this token to stop.
+        """
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+class Budget:
+    """
+    Time and step budget for one exponential search, with an optional cancellation token.
+
+    The clock starts when the budget is created. Once any limit is hit the
+    budget stays exhausted and reason says which limit it was.
+    """
+
+    def __init__(self, timeout=None, max_steps=None, cancel=None):
+        self.timeout = timeout
+        self.max_steps = max_steps
+        self.cancel = cancel
+        self.deadline = None if timeout is None else time.perf_counter() + timeout
+        self.steps = 0
+        self.reason = None
+
+    def spend(self, steps=1):
+        """
+        Count search steps and check the limits.
+
+        Args:
+            steps (int, optional): Number of steps taken since the last call: Defaults to 1.
+
+        Returns:
+            bool: False once the budget is exhausted.
+        """
+        self.steps += steps
+        if self.reason is None:
+            if self.max_steps is not None and self.steps > self.max_steps:
+                self.reason = "step limit reached"
+            elif self.deadline is not None and time.perf_counter() >= self.deadline:
+                self.reason = "timed out"
+            elif self.cancel is not None and self.cancel.cancelled:
+                self.reason = "cancelled"
+        return self.reason is None
+
+    def check(self, steps=1):
+        """
+        Spend steps and raise BudgetExhausted if the budget has run out.
+        """
+        if not self.spend(steps):
+            raise BudgetExhausted(self.reason)
+
+    @property
+    def exhausted(self):
+        return self.reason is not None
+
+
+def make_budget(budget=None, timeout=None, max_steps=None):
+    """
+    Return the given budget, or a new one for the shorthand limits.
+
+    Returns:
+        Budget or None: None when there is nothing to limit, so searches can skip budget checks.
+    """
+    if budget is not None:
+        return budget
+    if timeout is None and max_steps is None:
+        return None
+    return Budget(timeout=timeout, max_steps=max_steps)
+
+
+class PartialCount(int):
+    """
+    A count that is only a lower bound because the search budget ran out.
+    """
+
+    partial = True
+
+    def __new__(cls, value, reason):
+        count = super().__new__(cls, value)
+        count.reason = reason
+        return count
+
+    def __reduce__(self):
+        return PartialCount, (int(self), self.reason)
+
+    def __str__(self):
+        return f"≥ {int(self)} ({self.reason})"
+
+    def __repr__(self):
+        return f"PartialCount({int(self)}, {self.reason!r})"
+
+
+class PartialCounts(dict):
+    """
+    Counts by length that are only lower bounds because the search budget ran out.
+    """
+
+    partial = True
+
+    def __init__(self, counts, reason):
+        super().__init__(counts)
+        self.reason = reason
+
+
+class PartialList(list):
+    """
+    The results a search found before its budget ran out.
+    """
+
+    partial = True
+
+    def __init__(self, items, reason):
+        super().__init__(items)
+        self.reason = reason
+
+
+def is_partial(value):
+    """
+    Check if a result was cut short by its budget.
+    """
+    return getattr(value, "partial", False)
@@ -0,0 +1,238 @@
+import copy
+import shelve
+import warnings
+from collections import OrderedDict
+import networkx as nx
+from networkx.algorithms.isomorphism import GraphMatcher
+from .compact import CompactGraph
+from .profiling import count
+
+# Metrics whose results only depend on the isomorphism class of a graph
+CACHED_METRICS = ("connectivity", "cycles", "circuits", "hamiltonian", "eulerian")
+
+# Result fields that list nodes, translated between isomorphic graphs
+_WITNESSES = ("hamiltonian_cycle", "eulerian_circuit")
+
+WL_ITERATIONS = 3
+
+
+class AnalysisCache:
+    """
+    Memoised analysis results shared by every graph in the same isomorphism class.
+
+    Graphs are bucketed by node count, edge count and Weisfeiler-Lehman hash.
+    Within a bucket each stored graph is compared with an exact isomorphism
+    test, so a hash collision costs a comparison but never returns the
+    results of a different graph. Node lists (the Hamiltonian cycle and
+    Eulerian circuit) are stored on indices and mapped back onto the labels
+    of the graph being looked up.
+
+    Buckets are kept in memory in least recently used order, at most maxsize
+    of them. Only store adds buckets, so lookups of new graphs never evict
+    cached results. Given a path, every bucket is also written to a shelve
+    file, so results survive the process and are read back on a memory miss;
+    with maxsize 0 the cache then works from disk alone.
+
+    Only simple undirected graphs are cached; for any other graph lookup
+    returns nothing and store does nothing.
+    """
+
+    def __init__(self, maxsize=1024, path=None):
+        """
+        Args:
+            maxsize (int, optional): Number of hash buckets kept in memory, at least 0: Defaults to 1024.
+            path (str, optional): Shelve file backing the cache on disk: Defaults to None (memory only).
+
+        Raises:
+            ValueError: If maxsize is negative.
+        """
+        if maxsize < 0:
+            raise ValueError(f"maxsize must be at least 0, got {maxsize}")
+        self.maxsize = maxsize
+        self.path = path
+        self._memory = OrderedDict()
+        self._disk = shelve.open(path) if path is not None else None
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Flush and close the on-disk store, if any.
+        """
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._memory.values())
+
+    def clear(self):
+        """
+        Drop the in-memory results and reset the counters; the on-disk store is kept.
+        """
+        self._memory.clear()
+        self.hits = self.misses = self.collisions = 0
+
+    @property
+    def hit_rate(self):
+        """
+        Fraction of lookups answered from the cache, None before the first lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "collisions": self.collisions,
+                "graphs": len(self), "hit_rate": self.hit_rate}
+
+    def lookup(self, G, metrics=CACHED_METRICS):
+        """
+        Return the cached results of a graph.
+
+        A lookup counts as a hit when every requested cacheable metric was found.
+
+        Args:
+            G (object): A NetworkX graph object or CompactGraph
+            metrics (iterable, optional): Metric names wanted: Defaults to CACHED_METRICS.
+
+        Returns:
+            dict: Metric results keyed by metric name, as computed by analyze_graph, with
+            node lists relabelled for G. Metrics that were not cached are missing.
+        """
+        wanted = [name for name in metrics if name in CACHED_METRICS]
+        H = _cacheable(G)
+        if H is None or not wanted:
+            return {}
+
+        bucket = self._load(_bucket_key(H))
+        found = None if bucket is None else self._find(H, bucket, count_collisions=True)
+        results = {}
+        if found is not None:
+            entry, mapping = found
+            labels = {i: node for node, i in mapping.items()}
+            for name in wanted:
+                if name in entry["results"]:
+                    results[name] = _relabel(entry["results"][name], labels.__getitem__)
+
+        if len(results) == len(wanted):
+            self.hits += 1
+            count("cache.hits")
+        else:
+            self.misses += 1
+            count("cache.misses")
+        return results
+
+    def store(self, G, results):
+        """
+        Add complete metric results of a graph to the cache.
+
+        Args:
+            G (object): A NetworkX graph object or CompactGraph
+            results (dict): Metric results keyed by metric name, as computed by analyze_graph
+        """
+        results = {name: values for name, values in results.items() if name in CACHED_METRICS}
+        H = _cacheable(G)
+        if H is None or not results:
+            return
+
+        key = _bucket_key(H)
+        bucket = self._load(key)
+        if bucket is None:
+            bucket = []
+        found = self._find(H, bucket)
+        if found is None:
+            nodes = list(H.nodes())
+            mapping = {node: i for i, node in enumerate(nodes)}
+            entry = {"edges": [(mapping[u], mapping[v]) for u, v in H.edges()],
+                     "num_nodes": len(nodes), "results": {}}
+            bucket.append(entry)
+        else:
+            entry, mapping = found
+
+        for name, values in results.items():
+            entry["results"][name] = _relabel(values, mapping.__getitem__)
+        self._keep(key, bucket)
+        if self._disk is not None:
+            self._disk[key] = bucket
+
+    def _load(self, key):
+        """
+        Return the bucket of a key from memory or disk, None if there is none.
+
+        A bucket found in memory becomes the most recently used; one read from
+        disk is not added to memory.
+        """
+        bucket = self._memory.get(key)
+        if bucket is not None:
+            self._memory.move_to_end(key)
+            return bucket
+        if self._disk is not None and key in self._disk:
+            return self._disk[key]
+        return None
+
+    def _keep(self, key, bucket):
+        """
+        Keep a bucket in memory as the most recently used, evicting the least recently used beyond maxsize.
+        """
+        self._memory[key] = bucket
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _find(self, H, bucket, count_collisions=False):
+        """
+        Find the stored graph isomorphic to H.
+
+        Returns:
+            tuple: (entry, mapping) with mapping taking the nodes of H to the
+            indices of the stored graph, or None if no such graph is stored.
+        """
+        for entry in bucket:
+            representative = nx.Graph()
+            representative.add_nodes_from(range(entry["num_nodes"]))
+            representative.add_edges_from(entry["edges"])
+            matcher = GraphMatcher(H, representative)
+            if matcher.is_isomorphic():
+                return entry, matcher.mapping
+            if count_collisions:
+                self.collisions += 1
+                count("cache.collisions")
+        return None
+
+
+def _cacheable(G):
+    """
+    Return G as a simple undirected NetworkX graph, or None if it cannot be cached.
+    """
+    if isinstance(G, CompactGraph):
+        return None if G.directed else G.to_networkx()
+    if G.is_directed() or G.is_multigraph():
+        return None
+    return G
+
+
+def _bucket_key(H):
+    with warnings.catch_warnings():
+        # NetworkX 3.5 warns that unlabelled hashes changed; a stale on-disk key only causes a miss
+        warnings.simplefilter("ignore", UserWarning)
+        wl_hash = nx.weisfeiler_lehman_graph_hash(H, iterations=WL_ITERATIONS)
+    return f"{H.number_of_nodes()}:{H.number_of_edges()}:{wl_hash}"
+
+
+def _relabel(values, label):
+    """
+    Copy the results of one metric, relabelling the nodes of its node lists.
+    """
+    values = copy.deepcopy(values)
+    for field in _WITNESSES:
+        if values.get(field) is not None:
+            values[field] = [label(node) for node in values[field]]
+    return values
@@ -1,78 +1,278 @@
-import networkx as nx
-import itertools
+from .compact import CompactGraph
+from .eulerian import cycle_decomposition, eulerian_circuit
+from .budget import CHECK_INTERVAL, PartialCount, PartialCounts, PartialList, is_partial, make_budget
+from .parallel import run_tasks
+from .profiling import count, stage
 
-def find_circuits(G):
+def _ordered_nodes(G):
     """
-    Find all circuits in a directed graph.
+    List the nodes of a graph smallest first, falling back to insertion order for unorderable nodes.
+    """
+    try:
+        return sorted(G.nodes())
+    except TypeError:
+        return list(G.nodes())
+
+def _is_canonical(path):
+    """
+    Check if a closed trail is the canonical form of its circuit.
+
+    The canonical form starts at the smallest node and is the lexicographically
+    smallest of every rotation (starting at that node) and both orientations.
 
     Args:
-        G (object): A NetworkX directed graph object
+        path (list): A closed trail of node indices whose first node is the smallest
 
     Returns:
-        list: A list of circuits, where each circuit is represented as a list of nodes.
+        bool: True if the trail is canonical.
     """
+    start = path[0]
+    body = path[:-1]
+    if len(body) == 1:
+        return True
+    if body.count(start) == 1:
+        return path[1] < path[-2]
 
-    circuits = []
+    reverse = body[:1] + body[:0:-1]
+    for candidate in (body, reverse):
+        for i, node in enumerate(candidate):
+            if node == start and candidate[i:] + candidate[:i] < body:
+                return False
+    return True
+
+def _trail_adjacency(G):
+    """
+    Build the adjacency lists the circuit search runs on.
 
-    if isinstance(G, nx.DiGraph):
-        G_undirected = G.to_undirected()
+    Returns:
+        tuple: (nodes, adjacency, number of edges) where adjacency[v] is the sorted
+        list of (neighbour index, edge id) pairs of node index v.
+    """
+    if isinstance(G, CompactGraph):
+        graph = G.to_undirected()
     else:
-        G_undirected = G
+        graph = CompactGraph.from_networkx(G, nodes=_ordered_nodes(G)).to_undirected()
+
+    nodes = list(graph.nodes)
+    adjacency = [[] for _ in nodes]
+    num_edges = 0
+    for u, v in graph.edges():
+        adjacency[u].append((v, num_edges))
+        if u != v:
+            adjacency[v].append((u, num_edges))
+        num_edges += 1
+    for nbrs in adjacency:
+        nbrs.sort()
+    return nodes, adjacency, num_edges
+
+def _trails_from(adjacency, used, start, max_length, budget):
+    """
+    Search the circuits whose smallest node is start.
+
+    The search simply stops when the budget runs out, leaving budget.reason set.
 
-    for start_node in G_undirected.nodes():
-        visited = set()
-        edge_used = set()
+    Yields:
+        list: The search's own path of node indices for the circuit just found;
+        it is reused, so copy it to keep it.
+    """
+    # Edges from start to larger nodes that are still free to return along
+    free = sum(1 for w, _ in adjacency[start] if w > start)
+    path = [start]
+    edges = []
+    positions = [0]
+    steps = 0
+    skipped = 0
 
-        def backtrack(node,path,used_edges):
-            if len(path) > 1 and path[0] == path[-1]:
-                if tuple(path) not in visited:
-                    circuits.append(path.copy())
-                    visited.add(tuple(path))
+    try:
+        while positions:
+            v = path[-1]
+            nbrs = adjacency[v]
+            pos = positions[-1]
+            while pos < len(nbrs) and (nbrs[pos][0] < start or used[nbrs[pos][1]]):
+                pos += 1
+            skipped += pos - positions[-1]
+
+            if pos == len(nbrs) or (max_length is not None and len(edges) >= max_length):
+                positions.pop()
+                if edges:
+                    eid = edges.pop()
+                    used[eid] = 0
+                    w = path.pop()
+                    if start in (w, path[-1]) and w != path[-1]:
+                        free += 1
+                continue
+
+            steps += 1
+            if budget is not None and steps % CHECK_INTERVAL == 0 and not budget.spend(CHECK_INTERVAL):
                 return
-        
-            for neighbor in G_undirected.neighbors(node):
-                edge = tuple(sorted([node, neighbor]))
-                if edge not in used_edges:
-                    path.append(neighbor)
-                    used_edges.add(edge)
 
-                    backtrack(neighbor, path, used_edges)
+            w, eid = nbrs[pos]
+            positions[-1] = pos + 1
+            used[eid] = 1
+            edges.append(eid)
+            path.append(w)
+            if start in (v, w) and v != w:
+                free -= 1
 
-                    path.pop()
-                    used_edges.remove(edge)
-        backtrack(start_node, [start_node], edge_used)
+            if w == start:
+                if _is_canonical(path):
+                    yield path
+                positions.append(0)
+            elif free == 0:
+                positions.append(len(adjacency[w]))
+            else:
+                positions.append(0)
+    finally:
+        count("circuits.nodes", steps)
+        count("circuits.edges_checked", steps + skipped)
 
-        unique_circuits = []
-        seen = set()
+    if budget is not None:
+        budget.spend(steps % CHECK_INTERVAL)
 
-        for circuit in circuits:
-            min_node = min(circuit[:-1])
-            min_idx = circuit.index(min_node)
-            normalized_circuit = tuple(circuit[min_idx:] + circuit[:min_idx]+ [min_node])
+def _canonical_trails(G, max_length=None, max_count=None, budget=None):
+    """
+    Run the circuit search behind iter_circuits.
 
-            if normalized_circuit not in seen:
-                seen.add(normalized_circuit)
-                unique_circuits.append(circuit)
+    The search simply stops when the budget runs out, leaving budget.reason set.
 
-    return unique_circuits
+    Yields:
+        tuple: (nodes, path) where path is the search's own list of node indices
+        for the circuit just found; it is reused, so copy it to keep it.
+    """
+    nodes, adjacency, num_edges = _trail_adjacency(G)
+    used = bytearray(num_edges)
+    found = 0
+    for start in range(len(nodes)):
+        for path in _trails_from(adjacency, used, start, max_length, budget):
+            yield nodes, path
+            found += 1
+            if max_count is not None and found >= max_count:
+                return
+        if budget is not None and budget.exhausted:
+            return
 
-def count_circuits(G):
+def _count_trails_task(adjacency, num_edges, start, max_length, budget):
+    """
+    Count the circuits whose smallest node is start by length, as a parallel task.
     """
-    Count the number of circuits in a directed graph.
+    counts = {}
+    for path in _trails_from(adjacency, bytearray(num_edges), start, max_length, budget):
+        counts[len(path) - 1] = counts.get(len(path) - 1, 0) + 1
+    return counts
+
+def iter_circuits(G, max_length=None, max_count=None, timeout=None, budget=None):
+    """
+    Generate every circuit (closed trail, no repeated edges) of a graph exactly once.
+
+    Each circuit is searched for only from its smallest node, using only edges
+    between that node and larger ones, and is yielded only in its canonical
+    rotation and orientation, so no set of already seen circuits is kept.
 
     Args:
-        G (object): A NetworkX directed graph object
+        G (object): A NetworkX graph object or CompactGraph, directed graphs are treated as undirected
+        max_length (int, optional): Maximum number of edges in a circuit: Defaults to None (unlimited).
+        max_count (int, optional): Stop after this many circuits: Defaults to None (unlimited).
+        timeout (float, optional): Stop after this many seconds: Defaults to None (unlimited).
+        budget (Budget, optional): Budget with a cancellation token, used instead of timeout; check
+            budget.exhausted afterwards to tell a cut-short run from a complete one: Defaults to None.
+
+    Yields:
+        list: A circuit as a list of nodes that starts and ends at its smallest node.
+    """
+    budget = make_budget(budget, timeout=timeout)
+    for nodes, path in _canonical_trails(G, max_length, max_count, budget):
+        yield [nodes[i] for i in path]
+
+def count_circuits_by_length(G, max_length=None, max_count=None, timeout=None, budget=None, workers=None):
+    """
+    Count the circuits of a graph by length without building any of them.
+
+    With workers the searches from each start node (the smallest node of
+    the circuits it finds) run across a process pool and the counts are
+    merged. A max_count limit is only honoured by the search in this
+    process, so workers is ignored when max_count is given.
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph, directed graphs are treated as undirected
+        max_length (int, optional): Maximum number of edges in a circuit: Defaults to None (unlimited).
+        max_count (int, optional): Stop counting at this many circuits: Defaults to None (unlimited).
+        timeout (float, optional): Stop after this many seconds: Defaults to None (unlimited).
+        budget (Budget, optional): Budget with a cancellation token, used instead of timeout: Defaults to None.
+        workers (int, optional): Number of worker processes: Defaults to None (search in this process).
+
+    Returns:
+        dict: Number of circuits keyed by their number of edges, in increasing order of length.
+        A PartialCounts of lower bounds if the budget ran out.
+    """
+    budget = make_budget(budget, timeout=timeout)
+    counts = {}
+    if workers is not None and workers > 1 and max_count is None:
+        nodes, adjacency, num_edges = _trail_adjacency(G)
+        tasks = [(adjacency, num_edges, start, max_length) for start in range(len(nodes))]
+        with stage("circuits.search"):
+            for found in run_tasks(_count_trails_task, tasks, workers, budget):
+                for length, number in found.items():
+                    counts[length] = counts.get(length, 0) + number
+    else:
+        with stage("circuits.search"):
+            for _, path in _canonical_trails(G, max_length, max_count, budget):
+                length = len(path) - 1
+                counts[length] = counts.get(length, 0) + 1
+    counts = dict(sorted(counts.items()))
+    if budget is not None and budget.exhausted:
+        return PartialCounts(counts, budget.reason)
+    return counts
+
+def find_circuits(G, max_length=None, max_count=None, timeout=None, budget=None):
+    """
+    Find all circuits in a graph.
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph, directed graphs are treated as undirected
+        max_length (int, optional): Maximum number of edges in a circuit: Defaults to None (unlimited).
+        max_count (int, optional): Stop after this many circuits: Defaults to None (unlimited).
+        timeout (float, optional): Stop after this many seconds: Defaults to None (unlimited).
+        budget (Budget, optional): Budget with a cancellation token, used instead of timeout: Defaults to None.
+
+    Returns:
+        list: A list of circuits, where each circuit is represented as a list of nodes.
+        A PartialList of the circuits found so far if the budget ran out.
+    """
+    budget = make_budget(budget, timeout=timeout)
+    with stage("circuits.search"):
+        circuits = list(iter_circuits(G, max_length=max_length, max_count=max_count, budget=budget))
+    if budget is not None and budget.exhausted:
+        return PartialList(circuits, budget.reason)
+    return circuits
+
+def count_circuits(G, max_length=None, max_count=None, timeout=None, budget=None, workers=None):
+    """
+    Count the number of circuits in a graph.
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph, directed graphs are treated as undirected
+        max_length (int, optional): Maximum number of edges in a circuit: Defaults to None (unlimited).
+        max_count (int, optional): Stop counting at this many circuits: Defaults to None (unlimited).
+        timeout (float, optional): Stop after this many seconds: Defaults to None (unlimited).
+        budget (Budget, optional): Budget with a cancellation token, used instead of timeout: Defaults to None.
+        workers (int, optional): Number of worker processes, see count_circuits_by_length: Defaults to None.
 
     Returns:
-        int: The number of circuits in the graph.
+        int: The number of circuits in the graph, a PartialCount lower bound if the budget ran out.
     """
-    return len(find_circuits(G))
+    lengths = count_circuits_by_length(G, max_length=max_length, max_count=max_count, timeout=timeout,
+                                       budget=budget, workers=workers)
+    if is_partial(lengths):
+        return PartialCount(sum(lengths.values()), lengths.reason)
+    return sum(lengths.values())
 
 def has_eulerian_circuit(G):
     """
     Check if a graph has an Eulerian circuit.
     
     An Eulerian circuit visits every edge exactly once and returns to the starting vertex.
+    The circuit is found with the linear-time Hierholzer engine in eulerian.py,
+    which also handles directed graphs and multigraphs.
     
     Args:
         G (object): A NetworkX graph object
@@ -80,79 +280,19 @@ def has_eulerian_circuit(G):
     Returns:
         tuple: (bool, list or None) - (True and the circuit if it exists, False and None otherwise)
     """
-    # Check if graph is connected
-    if isinstance(G, nx.DiGraph):
-        if not nx.is_strongly_connected(G):
-            return False, None
-        
-        # Check if all vertices have equal in and out degree
-        for node in G.nodes():
-            if G.in_degree(node) != G.out_degree(node):
-                return False, None
-    else:
-        if not nx.is_connected(G):
-            return False, None
-        
-        # Check if all vertices have even degree
-        for node, degree in G.degree():
-            if degree % 2 != 0:
-                return False, None
-    
-    # Find Eulerian circuit
-    try:
-        circuit = list(nx.eulerian_circuit(G))
-        # Convert edge list to node list
-        node_circuit = [circuit[0][0]]
-        for edge in circuit:
-            node_circuit.append(edge[1])
-        return True, node_circuit
-    except nx.NetworkXError:
-        return False, None
+    return eulerian_circuit(G)
 
 def find_edge_disjoint_circuits(G):
     """
     Find a set of edge-disjoint circuits that cover all edges in the graph.
+
+    Runs in O(V + E) without copying or modifying G, see eulerian.cycle_decomposition.
     
     Args:
         G (object): A NetworkX graph object
         
     Returns:
         list: A list of edge-disjoint circuits, where each circuit is a list of nodes.
+        Raises NetworkXError if some vertex has odd degree, since then no such set exists.
     """
-    # Make a copy of the graph to work with
-    H = G.copy()
-    circuits = []
-    
-    # While there are still edges in the graph
-    while H.number_of_edges() > 0:
-        # Start from any node with non-zero degree
-        for node in H.nodes():
-            if H.degree(node) > 0:
-                start_node = node
-                break
-        
-        # Build a circuit
-        current = start_node
-        circuit = [current]
-        while True:
-            # Find a neighbor
-            for neighbor in H.neighbors(current):
-                next_node = neighbor
-                break
-            
-            # Remove the edge
-            H.remove_edge(current, next_node)
-            
-            # Move to the next node
-            current = next_node
-            
-            # If we've returned to the start, we've completed a circuit
-            if current == start_node:
-                circuit.append(current)
-                break
-            else:
-                circuit.append(current)
-        
-        circuits.append(circuit)
-    
-    return circuits
\ No newline at end of file
+    return cycle_decomposition(G)
@@ -1,8 +1,28 @@
 import argparse
-from .generator import generate_random_graph
-from .analyzer import analyze_graph
-from .visualizer import visualize_graph, print_graph_info
-from .conditions import generate_graph_with_conditions
+import json
+import os
+import sys
+import time
+from .analyzer import EXPONENTIAL_METRICS, METRICS, SAMPLED_METRICS, analyze_graph
+from .estimation import ESTIMATE_SAMPLES
+from .visualizer import LAYOUTS, print_graph_info
+from .conditions import STRATEGIES, generate_graph_with_conditions, generate_graphs_with_conditions
+from .graph_io import FORMATS, graph_to_record, read_graphs
+from .profiling import Profile
+
+# Seconds each exponential analysis stage may run before a partial result is shown
+STAGE_TIMEOUT = 30.0
+
+# Metrics analysed when --metrics is not given: the polynomial ones, so the
+# exponential searches and the sampled estimates only run when named
+DEFAULT_METRICS = tuple(name for name in METRICS if name not in EXPONENTIAL_METRICS + SAMPLED_METRICS)
+
+CONDITION_FLAGS = {
+    "connected": "must_be_connected",
+    "even": "all_verticies_even_degree",
+    "closed": "must_be_closed",
+    "hamiltonian": "must_have_hamiltonian",
+}
 
 def get_user_input():
     """
@@ -48,9 +68,9 @@ def get_user_input():
     conditions['must_have_hamiltonian'] = input("Must have Hamiltonian cycle? (y/n): ").strip().lower() == 'y'
     return num_nodes, edge_probability, conditions
 
-def main():
+def interactive():
     """
-    Main function to run the graph generation and analysis with user input.
+    Run the graph generation and analysis with prompted user input, then plot the graph.
     """
 
     print("\n=== Graph Generation and Analysis ===")
@@ -61,16 +81,17 @@ def main():
     print("\nGenerating graph...")
     print(f"Conditions: {', '.join([c for c, v in conditions.items() if v])}")
 
-    G, attempts = generate_graph_with_conditions(num_nodes, edge_probability, conditions)
+    G, attempts, elapsed = generate_graph_with_conditions(num_nodes, edge_probability, conditions, strategy="hybrid")
 
     if G is None:
-        print(f"Failed to generate a graph that meets the specified conditions after {attempts} attempts.")
+        print(f"Failed to generate a graph that meets the specified conditions after {attempts} attempts ({elapsed:.2f}s).")
         return
     
-    print(f"Graph generated in {attempts} attempts.")
+    print(f"Graph generated in {attempts} attempts ({elapsed:.2f}s).")
 
-    is_connected, degrees, cycle_count, circuit_count, has_hamiltonian, hamiltonian_cycle, has_eulerian, eulerian_circuit= analyze_graph(G)
+    is_connected, degrees, cycle_count, circuit_count, has_hamiltonian, hamiltonian_cycle, has_eulerian, eulerian_circuit= analyze_graph(G, timeout=STAGE_TIMEOUT)
 
+    from .visualizer import visualize_graph
     visualize_graph(G, is_connected, degrees, hamiltonian_cycle, eulerian_circuit)
 
     print_graph_info(is_connected, degrees, cycle_count, circuit_count, has_hamiltonian, has_eulerian, hamiltonian_cycle, eulerian_circuit)
@@ -80,5 +101,238 @@ def main():
         if is_set:
             print(f"- {condition.replace('_', ' ').capitalize()}")
 
-    if __name__ == "__main__":
-        main()
\ No newline at end of file
+def _jsonable(value):
+    """
+    Convert analysis values into JSON types: tuples become lists and dict keys become strings.
+    """
+    if isinstance(value, dict):
+        return {key if isinstance(key, str) else json.dumps(_jsonable(key)): _jsonable(item)
+                for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return value
+    if hasattr(value, "to_dict"):
+        return _jsonable(value.to_dict())
+    return str(value)
+
+def _emit(record, out):
+    out.write(json.dumps(_jsonable(record)) + "\n")
+    out.flush()
+
+def _render(G, analysis, path, layout):
+    """
+    Save a plot of the graph with the headless Agg canvas, loading matplotlib only now.
+    """
+    from .visualizer import save_graph_image
+    save_graph_image(G, path, analysis.is_connected, analysis.hamiltonian_cycle, analysis.eulerian_circuit,
+                     layout=layout)
+
+def _analysis_record(G, args, index, job_index=None):
+    """
+    Analyse one graph with the selected metrics and build its output record.
+    """
+    metrics = args.metrics if args.metrics is not None else DEFAULT_METRICS
+    start = time.perf_counter()
+    analysis = analyze_graph(G, metrics=metrics, timeout=args.timeout, workers=args.search_workers,
+                             estimate={"samples": args.samples})
+    elapsed = time.perf_counter() - start
+
+    record = {
+        "index": index,
+        "num_nodes": G.number_of_nodes(),
+        "num_edges": G.number_of_edges(),
+        "analysis": analysis.to_dict(),
+        "partial": list(analysis.partial),
+        "timings": {"analyze": elapsed, "metrics": analysis.timings},
+    }
+    if args.render:
+        os.makedirs(args.render, exist_ok=True)
+        name = f"graph-{index}.png" if job_index is None else f"graph-{job_index}-{index}.png"
+        path = os.path.join(args.render, name)
+        start = time.perf_counter()
+        _render(G, analysis, path, args.layout)
+        record["image"] = path
+        record["timings"]["render"] = time.perf_counter() - start
+    return record
+
+def _job_from_args(args):
+    if args.spec:
+        with open(args.spec) as f:
+            return json.load(f)
+    return {
+        "nodes": args.nodes,
+        "probability": args.probability,
+        "conditions": {key: True for flag, key in CONDITION_FLAGS.items() if getattr(args, flag)},
+        "strategy": args.strategy,
+        "count": args.count,
+        "seed": args.seed,
+        "max_attempts": args.max_attempts,
+    }
+
+def _run_job(job, args, out, job_index=None):
+    """
+    Generate (and unless disabled analyse) the graphs of one job, streaming one record per graph.
+
+    Returns:
+        bool: True if every requested graph was generated.
+    """
+    num_nodes = job["nodes"]
+    edge_probability = job.get("probability", 0.5)
+    conditions = job.get("conditions", {})
+    strategy = job.get("strategy", "hybrid")
+    count = job.get("count", 1)
+    seed = job.get("seed")
+    max_attempts = job.get("max_attempts", 9999)
+
+    if count == 1:
+        G, attempts, elapsed = generate_graph_with_conditions(num_nodes, edge_probability, conditions, max_attempts=max_attempts,
+                                                              strategy=strategy, seed=seed)
+        results = [] if G is None else [(G, attempts, elapsed)]
+    else:
+        results = generate_graphs_with_conditions(count, num_nodes, edge_probability, conditions, workers=args.workers,
+                                                  seed=seed, max_attempts=max_attempts, strategy=strategy)
+
+    generated = 0
+    for index, (G, attempts, elapsed) in enumerate(results):
+        generated += 1
+        if args.no_analysis:
+            record = {"index": index, "num_nodes": G.number_of_nodes(), "num_edges": G.number_of_edges(), "timings": {}}
+        else:
+            record = _analysis_record(G, args, index, job_index)
+        if job_index is not None:
+            record["job"] = job_index
+        record["attempts"] = attempts
+        record["timings"]["generate"] = elapsed
+        _emit(graph_to_record(G, **record), out)
+
+    if generated < count:
+        record = {"error": f"generated {generated} of {count} graphs within {max_attempts} attempts per graph"}
+        if job_index is not None:
+            record["job"] = job_index
+        _emit(record, out)
+        return False
+    return True
+
+def command_generate(args, out=None):
+    out = sys.stdout if out is None else out
+    return 0 if _run_job(_job_from_args(args), args, out) else 1
+
+def command_analyze(args, out=None):
+    out = sys.stdout if out is None else out
+    index = 0
+    for source in args.inputs:
+        # Standard input usually carries the records of another subcommand
+        format = args.format or ("ndjson" if source == "-" else None)
+        for G in read_graphs(source, format=format, use_mmap=args.mmap):
+            record = _analysis_record(G, args, index)
+            record["source"] = source
+            _emit(record, out)
+            index += 1
+    return 0
+
+def command_batch(args, out=None):
+    """
+    Run every job of a spec file: a JSON list of jobs, {"jobs": [...]}, or NDJSON with one job per line.
+    """
+    with open(args.spec) as f:
+        text = f.read()
+    try:
+        spec = json.loads(text)
+    except json.JSONDecodeError:
+        spec = [json.loads(line) for line in text.splitlines() if line.strip()]
+    jobs = spec["jobs"] if isinstance(spec, dict) else spec
+    out = sys.stdout if out is None else out
+
+    ok = True
+    for job_index, job in enumerate(jobs):
+        ok = _run_job(job, args, out, job_index) and ok
+    return 0 if ok else 1
+
+def _metric_list(text):
+    metrics = [name.strip() for name in text.split(",") if name.strip()]
+    unknown = [name for name in metrics if name not in METRICS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown metrics {', '.join(unknown)}, expected names from {', '.join(METRICS)}")
+    return metrics
+
+def build_parser():
+    """
+    Build the argument parser of the command line interface.
+    """
+    parser = argparse.ArgumentParser(prog="run", description="Generate and analyse random graphs. "
+                                     "Without a subcommand the interactive prompts are used.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    analysis = argparse.ArgumentParser(add_help=False)
+    analysis.add_argument("--metrics", type=_metric_list, help=f"comma separated metrics ({', '.join(METRICS)}), "
+                          f"default {', '.join(DEFAULT_METRICS)}")
+    analysis.add_argument("--timeout", type=float, default=STAGE_TIMEOUT, help="seconds per exponential metric")
+    analysis.add_argument("--render", metavar="DIR", help="save a PNG plot of every graph into DIR")
+    analysis.add_argument("--layout", choices=LAYOUTS, default="auto", help="layout of the rendered plots, default auto")
+    analysis.add_argument("--profile", metavar="PATH",
+                          help="write stage timers and counters to PATH: JSON for a .json file, otherwise a pstats dump")
+    analysis.add_argument("--search-workers", type=int,
+                          help="worker processes splitting the search of each exponential metric, default 1")
+    analysis.add_argument("--samples", type=int, default=ESTIMATE_SAMPLES,
+                          help=f"random walks per estimate metric, default {ESTIMATE_SAMPLES}")
+
+    generation = argparse.ArgumentParser(add_help=False)
+    generation.add_argument("--workers", type=int, help="worker processes when generating several graphs, default all CPUs")
+    generation.add_argument("--no-analysis", action="store_true", help="only generate the graphs")
+
+    generate = subparsers.add_parser("generate", parents=[analysis, generation],
+                                     help="generate graphs meeting conditions and analyse them")
+    generate.add_argument("--spec", help="JSON file with one job, instead of the flags below")
+    generate.add_argument("--nodes", type=int, default=10, help="number of nodes, default 10")
+    generate.add_argument("--probability", type=float, default=0.5, help="edge probability, default 0.5")
+    for flag, key in CONDITION_FLAGS.items():
+        generate.add_argument(f"--{flag}", action="store_true", help=f"require {key.replace('_', ' ')}")
+    generate.add_argument("--strategy", choices=STRATEGIES, default="hybrid", help="generation strategy, default hybrid")
+    generate.add_argument("--count", type=int, default=1, help="number of graphs, default 1")
+    generate.add_argument("--seed", type=int, help="random seed")
+    generate.add_argument("--max-attempts", type=int, default=9999, help="attempts per graph, default 9999")
+    generate.set_defaults(func=command_generate)
+
+    analyze = subparsers.add_parser("analyze", parents=[analysis], help="analyse the graphs stored in files")
+    analyze.add_argument("inputs", nargs="*", default=["-"], help="graph files, - for stdin (default)")
+    analyze.add_argument("--format", choices=FORMATS,
+                         help="file format, default guessed from the extension (ndjson for stdin)")
+    analyze.add_argument("--mmap", action="store_true", help="read files through a memory map")
+    analyze.set_defaults(func=command_analyze)
+
+    batch = subparsers.add_parser("batch", parents=[analysis, generation], help="run the generation jobs of a spec file")
+    batch.add_argument("spec", help="JSON list of jobs (keys nodes, probability, conditions, strategy, count, seed, max_attempts)")
+    batch.set_defaults(func=command_batch)
+    return parser
+
+def main(argv=None):
+    """
+    Main function to run the graph generation and analysis, interactive without a subcommand.
+
+    Subcommands run headless and stream one JSON record per graph to stdout.
+
+    Returns:
+        int: Exit status.
+    """
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        interactive()
+        return 0
+    if args.profile is None:
+        return args.func(args)
+
+    with Profile() as profile:
+        status = args.func(args)
+    if args.profile.endswith(".json"):
+        profile.write_json(args.profile)
+    else:
+        profile.dump_stats(args.profile)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
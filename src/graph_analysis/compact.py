@@ -0,0 +1,244 @@
+import networkx as nx
+import numpy as np
+
+
+class CompactGraph:
+    """
+    Frozen, integer-indexed graph shared by the hot-path algorithms.
+
+    Nodes are relabelled 0..n-1, nodes[i] being the original label of i. The
+    neighbours of i are indices[indptr[i]:indptr[i + 1]] (CSR, sorted, out-
+    neighbours for directed graphs). adj[i] holds the same neighbours as a
+    Python int bitset (bit j set if j is a neighbour), and in_adj the in-
+    neighbours of directed graphs; both are built on first use, since bitsets
+    cost O(n^2) bits. Self-loops are listed in loops instead of the adjacency,
+    and parallel edges are collapsed.
+    """
+
+    __slots__ = ("nodes", "index", "directed", "indptr", "indices", "loops",
+                 "_adj", "_in_adj", "__weakref__")
+
+    def __init__(self, nodes, edges, directed=False):
+        """
+        Args:
+            nodes (iterable): Original node labels, in index order
+            edges (iterable or numpy.ndarray): (i, j) index pairs, duplicates allowed
+            directed (bool, optional): Whether (i, j) only links i to j: Defaults to False.
+        """
+        nodes = tuple(nodes)
+        n = len(nodes)
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+
+        is_loop = edges[:, 0] == edges[:, 1]
+        loops = tuple(int(v) for v in np.unique(edges[is_loop, 0]))
+        edges = edges[~is_loop]
+        if not directed:
+            edges = np.concatenate((edges, edges[:, ::-1]))
+        # Sorting i * n + j orders the pairs by row and drops duplicates in one 1-D pass
+        keys = np.unique(edges[:, 0] * n + edges[:, 1])
+        edges = np.column_stack((keys // n, keys % n)) if n else edges
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edges[:, 0], minlength=n), out=indptr[1:])
+        indices = np.ascontiguousarray(edges[:, 1])
+        indptr.flags.writeable = False
+        indices.flags.writeable = False
+
+        set_attr = object.__setattr__
+        set_attr(self, "nodes", nodes)
+        set_attr(self, "index", {node: i for i, node in enumerate(nodes)})
+        set_attr(self, "directed", bool(directed))
+        set_attr(self, "indptr", indptr)
+        set_attr(self, "indices", indices)
+        set_attr(self, "loops", loops)
+        set_attr(self, "_adj", None)
+        set_attr(self, "_in_adj", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompactGraph is immutable")
+
+    @classmethod
+    def from_networkx(cls, G, nodes=None):
+        """
+        Build a compact graph from a NetworkX graph.
+
+        Args:
+            G (object): A NetworkX graph object
+            nodes (list, optional): Node order to use for the labels 0..n-1: Defaults to G's node order.
+
+        Returns:
+            CompactGraph: The compact graph.
+        """
+        nodes = list(G.nodes()) if nodes is None else list(nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = [(index[u], index[v]) for u, v in G.edges()]
+        return cls(nodes, edges, directed=G.is_directed())
+
+    @classmethod
+    def from_edges(cls, num_nodes, edges, directed=False):
+        """
+        Build a compact graph on nodes 0..num_nodes-1, e.g. from generator.random_edge_array.
+        """
+        return cls(range(num_nodes), edges, directed=directed)
+
+    def to_networkx(self):
+        """
+        Convert back to a NetworkX Graph or DiGraph with the original node labels.
+        """
+        G = nx.DiGraph() if self.directed else nx.Graph()
+        G.add_nodes_from(self.nodes)
+        G.add_edges_from((self.nodes[u], self.nodes[v]) for u, v in self.edges())
+        return G
+
+    def to_undirected(self):
+        """
+        Return the undirected compact graph with the same nodes, or self if already undirected.
+        """
+        if not self.directed:
+            return self
+        return CompactGraph(self.nodes, list(self.edges()))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def number_of_nodes(self):
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        pairs = len(self.indices) if self.directed else len(self.indices) // 2
+        return pairs + len(self.loops)
+
+    def is_directed(self):
+        return self.directed
+
+    def neighbors(self, i):
+        """
+        Return the (out-)neighbours of index i as a sorted array of indices.
+        """
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def edges(self):
+        """
+        Yield every edge once as an (i, j) index pair, i < j for undirected graphs, self-loops included.
+        """
+        indptr, indices = self.indptr.tolist(), self.indices.tolist()
+        for i in range(len(self.nodes)):
+            for j in indices[indptr[i]:indptr[i + 1]]:
+                if self.directed or i < j:
+                    yield i, j
+        for v in self.loops:
+            yield v, v
+
+    @property
+    def degrees(self):
+        """
+        Degrees by index, counted like NetworkX (a self-loop adds 2, in + out for directed graphs).
+        """
+        degrees = np.diff(self.indptr)
+        if self.directed:
+            degrees = degrees + np.bincount(self.indices, minlength=len(self.nodes))
+        if self.loops:
+            degrees = degrees.copy()
+            degrees[list(self.loops)] += 2
+        return degrees
+
+    @property
+    def adj(self):
+        if self._adj is None:
+            object.__setattr__(self, "_adj", tuple(self._bitsets(self.indptr, self.indices)))
+        return self._adj
+
+    @property
+    def in_adj(self):
+        if not self.directed:
+            return self.adj
+        if self._in_adj is None:
+            bits = [0] * len(self.nodes)
+            for i, out_bits in enumerate(self.adj):
+                while out_bits:
+                    low_bit = out_bits & -out_bits
+                    bits[low_bit.bit_length() - 1] |= 1 << i
+                    out_bits ^= low_bit
+            object.__setattr__(self, "_in_adj", tuple(bits))
+        return self._in_adj
+
+    @staticmethod
+    def _bitsets(indptr, indices):
+        indptr, indices = indptr.tolist(), indices.tolist()
+        for i in range(len(indptr) - 1):
+            bits = 0
+            for j in indices[indptr[i]:indptr[i + 1]]:
+                bits |= 1 << j
+            yield bits
+
+    def components(self):
+        """
+        Find the (weakly) connected components by breadth-first search over the CSR arrays.
+
+        Returns:
+            list: One list of node indices per component.
+        """
+        graph = self.to_undirected()
+        indptr, indices = graph.indptr.tolist(), graph.indices.tolist()
+        seen = bytearray(len(self.nodes))
+        components = []
+        for root in range(len(self.nodes)):
+            if seen[root]:
+                continue
+            seen[root] = 1
+            component = [root]
+            for v in component:
+                for w in indices[indptr[v]:indptr[v + 1]]:
+                    if not seen[w]:
+                        seen[w] = 1
+                        component.append(w)
+            components.append(component)
+        return components
+
+    def is_connected(self):
+        """
+        Check if the graph is (weakly) connected; the null graph is not.
+        """
+        return len(self.nodes) > 0 and len(self.components()) == 1
+
+    def __repr__(self):
+        kind = "directed" if self.directed else "undirected"
+        return f"CompactGraph({len(self.nodes)} nodes, {self.number_of_edges()} edges, {kind})"
+
+
+def as_compact(G, nodes=None):
+    """
+    Return G unchanged if it is already a CompactGraph, otherwise build one.
+
+    Args:
+        G (object): A NetworkX graph object or a CompactGraph
+        nodes (list, optional): Node order for a new compact graph: Defaults to G's node order.
+
+    Returns:
+        CompactGraph: The compact graph.
+    """
+    if isinstance(G, CompactGraph):
+        return G
+    return CompactGraph.from_networkx(G, nodes=nodes)
+
+
+def graph_fingerprint(G):
+    """
+    Identify the current structure of a graph, so work on an unchanged graph can be reused.
+
+    Two fingerprints of the same graph compare equal until a node or an edge is
+    added or removed; attributes are ignored.
+
+    Args:
+        G (object): A NetworkX graph object or a CompactGraph
+
+    Returns:
+        tuple: (nodes, frozenset of edges), or None for a CompactGraph, which never changes.
+    """
+    if isinstance(G, CompactGraph):
+        return None
+    if G.is_directed():
+        edges = frozenset(G.edges())
+    else:
+        edges = frozenset(frozenset(edge) for edge in G.edges())
+    return tuple(G.nodes()), edges
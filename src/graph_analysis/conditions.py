@@ -1,65 +1,433 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
 import networkx as nx
+import numpy as np
+from .compact import CompactGraph
+from .dynamic import DynamicGraph
 from .generator import generate_random_graph
+from .parallel import TASKS_PER_WORKER, worker_pool, worker_token
 from .cycles import has_hamiltonian_cycle
+from .profiling import count, enabled, stage
+
+STRATEGIES = ("rejection", "constructive", "hybrid")
+
+# Rejection attempts the hybrid strategy makes before it starts constructing graphs
+HYBRID_REJECTION_ATTEMPTS = 100
+
+# Attempts per task in generate_graphs_with_conditions; small tasks keep the
+# results held back behind a slow task few
+BATCH_CHUNK_ATTEMPTS = 64
+
+def _check_closed(G, nodes, degrees):
+    for node, degree in zip(nodes, degrees):
+        if degree == 0:
+            return f"Node {node} has no edges."
+    return None
+
+def _check_min_degree(G, nodes, degrees):
+    for node, degree in zip(nodes, degrees):
+        if degree < 2:
+            return f"Node {node} has degree {degree}, so the graph has no Hamiltonian cycle."
+    return None
+
+def _check_parity(G, nodes, degrees):
+    for node, degree in zip(nodes, degrees):
+        if degree % 2 != 0:
+            return f"Node {node} has an odd degree."
+    return None
+
+def _check_connected(G, nodes, degrees):
+    """
+    Check connectivity with union-find over the edge list, stopping once one component is left.
+    """
+    n = len(nodes)
+    if n == 0 or (n > 1 and 0 in degrees):
+        return "Graph is not connected."
+    if isinstance(G, CompactGraph):
+        return None if G.is_connected() else "Graph is not connected."
+
+    index = {node: i for i, node in enumerate(nodes)}
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    components = n
+    for u, v in G.edges():
+        if components == 1:
+            break
+        root_u, root_v = find(index[u]), find(index[v])
+        if root_u != root_v:
+            parent[root_u] = root_v
+            components -= 1
+
+    return None if components == 1 else "Graph is not connected."
+
+def _check_hamiltonian(G, nodes, degrees):
+    has_cycle, _ = has_hamiltonian_cycle(G)
+    return None if has_cycle else "Graph does not have a Hamiltonian cycle"
+
+class ConditionPipeline:
+    """
+    Condition checks compiled once for a conditions dict and run cheapest first.
+
+    One degree pass is shared by every check. The order is isolated vertices,
+    parity, connectivity (union-find) and finally the Hamiltonian search. A
+    Hamiltonian cycle implies a closed, connected graph with minimum degree 2,
+    so when it is required the isolated vertex check is replaced by a minimum
+    degree check and connectivity is always tested before the search.
+
+    Every call updates stats, which counts how often each check ran and how
+    often it rejected a graph.
+    """
+
+    def __init__(self, conditions):
+        self.conditions = dict(conditions)
+        hamiltonian = self.conditions.get('must_have_hamiltonian', False)
+
+        self.checks = []
+        if hamiltonian:
+            self.checks.append(("min_degree", _check_min_degree))
+        elif self.conditions.get('must_be_closed', False):
+            self.checks.append(("closed", _check_closed))
+        if self.conditions.get('all_verticies_even_degree', False):
+            self.checks.append(("parity", _check_parity))
+        if hamiltonian or self.conditions.get('must_be_connected', False):
+            self.checks.append(("connected", _check_connected))
+        if hamiltonian:
+            self.checks.append(("hamiltonian", _check_hamiltonian))
+
+        self.graphs_checked = 0
+        self.graphs_passed = 0
+        self.stats = {name: {"checked": 0, "rejected": 0} for name, _ in self.checks}
+
+    def __call__(self, G):
+        """
+        Check if the graph meets all conditions of the pipeline.
+
+        Args:
+            G (object): A NetworkX graph object or CompactGraph
+
+        Returns:
+            bool: True if all conditions are met, False otherwise.
+            str: Reason for failure if conditions are not met.
+        """
+        self.graphs_checked += 1
+        if isinstance(G, CompactGraph):
+            nodes = list(G.nodes)
+            degrees = G.degrees.tolist()
+        else:
+            nodes = list(G.nodes())
+            degrees = [degree for _, degree in G.degree(nodes)]
+
+        # Stage and counter names are only built while a Profile collects them
+        profiled = enabled()
+        for name, check in self.checks:
+            self.stats[name]["checked"] += 1
+            if profiled:
+                with stage(f"conditions.{name}"):
+                    reason = check(G, nodes, degrees)
+            else:
+                reason = check(G, nodes, degrees)
+            if reason is not None:
+                self.stats[name]["rejected"] += 1
+                if profiled:
+                    count(f"conditions.{name}.rejected")
+                return False, reason
+
+        self.graphs_passed += 1
+        return True, "all conditions met"
+
+    @property
+    def pass_rate(self):
+        """
+        Fraction of checked graphs that met every condition, None before the first check.
+        """
+        if not self.graphs_checked:
+            return None
+        return self.graphs_passed / self.graphs_checked
 
 def check_graph_conditons(G, conditions):
     """
     Check if the graph meets all specified conditions.
 
+    A DynamicGraph answers from the counts it maintains (see
+    DynamicGraph.check_conditions) instead of a pass over the graph.
+
     Args:
-        G (object): A NetworkX graph object
-        conditions (dict)): Dictionary with condition flags
+        G (object): A NetworkX graph object or DynamicGraph
+        conditions (dict or ConditionPipeline): Dictionary with condition flags, or a compiled pipeline
     
     Returns: 
         bool: True if all conditions are met, False otherwise.
         str: Reason for failure if conditions are not met.    
     """
+    if isinstance(G, DynamicGraph):
+        if isinstance(conditions, ConditionPipeline):
+            conditions = conditions.conditions
+        return G.check_conditions(conditions)
+    if not isinstance(conditions, ConditionPipeline):
+        conditions = ConditionPipeline(conditions)
+    return conditions(G)
 
-    if conditions.get('must_be_connected', False):
-        if not nx.is_connected(G):
-            return False, "Graph is not connected."
-        
-    if conditions.get('all_verticies_even_degree', False):
-        degrees = dict(G.degree())
-        for node, degree in degrees.items():
-            if degree % 2 != 0:
-                return False, f"Node {node} has an odd degree."
-            
-    if conditions.get('must_be_closed', False):
-        degrees = dict(G.degree())
-        for node, degree in degrees.items():
-            if degree == 0:
-                return False, f"Node {node} has no edges."
-
-    if conditions.get('must_have_hamiltonian', False):
-        has_cycle, _ = has_hamiltonian_cycle(G)
-        if not has_cycle:
-            return False, "Graph does not have a Hamiltonian cycle" 
-
-    return True, "all conditions met"
-
-def generate_graph_with_conditions(num_nodes, edge_probability, conditions,max_attempts=9999):
-    """_summary_
+def _plant_spanning_structure(G, conditions, rng):
+    """
+    Add a random Hamiltonian cycle or spanning tree to G as the conditions require.
+
+    Returns:
+        set: The planted edges, which parity repair must not remove.
+    """
+    order = [int(v) for v in rng.permutation(G.number_of_nodes())]
+    protected = set()
+
+    if conditions.get('must_have_hamiltonian', False) and len(order) >= 3:
+        for i, u in enumerate(order):
+            protected.add(frozenset((u, order[(i + 1) % len(order)])))
+    elif conditions.get('must_be_connected', False):
+        for i in range(1, len(order)):
+            parent = order[int(rng.integers(i))]
+            protected.add(frozenset((order[i], parent)))
+
+    G.add_edges_from(tuple(edge) for edge in protected)
+    return protected
+
+def _toggle_allowed(G, u, v, protected, keep_closed):
+    if not G.has_edge(u, v):
+        return True
+    if frozenset((u, v)) in protected:
+        return False
+    return not keep_closed or (G.degree(u) > 1 and G.degree(v) > 1)
+
+def _toggle(G, u, v):
+    if G.has_edge(u, v):
+        G.remove_edge(u, v)
+    else:
+        G.add_edge(u, v)
+
+def _repair_parity(G, protected, keep_closed, rng):
+    """
+    Make every degree even by pairing up the odd-degree vertices.
+
+    Each pair (u, v) is fixed by toggling the edge u-v, or failing that the two
+    edges of a path u-w-v, which leaves the parity of w unchanged. Protected
+    edges are never removed, and with keep_closed no vertex is left isolated.
+
+    Returns:
+        bool: True if every pair could be repaired.
+    """
+    odd = [v for v, degree in G.degree() if degree % 2]
+    odd = [odd[int(i)] for i in rng.permutation(len(odd))]
+    nodes = list(G.nodes())
+
+    for u, v in zip(odd[::2], odd[1::2]):
+        if _toggle_allowed(G, u, v, protected, keep_closed):
+            _toggle(G, u, v)
+            continue
+
+        for i in rng.permutation(len(nodes)):
+            w = nodes[int(i)]
+            if w in (u, v):
+                continue
+            if not (_toggle_allowed(G, u, w, protected, keep_closed) and _toggle_allowed(G, w, v, protected, keep_closed)):
+                continue
+            if keep_closed and G.has_edge(u, w) and G.has_edge(w, v) and G.degree(w) == 2:
+                continue
+            _toggle(G, u, w)
+            _toggle(G, w, v)
+            break
+        else:
+            return False
+
+    return True
+
+def construct_graph_with_conditions(num_nodes, edge_probability, conditions, seed=None):
+    """
+    Build a random graph that is constructed to meet the specified conditions.
+
+    A G(n, p) sample is combined with a planted Hamiltonian cycle (for
+    must_have_hamiltonian) or a random spanning tree (for must_be_connected),
+    isolated vertices are joined to a random vertex (for must_be_closed) and
+    odd-degree vertices are paired up and repaired (for all_verticies_even_degree).
+    The result is not a uniform sample of the conditioned G(n, p) distribution.
 
     Args:
         num_nodes (int): number of nodes in the graph
         edge_probability (float): probability of creating an edge between any two vertices
         conditions (dict): dictionary with condition flags
+        seed (int or numpy.random.Generator, optional): Seed or generator for reproducible graphs: Defaults to None.
+
+    Returns:
+        G (object): A NetworkX graph object, or None if the parity repair got stuck
+    """
+    rng = np.random.default_rng(seed)
+    G = generate_random_graph(num_nodes, edge_probability, seed=rng)
+    protected = _plant_spanning_structure(G, conditions, rng)
+
+    keep_closed = conditions.get('must_be_closed', False)
+    if keep_closed and num_nodes > 1:
+        for v in [v for v, degree in G.degree() if degree == 0]:
+            if G.degree(v) == 0:
+                w = int(rng.integers(num_nodes - 1))
+                G.add_edge(v, w if w < v else w + 1)
+
+    if conditions.get('all_verticies_even_degree', False):
+        if not _repair_parity(G, protected, keep_closed, rng):
+            return None
+
+    return G
+
+def generate_graph_with_conditions(num_nodes, edge_probability, conditions, max_attempts=9999, strategy="rejection", seed=None,
+                                   cancel=None):
+    """
+    Generate a random graph that meets the specified conditions.
+
+    The "rejection" strategy samples G(n, p) graphs until one passes the checks,
+    "constructive" builds each attempt with construct_graph_with_conditions, and
+    "hybrid" tries up to HYBRID_REJECTION_ATTEMPTS rejection attempts before
+    switching to constructive ones.
+
+    Args:
+        num_nodes (int): number of nodes in the graph
+        edge_probability (float): probability of creating an edge between any two vertices
+        conditions (dict or ConditionPipeline): dictionary with condition flags, or a compiled
+           pipeline whose stats then record the rejections of this run
            - must_be_connected (bool): whether the graph must be connected
            - all_verticies_even_degree (bool): whether all vertices must have even degree
            - must_be_closed (bool): whether the graph must be closed
-        max_attempts (int, optional): Max number of generation attempts: Defaults to 100.
+           - must_have_hamiltonian (bool): whether the graph must have a Hamiltonian cycle
+        max_attempts (int, optional): Max number of generation attempts: Defaults to 9999.
+        strategy (str, optional): "rejection", "constructive" or "hybrid": Defaults to "rejection".
+        seed (int or numpy.random.Generator, optional): Seed or generator for reproducible graphs: Defaults to None.
+        cancel (CancellationToken, optional): Token checked before every attempt, generation gives up
+            once it is cancelled: Defaults to None.
 
     Returns:
-        G (object): A NetworkX graph object that meets the specified conditions
+        G (object): A NetworkX graph object that meets the specified conditions, or None
         attempts: number of attempts taken to generate the graph
+        elapsed: time spent generating, in seconds
     """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}, expected one of {', '.join(STRATEGIES)}")
+
+    pipeline = conditions if isinstance(conditions, ConditionPipeline) else ConditionPipeline(conditions)
+    conditions = pipeline.conditions
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
 
     for attempt in range(1, max_attempts + 1):
-        G = generate_random_graph(num_nodes, edge_probability)
-        is_valid, reason = check_graph_conditons(G, conditions)
+        if cancel is not None and cancel.cancelled:
+            return None, attempt - 1, time.perf_counter() - start
+        count("generate.attempts")
+        with stage("generate.sample"):
+            if strategy == "rejection" or (strategy == "hybrid" and attempt <= HYBRID_REJECTION_ATTEMPTS):
+                G = generate_random_graph(num_nodes, edge_probability, seed=rng)
+            else:
+                G = construct_graph_with_conditions(num_nodes, edge_probability, conditions, seed=rng)
+        if G is None:
+            count("generate.construction_failures")
+            continue
+
+        with stage("generate.check"):
+            is_valid, reason = pipeline(G)
 
         if is_valid:
-            return G, attempt
+            return G, attempt, time.perf_counter() - start
         
-    return None, max_attempts
\ No newline at end of file
+    return None, max_attempts, time.perf_counter() - start
+
+def _generate_chunk(num_nodes, edge_probability, conditions, max_attempts, strategy, seed):
+    """
+    Run one batch task and return its graph as an edge list, which is cheaper to send back than a graph.
+
+    In a worker of worker_pool the task stops at its next attempt once the pool's flag is set.
+    """
+    G, attempts, elapsed = generate_graph_with_conditions(num_nodes, edge_probability, conditions, max_attempts=max_attempts,
+                                                          strategy=strategy, seed=seed, cancel=worker_token())
+    return (None if G is None else list(G.edges())), attempts, elapsed
+
+def generate_graphs_with_conditions(n_graphs, num_nodes, edge_probability, conditions, workers=None, seed=None, max_attempts=9999, strategy="rejection"):
+    """
+    Generate many graphs that meet the specified conditions across a process pool.
+
+    The attempts are split into tasks of BATCH_CHUNK_ATTEMPTS attempts, each
+    seeded with its own child of a numpy SeedSequence, so task i always draws
+    the same graphs for a given seed. Accepted graphs are yielded in task
+    order, which makes the batch for a seed the same for any number of
+    workers; a slow task holds back the graphs of later tasks that finished
+    first. Once n_graphs graphs have been yielded or the generator is closed,
+    pending tasks are dropped and running ones stop before their next attempt.
+    With the hybrid strategy the first HYBRID_REJECTION_ATTEMPTS attempts of
+    the whole batch use rejection.
+
+    Args:
+        n_graphs (int): number of graphs to generate
+        num_nodes (int): number of nodes in each graph
+        edge_probability (float): probability of creating an edge between any two vertices
+        conditions (dict): dictionary with condition flags, see generate_graph_with_conditions
+        workers (int, optional): Number of worker processes, 1 runs in this process: Defaults to os.cpu_count().
+        seed (int, optional): Seed for a reproducible batch: Defaults to None.
+        max_attempts (int, optional): Attempt budget per requested graph: Defaults to 9999.
+        strategy (str, optional): "rejection", "constructive" or "hybrid": Defaults to "rejection".
+
+    Yields:
+        tuple: (G, attempts, elapsed) for each accepted graph, where attempts and
+        elapsed are those of the task that produced it.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}, expected one of {', '.join(STRATEGIES)}")
+
+    workers = workers or os.cpu_count() or 1
+    seeds = np.random.SeedSequence(seed)
+    budget = n_graphs * max_attempts
+    submitted = 0
+    accepted = 0
+
+    def next_task():
+        nonlocal submitted
+        attempts = min(BATCH_CHUNK_ATTEMPTS, budget - submitted)
+        task_strategy = strategy
+        if strategy == "hybrid":
+            task_strategy = "rejection" if submitted < HYBRID_REJECTION_ATTEMPTS else "constructive"
+        submitted += attempts
+        return num_nodes, edge_probability, conditions, attempts, task_strategy, seeds.spawn(1)[0]
+
+    def to_graph(edges):
+        G = nx.Graph()
+        G.add_nodes_from(range(num_nodes))
+        G.add_edges_from(edges)
+        return G
+
+    if workers == 1:
+        while accepted < n_graphs and submitted < budget:
+            edges, attempts, elapsed = _generate_chunk(*next_task())
+            if edges is not None:
+                accepted += 1
+                yield to_graph(edges), attempts, elapsed
+        return
+
+    # Running futures map to their task number, finished results wait in finished for their turn
+    running = {}
+    finished = {}
+    tasks = 0
+    turn = 0
+    with worker_pool(workers) as (executor, _):
+        while accepted < n_graphs:
+            while len(running) < workers * TASKS_PER_WORKER and submitted < budget:
+                running[executor.submit(_generate_chunk, *next_task())] = tasks
+                tasks += 1
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished[running.pop(future)] = future.result()
+            while turn in finished and accepted < n_graphs:
+                edges, attempts, elapsed = finished.pop(turn)
+                turn += 1
+                if edges is not None:
+                    accepted += 1
+                    yield to_graph(edges), attempts, elapsed
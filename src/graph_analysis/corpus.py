@@ -0,0 +1,151 @@
+import heapq
+import os
+from concurrent.futures import FIRST_COMPLETED, wait
+import numpy as np
+from .analyzer import METRICS, analyze_graph
+from .compact import CompactGraph, as_compact
+from .parallel import TASKS_PER_WORKER, worker_pool, worker_token
+
+# Graphs whose cycle rank is at most this are cheap enough to be shipped in chunks
+AUTO_CHUNK_MAX_RANK = 8
+
+# Largest chunk the "auto" chunk size builds
+AUTO_CHUNK_SIZE = 32
+
+
+def _serialize(G):
+    """
+    Pack a graph into plain data for a worker: its labels (or n for labels 0..n-1), an int32 edge array and the direction.
+    """
+    graph = as_compact(G)
+    nodes = graph.nodes
+    if all(type(node) is int and node == i for i, node in enumerate(nodes)):
+        nodes = len(nodes)
+    rows = np.repeat(np.arange(len(graph), dtype=np.int32), np.diff(graph.indptr))
+    keep = slice(None) if graph.directed else rows < graph.indices
+    loops = np.array(graph.loops, dtype=np.int32)
+    edges = np.concatenate((np.column_stack((rows[keep], graph.indices[keep])).astype(np.int32),
+                            np.column_stack((loops, loops))))
+    return nodes, edges, graph.directed
+
+
+def _deserialize(payload):
+    nodes, edges, directed = payload
+    if isinstance(nodes, int):
+        nodes = range(nodes)
+    return CompactGraph(nodes, edges, directed=directed)
+
+
+def estimated_cost(G):
+    """
+    Estimate the relative cost of analysing a graph.
+
+    The exponential metrics search spaces that grow with the cycle rank
+    m - n + 1 (the number of independent cycles), and then with n.
+
+    Returns:
+        tuple: (cycle rank, number of nodes), larger meaning more expensive.
+    """
+    n, m = G.number_of_nodes(), G.number_of_edges()
+    return max(m - n + 1, 0), n
+
+
+def _analyze_chunk(tasks, metrics, timeout):
+    """
+    Analyse the (index, payload) tasks of one chunk.
+
+    Returns:
+        list: (index, GraphAnalysis) pairs.
+    """
+    return [(index, analyze_graph(_deserialize(payload), metrics=metrics, timeout=timeout, cancel=worker_token()))
+            for index, payload in tasks]
+
+
+def _chunks(pending, chunksize, workers):
+    """
+    Pop the next chunk from the heap of pending tasks, most expensive first.
+
+    With chunksize "auto" an expensive graph travels alone and cheap graphs
+    are grouped, in chunks small enough to keep every worker busy.
+    """
+    cost, index, payload = heapq.heappop(pending)
+    chunk = [(index, payload)]
+    if chunksize == "auto":
+        if -cost[0] > AUTO_CHUNK_MAX_RANK:
+            return chunk
+        size = max(1, min(AUTO_CHUNK_SIZE, len(pending) // (4 * workers)))
+    else:
+        size = chunksize
+    while len(chunk) < size and pending:
+        _, index, payload = heapq.heappop(pending)
+        chunk.append((index, payload))
+    return chunk
+
+
+def analyze_many(graphs, workers=None, chunksize="auto", metrics=None, timeout=None, lookahead=1024):
+    """
+    Analyse many graphs across a process pool, yielding results as they complete.
+
+    Graphs are sent to the workers as compact index arrays (see CompactGraph)
+    rather than pickled NetworkX graphs. Up to lookahead graphs are read ahead
+    from graphs and dispatched most expensive first (see estimated_cost), so
+    the stragglers of a skewed corpus start early instead of holding up the
+    end of the run. New tasks are submitted as soon as a worker finishes one.
+
+    Each exponential metric of each graph runs under its own budget of timeout
+    seconds, as in analyze_graph. Closing the iterator early cancels the tasks
+    that have not started and stops the running ones through a shared
+    cancellation token.
+
+    Args:
+        graphs (iterable): NetworkX graphs or CompactGraphs, e.g. from read_graphs
+        workers (int, optional): Number of worker processes, 1 analyses in this process: Defaults to os.cpu_count().
+        chunksize (int or str, optional): Graphs per task, or "auto": Defaults to "auto".
+        metrics (iterable, optional): Names from METRICS to compute: Defaults to None (all).
+        timeout (float or dict, optional): Seconds per exponential metric, see analyze_graph: Defaults to None (unlimited).
+        lookahead (int, optional): Number of graphs read ahead and ordered by cost: Defaults to 1024.
+
+    Yields:
+        tuple: (index, GraphAnalysis) in completion order, index being the position of the graph in graphs.
+    """
+    if chunksize != "auto" and (not isinstance(chunksize, int) or chunksize < 1):
+        raise ValueError(f"chunksize must be a positive int or 'auto', got {chunksize!r}")
+    metrics = METRICS if metrics is None else tuple(metrics)
+    workers = workers or os.cpu_count() or 1
+    lookahead = max(lookahead, workers * TASKS_PER_WORKER)
+
+    graphs = enumerate(graphs)
+    pending = []
+    exhausted = False
+
+    def fill():
+        nonlocal exhausted
+        while not exhausted and len(pending) < lookahead:
+            item = next(graphs, None)
+            if item is None:
+                exhausted = True
+                break
+            index, G = item
+            cost = estimated_cost(G)
+            heapq.heappush(pending, ((-cost[0], -cost[1]), index, _serialize(G)))
+
+    if workers == 1:
+        fill()
+        while pending:
+            yield from _analyze_chunk(_chunks(pending, 1, 1), metrics, timeout)
+            fill()
+        return
+
+    running = set()
+    with worker_pool(workers) as (executor, _):
+        while True:
+            fill()
+            while pending and len(running) < workers * TASKS_PER_WORKER:
+                chunk = _chunks(pending, chunksize, workers)
+                running.add(executor.submit(_analyze_chunk, chunk, metrics, timeout))
+                fill()
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
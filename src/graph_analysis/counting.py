@@ -0,0 +1,245 @@
+from .budget import CHECK_INTERVAL, BudgetExhausted, PartialCounts
+from .compact import as_compact
+from .parallel import run_tasks
+from .profiling import count, stage
+
+
+def _biconnected_components(adj):
+    """
+    Find the biconnected components of a graph given as adjacency bitsets.
+
+    Iterative Tarjan search: when a child w of v has low[w] >= disc[v], the
+    vertices stacked since w together with v form one component.
+
+    Returns:
+        list: One vertex bitset per component (bridges give two-vertex components).
+    """
+    n = len(adj)
+    disc = [-1] * n
+    low = [0] * n
+    counter = 0
+    components = []
+
+    for root in range(n):
+        if disc[root] >= 0 or not adj[root]:
+            continue
+        disc[root] = low[root] = counter
+        counter += 1
+        vertices = [root]
+        stack = [[root, -1, adj[root]]]
+        while stack:
+            frame = stack[-1]
+            v, parent, pending = frame
+            if pending:
+                low_bit = pending & -pending
+                frame[2] = pending ^ low_bit
+                w = low_bit.bit_length() - 1
+                if disc[w] < 0:
+                    disc[w] = low[w] = counter
+                    counter += 1
+                    vertices.append(w)
+                    stack.append([w, v, adj[w]])
+                elif w != parent and disc[w] < low[v]:
+                    low[v] = disc[w]
+            else:
+                stack.pop()
+                if stack:
+                    p = stack[-1][0]
+                    if low[v] < low[p]:
+                        low[p] = low[v]
+                    if low[v] >= disc[p]:
+                        component = 1 << p
+                        while True:
+                            x = vertices.pop()
+                            component |= 1 << x
+                            if x == v:
+                                break
+                        components.append(component)
+    return components
+
+
+def _component_bitsets(adj, component):
+    """
+    Relabel the vertices of one component to 0..k-1 and restrict the adjacency bitsets to it.
+    """
+    vertices = []
+    rest = component
+    while rest:
+        low_bit = rest & -rest
+        vertices.append(low_bit.bit_length() - 1)
+        rest ^= low_bit
+    position = {v: i for i, v in enumerate(vertices)}
+
+    local = []
+    for v in vertices:
+        bits = 0
+        rest = adj[v] & component
+        while rest:
+            low_bit = rest & -rest
+            bits |= 1 << position[low_bit.bit_length() - 1]
+            rest ^= low_bit
+        local.append(bits)
+    return local
+
+
+def _two_core(adj, region):
+    """
+    Repeatedly drop vertices with fewer than two neighbours inside region.
+    """
+    changed = True
+    while changed:
+        changed = False
+        rest = region
+        while rest:
+            low_bit = rest & -rest
+            if (adj[low_bit.bit_length() - 1] & region).bit_count() < 2:
+                region ^= low_bit
+                changed = True
+            rest ^= low_bit
+    return region
+
+
+def _count_from(adj, s, first, counts, max_length, budget):
+    """
+    Add the cycles whose smallest vertex is s and whose second vertex is in first to counts.
+
+    Depth-first search over simple paths from s through larger vertices. A
+    branch is cut as soon as no unvisited neighbour of s is left to close a
+    cycle through. Raises BudgetExhausted when the budget runs out; counts
+    then holds what was found.
+    """
+    s_bit = 1 << s
+    region = _two_core(adj, ((1 << len(adj)) - 1) & ~(s_bit - 1))
+    if not region & s_bit:
+        return
+    allowed = region ^ s_bit
+    targets = adj[s] & allowed
+
+    path = [s]
+    visited = s_bit
+    stack = [targets & first]
+    steps = 0
+    try:
+        while stack:
+            steps += 1
+            if budget is not None and steps % CHECK_INTERVAL == 0:
+                budget.check(CHECK_INTERVAL)
+            candidates = stack[-1]
+            if not candidates:
+                stack.pop()
+                visited ^= 1 << path.pop()
+                continue
+            low_bit = candidates & -candidates
+            stack[-1] = candidates ^ low_bit
+            w = low_bit.bit_length() - 1
+            path.append(w)
+            visited |= low_bit
+
+            depth = len(path)
+            if depth >= 3 and adj[w] & s_bit:
+                counts[depth] += 1
+            if (max_length is not None and depth >= max_length) or not targets & ~visited:
+                stack.append(0)
+            else:
+                stack.append(adj[w] & allowed & ~visited)
+    finally:
+        count("cycles.nodes", steps)
+
+
+def _count_component(adj, counts, max_length, budget):
+    """
+    Add the cycles of one biconnected component to counts, indexed by length.
+
+    Every cycle is found from its smallest vertex, once in each direction.
+    Raises BudgetExhausted when the budget runs out; counts then holds what was found.
+    """
+    for s in range(len(adj) - 2):
+        _count_from(adj, s, adj[s], counts, max_length, budget)
+
+
+def _count_task(adj, s, first, max_length, budget):
+    """
+    Count the cycles of one first edge search (see _count_from) as a parallel task.
+
+    Returns:
+        list: Counts indexed by length, lower bounds if the budget ran out.
+    """
+    counts = [0] * (len(adj) + 1)
+    try:
+        _count_from(adj, s, first, counts, max_length, budget)
+    except BudgetExhausted:
+        pass
+    return counts
+
+
+def _first_edge_tasks(components, max_length):
+    """
+    Split the search of every component by its first edge (s, w), largest search first.
+    """
+    tasks = []
+    for adj in components:
+        k = len(adj)
+        for s in range(k - 2):
+            rest = adj[s] & ~((2 << s) - 1)
+            while rest:
+                low_bit = rest & -rest
+                tasks.append((k - s, (adj, s, low_bit, max_length)))
+                rest ^= low_bit
+    tasks.sort(key=lambda task: -task[0])
+    return [args for _, args in tasks]
+
+
+def count_cycles_by_length(G, max_length=None, budget=None, workers=None):
+    """
+    Count the simple cycles of a graph by length without building any of them.
+
+    The graph is split into biconnected components (every cycle lies inside
+    exactly one) and each component is searched on integer adjacency bitsets.
+    Self-loops count as cycles of length 1.
+
+    With workers the searches are split by their first edge (smallest
+    vertex s, second vertex w) across a process pool and the counts merged.
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph, directed graphs are treated as undirected
+        max_length (int, optional): Only count cycles with at most this many nodes: Defaults to None (unlimited).
+        budget (Budget, optional): Time/step budget and cancellation token: Defaults to None (unlimited).
+        workers (int, optional): Number of worker processes: Defaults to None (search in this process).
+
+    Returns:
+        dict: Number of cycles keyed by cycle length, in increasing order of length.
+        A PartialCounts of lower bounds if the budget ran out.
+    """
+    graph = as_compact(G).to_undirected()
+    loops = len(graph.loops)
+    adj = graph.adj
+
+    with stage("cycles.components"):
+        components = [_component_bitsets(adj, component)
+                      for component in _biconnected_components(adj) if component.bit_count() >= 3]
+    counts = [0] * (len(graph) + 1)
+    reason = None
+    with stage("cycles.search"):
+        if workers is not None and workers > 1:
+            for found in run_tasks(_count_task, _first_edge_tasks(components, max_length), workers, budget):
+                for length, number in enumerate(found):
+                    counts[length] += number
+            if budget is not None and budget.exhausted:
+                reason = budget.reason
+        else:
+            try:
+                for component in components:
+                    _count_component(component, counts, max_length, budget)
+            except BudgetExhausted as exhausted:
+                reason = str(exhausted)
+
+    by_length = {}
+    if loops:
+        by_length[1] = loops
+    for length, number in enumerate(counts):
+        if number:
+            # Each cycle was found once in each direction
+            by_length[length] = number // 2
+    if reason is not None:
+        return PartialCounts(by_length, reason)
+    return by_length
@@ -0,0 +1,339 @@
+import heapq
+from .compact import CompactGraph, as_compact
+
+
+def _spanning_forest(n, pairs):
+    """
+    Split the edges of a graph into a spanning forest and the rest with union-find.
+
+    Union by size with path halving, so the whole pass takes O(E α(V)).
+
+    Returns:
+        bytearray: 1 for each edge of the forest, 0 for the others, in the order of pairs.
+    """
+    parent = list(range(n))
+    size = [1] * n
+    tree = bytearray(len(pairs))
+    for e, (u, v) in enumerate(pairs):
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        if u != v:
+            if size[u] < size[v]:
+                u, v = v, u
+            parent[v] = u
+            size[u] += size[v]
+            tree[e] = 1
+    return tree
+
+
+def _edge_weights(G, nodes, pairs, weight):
+    """
+    Read the weight of every edge of a NetworkX graph, 1 where the attribute is missing.
+    """
+    weights = []
+    for i, j in pairs:
+        u, v = nodes[i], nodes[j]
+        data = G.get_edge_data(u, v)
+        if data is None:
+            data = G.get_edge_data(v, u)
+        if G.is_multigraph():
+            weights.append(min(attributes.get(weight, 1) for attributes in data.values()))
+        else:
+            weights.append(data.get(weight, 1))
+    return weights
+
+
+class CycleSpace:
+    """
+    The cycle space of a graph over GF(2), built on a union-find spanning forest.
+
+    Edges are numbered in the order of edges, and a cycle (or any element
+    of the cycle space, i.e. any edge set in which every node has even
+    degree) is a packed bit vector: a Python int whose bit i is set if edge i
+    belongs to it. Vectors add with ^ and their size is vector.bit_count().
+
+    Directed graphs are treated as undirected, and parallel edges count once,
+    as everywhere else in the package. A self-loop is a cycle of its own.
+    """
+
+    def __init__(self, G):
+        """
+        Args:
+            G (object): A NetworkX graph object or CompactGraph
+        """
+        graph = as_compact(G).to_undirected()
+        self.nodes = list(graph.nodes)
+        self._pairs = list(graph.edges())
+        self.edges = [(self.nodes[i], self.nodes[j]) for i, j in self._pairs]
+        self._index = graph.index
+        self._edge_ids = {pair: e for e, pair in enumerate(self._pairs)}
+
+        n = len(self.nodes)
+        self._tree = _spanning_forest(n, self._pairs)
+        forest_size = sum(self._tree)
+        self.num_components = n - forest_size
+        self.dimension = len(self._pairs) - forest_size
+
+        # Root every tree of the forest, so fundamental cycles are found by climbing to a common ancestor
+        tree_nbrs = [[] for _ in range(n)]
+        for e, (i, j) in enumerate(self._pairs):
+            if self._tree[e]:
+                tree_nbrs[i].append((j, e))
+                tree_nbrs[j].append((i, e))
+        self._parent = [-1] * n
+        self._parent_edge = [-1] * n
+        self._depth = [-1] * n
+        for root in range(n):
+            if self._depth[root] >= 0:
+                continue
+            self._depth[root] = 0
+            queue = [root]
+            for v in queue:
+                for w, e in tree_nbrs[v]:
+                    if self._depth[w] < 0:
+                        self._depth[w] = self._depth[v] + 1
+                        self._parent[w] = v
+                        self._parent_edge[w] = e
+                        queue.append(w)
+
+    def _tree_path(self, i, j):
+        """
+        Return the edge ids of the tree path between node indices i and j, as lists from each end.
+        """
+        depth, parent, parent_edge = self._depth, self._parent, self._parent_edge
+        from_i, from_j = [], []
+        while depth[i] > depth[j]:
+            from_i.append(parent_edge[i])
+            i = parent[i]
+        while depth[j] > depth[i]:
+            from_j.append(parent_edge[j])
+            j = parent[j]
+        while i != j:
+            from_i.append(parent_edge[i])
+            from_j.append(parent_edge[j])
+            i, j = parent[i], parent[j]
+        return from_i, from_j
+
+    def fundamental_basis(self):
+        """
+        Build the fundamental cycle basis: one cycle per edge outside the spanning forest.
+
+        The cycle of edge (u, v) is the edge plus the forest path from v back
+        to u. Any element of the cycle space is the sum of the fundamental
+        cycles of its non-forest edges.
+
+        Returns:
+            list: dimension cycle vectors, in the order of their non-forest edges.
+        """
+        basis = []
+        for e, (i, j) in enumerate(self._pairs):
+            if self._tree[e]:
+                continue
+            vector = 1 << e
+            from_i, from_j = self._tree_path(i, j)
+            for f in from_i + from_j:
+                vector |= 1 << f
+            basis.append(vector)
+        return basis
+
+    def minimum_basis(self, weights=None):
+        """
+        Build a minimum weight cycle basis with de Pina's algorithm.
+
+        Support vectors start as the unit vectors of the non-forest edges.
+        In turn each one picks the lightest cycle with an odd number of edges
+        in its support, found as a shortest path between the two copies of a
+        node in a doubled graph whose edges switch copy on the support. The
+        later support vectors are then made orthogonal to that cycle. Takes
+        O(dimension * E * (E + V) log V).
+
+        Args:
+            weights (list, optional): Positive weight of each edge, in the order of edges:
+                Defaults to None (every edge weighs 1, giving a basis of shortest cycles).
+
+        Returns:
+            list: dimension cycle vectors, lightest first.
+        """
+        n = len(self.nodes)
+        weights = [1] * len(self._pairs) if weights is None else list(weights)
+        incident = [[] for _ in range(n)]
+        for e, (i, j) in enumerate(self._pairs):
+            incident[i].append((j, e))
+            if i != j:
+                incident[j].append((i, e))
+
+        supports = [1 << e for e in range(len(self._pairs)) if not self._tree[e]]
+        basis = []
+        for k, support in enumerate(supports):
+            cycle = self._lightest_odd_cycle(incident, weights, support)
+            basis.append(cycle)
+            for later in range(k + 1, len(supports)):
+                if (supports[later] & cycle).bit_count() & 1:
+                    supports[later] ^= support
+        basis.sort(key=lambda vector: (sum(weights[e] for e in _bits(vector)), vector))
+        return basis
+
+    def _lightest_odd_cycle(self, incident, weights, support):
+        """
+        Find the lightest cycle sharing an odd number of edges with support.
+
+        Every such cycle uses an edge of support, so only the end nodes of
+        those edges need to be tried as the node where the cycle closes.
+        """
+        best, best_vector = None, None
+        sources = set()
+        for e in _bits(support):
+            sources.update(self._pairs[e])
+        for source in sorted(sources):
+            # States are 2 * node + copy; an edge of support switches copy
+            target = 2 * source + 1
+            distance = {2 * source: 0}
+            via = {}
+            heap = [(0, 2 * source)]
+            while heap:
+                d, state = heapq.heappop(heap)
+                if d > distance.get(state, d) or (best is not None and d >= best):
+                    continue
+                if state == target:
+                    break
+                v, copy = state >> 1, state & 1
+                for w, e in incident[v]:
+                    next_state = 2 * w + (copy ^ (support >> e & 1))
+                    next_distance = d + weights[e]
+                    if next_distance < distance.get(next_state, next_distance + 1):
+                        distance[next_state] = next_distance
+                        via[next_state] = (state, e)
+                        heapq.heappush(heap, (next_distance, next_state))
+            if target in distance and (best is None or distance[target] < best):
+                best = distance[target]
+                vector = 0
+                state = target
+                while state != 2 * source:
+                    state, e = via[state]
+                    vector ^= 1 << e
+                best_vector = vector
+        return best_vector
+
+    def vector(self, cycle):
+        """
+        Pack a cycle given as a list of nodes (without repeating the first) into a vector.
+
+        Raises:
+            ValueError: If two consecutive nodes are not adjacent.
+        """
+        vector = 0
+        for k, node in enumerate(cycle):
+            i, j = self._index[cycle[k - 1]], self._index[node]
+            e = self._edge_ids.get((min(i, j), max(i, j)))
+            if e is None:
+                raise ValueError(f"{cycle[k - 1]!r} and {node!r} are not adjacent")
+            vector ^= 1 << e
+        return vector
+
+    def edges_of(self, vector):
+        """
+        List the edges of a vector as (u, v) node pairs.
+        """
+        return [self.edges[e] for e in _bits(vector)]
+
+    def contains(self, vector):
+        """
+        Check if a vector is an element of the cycle space, i.e. every node has even degree in it.
+        """
+        odd = 0
+        for e in _bits(vector):
+            i, j = self._pairs[e]
+            odd ^= (1 << i) ^ (1 << j)
+        return odd == 0
+
+    def cycle_nodes(self, vector):
+        """
+        Unpack the vector of a simple cycle into its nodes, in order around the cycle.
+
+        Raises:
+            ValueError: If the vector is not a single simple cycle.
+        """
+        nbrs = {}
+        for e in _bits(vector):
+            i, j = self._pairs[e]
+            if i == j:
+                if vector.bit_count() == 1:
+                    return [self.nodes[i]]
+                raise ValueError("vector is not a simple cycle")
+            nbrs.setdefault(i, []).append(j)
+            nbrs.setdefault(j, []).append(i)
+        if not nbrs or any(len(ends) != 2 for ends in nbrs.values()):
+            raise ValueError("vector is not a simple cycle")
+
+        start = min(nbrs)
+        cycle = [start]
+        previous, v = start, nbrs[start][0]
+        while v != start:
+            cycle.append(v)
+            a, b = nbrs[v]
+            previous, v = v, (b if a == previous else a)
+        if len(cycle) != len(nbrs):
+            raise ValueError("vector is not a simple cycle")
+        return [self.nodes[i] for i in cycle]
+
+
+def _bits(bits):
+    while bits:
+        low_bit = bits & -bits
+        yield low_bit.bit_length() - 1
+        bits ^= low_bit
+
+
+def cyclomatic_number(G):
+    """
+    Compute the cyclomatic number (cycle rank) m - n + c of a graph.
+
+    It is the dimension of the cycle space, i.e. the number of independent
+    cycles, and is found with one union-find pass over the edges in O(E α(V)).
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph, directed graphs are treated as undirected
+
+    Returns:
+        int: The number of edges outside a spanning forest.
+    """
+    graph = as_compact(G).to_undirected()
+    pairs = list(graph.edges())
+    return len(pairs) - sum(_spanning_forest(len(graph), pairs))
+
+
+def cycle_basis(G):
+    """
+    Find a fundamental cycle basis of a graph, in polynomial time.
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph, directed graphs are treated as undirected
+
+    Returns:
+        list: cyclomatic_number(G) cycles, each a list of nodes starting at its smallest index.
+    """
+    space = CycleSpace(G)
+    return [space.cycle_nodes(vector) for vector in space.fundamental_basis()]
+
+
+def minimum_cycle_basis(G, weight=None):
+    """
+    Find a minimum weight cycle basis of a graph, in polynomial time.
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph, directed graphs are treated as undirected
+        weight (str, optional): Edge attribute holding positive edge weights, missing weights count
+            as 1: Defaults to None (every edge weighs 1).
+
+    Returns:
+        list: cyclomatic_number(G) cycles, lightest first, each a list of nodes starting at its smallest index.
+    """
+    space = CycleSpace(G)
+    weights = None
+    if weight is not None and not isinstance(G, CompactGraph):
+        weights = _edge_weights(G, space.nodes, space._pairs, weight)
+    return [space.cycle_nodes(vector) for vector in space.minimum_basis(weights)]
@@ -1,85 +1,71 @@
 import networkx as nx
-import itertools
+from .budget import PartialCount, is_partial, make_budget
+from .counting import count_cycles_by_length
+from .directed import count_directed_cycles_by_length, iter_directed_cycles
+from .hamiltonian import find_hamiltonian_cycle
 
 def find_cycles(G):
     """
     Find all cycles in a graph.
 
+    Directed graphs are searched with Johnson's algorithm (see directed.py),
+    following the arcs; undirected graphs list every cycle once.
+
     Args:
         G (object): A NetworkX graph object
 
     Returns:
         list: A list of cycles, where each cycle is represented as a list of nodes.
     """
-    return list(nx.simple_cycles(nx.DiGraph))
+    if G.is_directed():
+        return list(iter_directed_cycles(G))
+    return list(nx.simple_cycles(G))
 
-def count_cycles(G):
+def count_cycles(G, max_steps=None, timeout=None, budget=None, workers=None):
     """
     Count the number of cycles in a graph.
 
+    Undirected graphs are counted with the counting engine in counting.py and
+    directed graphs with Johnson's algorithm over their strongly connected
+    components (directed.py); neither builds the cycles themselves.
+
     Args:
-        G (object): A NetworkX graph objectw
+        G (object): A NetworkX graph object
+        max_steps (int, optional): Maximum number of search steps: Defaults to None (unlimited).
+        timeout (float, optional): Maximum search time in seconds: Defaults to None (unlimited).
+        budget (Budget, optional): Budget with a cancellation token, used instead of max_steps and timeout: Defaults to None.
+        workers (int, optional): Number of worker processes splitting the search: Defaults to None (search in this process).
 
     Returns:
-        int: The number of cycles in the graph.
+        int: The number of cycles in the graph, a PartialCount lower bound if the budget ran out.
     """
-    if isinstance(G, nx.DiGraph):
-        # Each undirected edge becomes two directed edges
-        DG = nx.DiGraph(G)
-        for u, v in G.edges():
-            DG.add_edge(v, u)
-            DG.add_edge(u, v)
-        cycles = list(nx.simple_cycles(DG))
-
-        unique_cycles = set()
-        for cycle in cycles:
-            min_idx = cycle.index(min(cycle))
-            normalized_cycle = tuple((cycle[min_idx:] + cycle[:min_idx]))
-            reversed_cycle = tuple(reversed(normalized_cycle))
-
-        if normalized_cycle not in unique_cycles and reversed_cycle not in unique_cycles:
-            unique_cycles.add(normalized_cycle)
-
-        return len(unique_cycles)
+    budget = make_budget(budget, timeout=timeout, max_steps=max_steps)
+    if G.is_directed():
+        lengths = count_directed_cycles_by_length(G, budget=budget, workers=workers)
     else:
-        return len(list(nx.simple_cycles(G)))
-    
-def has_hamiltonian_cycle(G):
+        lengths = count_cycles_by_length(G, budget=budget, workers=workers)
+    if is_partial(lengths):
+        return PartialCount(sum(lengths.values()), lengths.reason)
+    return sum(lengths.values())
+
+def has_hamiltonian_cycle(G, max_steps=None, timeout=None, budget=None, workers=None):
     """
     Check if a graph has a Hamiltonian cycle.
 
+    Polynomial sufficient and necessary conditions settle many graphs outright
+    (see hamiltonian_decision). The rest are solved with a Held-Karp bitmask
+    DP when small and a pruned backtracking search when larger (see
+    hamiltonian.py); both are exact and follow the arcs of directed graphs.
+
     Args:
-        G (object): A NetworkX graph object
+        G (object): A NetworkX graph object, directed or undirected
+        max_steps (int, optional): Maximum number of search steps: Defaults to None (unlimited).
+        timeout (float, optional): Maximum search time in seconds: Defaults to None (unlimited).
+        budget (Budget, optional): Budget with a cancellation token, used instead of max_steps and timeout: Defaults to None.
+        workers (int, optional): Number of worker processes splitting the search: Defaults to None (search in this process).
 
     Returns:
-        bool: True if the graph has a Hamiltonian cycle, False otherwise.
+        bool: True if the graph has a Hamiltonian cycle, False otherwise, None if the budget ran out.
+        list: The nodes of the cycle, or None.
     """
-    if not nx.is_connected(G):
-        return False,None
-    for node, degree in G.degree():
-        if degree < 2:
-            return False,None
-    
-    n = len(G.nodes)
-    if n <= 20:
-        nodes = list(G.nodes)
-        for perm in itertools.permutations(nodes):
-            is_cycle = True
-            for i in range(n-1):
-                if not G.has_edge(perm[i], perm[i+1]):
-                    is_cycle = False
-                    break
-            if is_cycle and G.has_edge(perm[n-1], perm[0]):
-                return True,list(perm)
-        return False,None
-    else:
-        try:
-            cycle = nx.approximation.traveling_salesman_problem(G, cycle=True)
-            if len(cycle) == n + 1 and cycle[0] == cycle[-1]:
-                for i in range (n):
-                    if not G.has_edge(cycle[i], cycle[i+1]):
-                        return False,None
-                return True,cycle[:-1]
-        except:
-            return False,None
-
+    return find_hamiltonian_cycle(G, max_steps=max_steps, timeout=timeout, budget=budget, workers=workers)
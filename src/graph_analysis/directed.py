@@ -0,0 +1,335 @@
+from .budget import CHECK_INTERVAL, BudgetExhausted, PartialCounts
+from .compact import as_compact
+from .parallel import run_tasks
+from .profiling import count, stage
+
+
+def _reach(adj, source, mask):
+    """
+    Return the bitset of vertices in mask reachable from source (included) along adj.
+    """
+    seen = 1 << source
+    frontier = seen
+    while frontier:
+        grown = 0
+        while frontier:
+            low_bit = frontier & -frontier
+            grown |= adj[low_bit.bit_length() - 1]
+            frontier ^= low_bit
+        frontier = grown & mask & ~seen
+        seen |= frontier
+    return seen
+
+
+def strongly_connected_components(adj, mask=None):
+    """
+    Find the strongly connected components of a digraph given as out-adjacency bitsets.
+
+    Iterative Tarjan search, restricted to the vertices in mask.
+
+    Args:
+        adj (list): Out-neighbour bitsets, e.g. CompactGraph.adj of a directed graph
+        mask (int, optional): Bitset of the vertices to consider: Defaults to None (all).
+
+    Returns:
+        list: One vertex bitset per component, in reverse topological order.
+    """
+    n = len(adj)
+    if mask is None:
+        mask = (1 << n) - 1
+    disc = [-1] * n
+    low = [0] * n
+    on_stack = 0
+    stack = []
+    counter = 0
+    components = []
+
+    rest = mask
+    while rest:
+        root_bit = rest & -rest
+        rest ^= root_bit
+        root = root_bit.bit_length() - 1
+        if disc[root] >= 0:
+            continue
+        disc[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack |= root_bit
+        work = [[root, adj[root] & mask]]
+        while work:
+            frame = work[-1]
+            v, pending = frame
+            if pending:
+                low_bit = pending & -pending
+                frame[1] = pending ^ low_bit
+                w = low_bit.bit_length() - 1
+                if disc[w] < 0:
+                    disc[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack |= low_bit
+                    work.append([w, adj[w] & mask])
+                elif on_stack & low_bit and disc[w] < low[v]:
+                    low[v] = disc[w]
+            else:
+                work.pop()
+                if work:
+                    p = work[-1][0]
+                    if low[v] < low[p]:
+                        low[p] = low[v]
+                if low[v] == disc[v]:
+                    component = 0
+                    while True:
+                        x = stack.pop()
+                        component |= 1 << x
+                        if x == v:
+                            break
+                    on_stack &= ~component
+                    components.append(component)
+    return components
+
+
+def _search_regions(adj, in_adj):
+    """
+    List the independent searches of Johnson's algorithm, one per smallest vertex s.
+
+    Every cycle lies in one strongly connected component, and the cycles
+    whose smallest vertex is s lie in the component of s among the vertices
+    >= s, found as the vertices both reachable from s and reaching it.
+
+    Returns:
+        list: (s, region bitset including s) pairs, for the s whose region holds a cycle.
+    """
+    regions = []
+    for component in strongly_connected_components(adj):
+        if component & (component - 1) == 0:
+            continue
+        rest = component
+        while rest:
+            s_bit = rest & -rest
+            rest ^= s_bit
+            s = s_bit.bit_length() - 1
+            mask = component & ~(s_bit - 1)
+            region = _reach(adj, s, mask) & _reach(in_adj, s, mask)
+            if region != s_bit:
+                regions.append((s, region))
+    return regions
+
+
+def _johnson_from(adj, s, region, budget):
+    """
+    Enumerate the cycles through s inside region with Johnson's blocking search.
+
+    A vertex stays blocked after a branch through it failed to close a
+    cycle, until a vertex it leads to gets unblocked (recorded in B), so no
+    dead end is explored twice and the search takes O(V + E) per cycle.
+    Raises BudgetExhausted when the budget runs out.
+
+    Yields:
+        list: The search's own path of vertex indices from s for the cycle
+        just found; it is reused, so copy it to keep it.
+    """
+    s_bit = 1 << s
+    blocked = s_bit
+    B = [0] * len(adj)
+    path = [s]
+    stack = [adj[s] & region]
+    closed = [False]
+    steps = 0
+    try:
+        while stack:
+            steps += 1
+            if budget is not None and steps % CHECK_INTERVAL == 0:
+                budget.check(CHECK_INTERVAL)
+            candidates = stack[-1]
+            if candidates & s_bit:
+                stack[-1] = candidates ^ s_bit
+                closed[-1] = True
+                yield path
+                continue
+            # Blocked candidates can only be unblocked by a child search, so once
+            # every candidate left is blocked the vertex is done
+            open_bits = candidates & ~blocked
+            if open_bits:
+                low_bit = open_bits & -open_bits
+                stack[-1] = candidates ^ low_bit
+                w = low_bit.bit_length() - 1
+                blocked |= low_bit
+                path.append(w)
+                stack.append(adj[w] & region)
+                closed.append(False)
+                continue
+
+            stack.pop()
+            v = path.pop()
+            if closed.pop():
+                if closed:
+                    closed[-1] = True
+                # Unblock v and, through B, every vertex waiting for it
+                pending = [v]
+                while pending:
+                    u = pending.pop()
+                    u_bit = 1 << u
+                    if blocked & u_bit:
+                        blocked ^= u_bit
+                        waiting = B[u]
+                        B[u] = 0
+                        while waiting:
+                            low_bit = waiting & -waiting
+                            pending.append(low_bit.bit_length() - 1)
+                            waiting ^= low_bit
+            else:
+                v_bit = 1 << v
+                rest = adj[v] & region
+                while rest:
+                    low_bit = rest & -rest
+                    B[low_bit.bit_length() - 1] |= v_bit
+                    rest ^= low_bit
+    finally:
+        count("directed.nodes", steps)
+
+
+def _bounded_from(adj, s, region, max_length, budget):
+    """
+    Enumerate the cycles through s inside region with at most max_length vertices.
+
+    Johnson's blocking is only valid for complete searches, so the paths are
+    searched plainly, cut at max_length vertices. Raises BudgetExhausted
+    when the budget runs out.
+
+    Yields:
+        list: The search's own path, as in _johnson_from.
+    """
+    s_bit = 1 << s
+    visited = s_bit
+    path = [s]
+    stack = [adj[s] & region]
+    steps = 0
+    try:
+        while stack:
+            steps += 1
+            if budget is not None and steps % CHECK_INTERVAL == 0:
+                budget.check(CHECK_INTERVAL)
+            candidates = stack[-1]
+            if not candidates:
+                stack.pop()
+                visited ^= 1 << path.pop()
+                continue
+            low_bit = candidates & -candidates
+            stack[-1] = candidates ^ low_bit
+            if low_bit == s_bit:
+                yield path
+            elif not visited & low_bit and len(path) < max_length:
+                path.append(low_bit.bit_length() - 1)
+                visited |= low_bit
+                stack.append(adj[path[-1]] & region if len(path) < max_length else adj[path[-1]] & s_bit)
+    finally:
+        count("directed.nodes", steps)
+
+
+def _cycles_from(adj, s, region, max_length, budget):
+    if max_length is None:
+        return _johnson_from(adj, s, region, budget)
+    return _bounded_from(adj, s, region, max_length, budget)
+
+
+def _count_task(adj, s, region, max_length, budget):
+    """
+    Count the cycles through s inside region as a parallel task.
+
+    Returns:
+        list: Counts indexed by length, lower bounds if the budget ran out.
+    """
+    counts = [0] * (len(adj) + 1)
+    try:
+        for path in _cycles_from(adj, s, region, max_length, budget):
+            counts[len(path)] += 1
+    except BudgetExhausted:
+        pass
+    return counts
+
+
+def count_directed_cycles_by_length(G, max_length=None, budget=None, workers=None):
+    """
+    Count the directed simple cycles of a graph by length with Johnson's algorithm.
+
+    The graph is split into strongly connected components and every
+    component into one search per smallest vertex (see _search_regions),
+    each independent of the others. With workers these searches are spread
+    over a process pool, largest region first, and the counts merged.
+    Self-loops count as cycles of length 1 and u -> v -> u as one of length 2.
+
+    Args:
+        G (object): A NetworkX DiGraph or directed CompactGraph, undirected graphs count
+            every edge as two opposite arcs
+        max_length (int, optional): Only count cycles with at most this many nodes: Defaults to None (unlimited).
+        budget (Budget, optional): Time/step budget and cancellation token: Defaults to None (unlimited).
+        workers (int, optional): Number of worker processes: Defaults to None (search in this process).
+
+    Returns:
+        dict: Number of cycles keyed by cycle length, in increasing order of length.
+        A PartialCounts of lower bounds if the budget ran out.
+    """
+    graph = as_compact(G)
+    adj = graph.adj
+    with stage("directed.components"):
+        regions = _search_regions(adj, graph.in_adj)
+    counts = [0] * (len(graph) + 1)
+    reason = None
+    with stage("directed.search"):
+        if max_length is not None and max_length < 2:
+            regions = []
+        if workers is not None and workers > 1:
+            regions.sort(key=lambda item: -item[1].bit_count())
+            tasks = [(adj, s, region, max_length) for s, region in regions]
+            for found in run_tasks(_count_task, tasks, workers, budget):
+                for length, number in enumerate(found):
+                    counts[length] += number
+            if budget is not None and budget.exhausted:
+                reason = budget.reason
+        else:
+            try:
+                for s, region in regions:
+                    for path in _cycles_from(adj, s, region, max_length, budget):
+                        counts[len(path)] += 1
+            except BudgetExhausted as exhausted:
+                reason = str(exhausted)
+
+    by_length = {}
+    if graph.loops and (max_length is None or max_length >= 1):
+        by_length[1] = len(graph.loops)
+    for length, number in enumerate(counts):
+        if number:
+            by_length[length] = number
+    if reason is not None:
+        return PartialCounts(by_length, reason)
+    return by_length
+
+
+def iter_directed_cycles(G, max_length=None, budget=None):
+    """
+    Enumerate the directed simple cycles of a graph with Johnson's algorithm.
+
+    The search simply stops when the budget runs out, leaving budget.reason set.
+
+    Args:
+        G (object): A NetworkX DiGraph or directed CompactGraph
+        max_length (int, optional): Only list cycles with at most this many nodes: Defaults to None (unlimited).
+        budget (Budget, optional): Time/step budget and cancellation token: Defaults to None (unlimited).
+
+    Yields:
+        list: The nodes of each cycle, starting at its smallest index, self-loops first.
+    """
+    graph = as_compact(G)
+    nodes = graph.nodes
+    if max_length is None or max_length >= 1:
+        for v in graph.loops:
+            yield [nodes[v]]
+    if max_length is not None and max_length < 2:
+        return
+    try:
+        for s, region in _search_regions(graph.adj, graph.in_adj):
+            for path in _cycles_from(graph.adj, s, region, max_length, budget):
+                yield [nodes[v] for v in path]
+    except BudgetExhausted:
+        return
@@ -0,0 +1,268 @@
+import networkx as nx
+from .cycles import has_hamiltonian_cycle
+from .profiling import count
+
+
+class DynamicGraph:
+    """
+    Undirected graph for edge insert/delete streams that keeps its condition flags up to date.
+
+    The odd-degree, isolated and degree < 2 vertices are kept in sets, updated
+    in O(1) per edge. Connected components are kept with union-find over a
+    spanning forest: an insertion is one union in O(α(V)) and deleting an
+    edge outside the forest changes nothing. Deleting a forest edge may split
+    a component, so the union-find is rebuilt in O(V + E α(V)) when
+    connectivity is next queried; a batch of deletions costs one rebuild.
+
+    Degrees follow NetworkX, a self-loop adding 2. Multigraphs and directed
+    graphs are not supported. Changing the graph returned by to_networkx()
+    does not change the DynamicGraph.
+    """
+
+    def __init__(self, G=None):
+        """
+        Args:
+            G (object, optional): NetworkX graph to start from, which is copied: Defaults to None (empty graph).
+        """
+        self._G = nx.Graph()
+        self._odd = set()
+        self._isolated = set()
+        self._low_degree = set()
+        self._parent = {}
+        self._size = {}
+        self._forest = set()
+        self._components = 0
+        self._stale = False
+        if G is not None:
+            if G.is_directed() or G.is_multigraph():
+                raise ValueError("DynamicGraph only supports simple undirected graphs")
+            self.add_nodes_from(G.nodes())
+            self.add_edges_from(G.edges())
+
+    def _find(self, v):
+        parent = self._parent
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    def _union(self, u, v):
+        """
+        Merge the sets of u and v by size, adding u-v to the forest if they were apart.
+        """
+        root_u, root_v = self._find(u), self._find(v)
+        if root_u == root_v:
+            return
+        if self._size[root_u] < self._size[root_v]:
+            root_u, root_v = root_v, root_u
+        self._parent[root_v] = root_u
+        self._size[root_u] += self._size[root_v]
+        self._forest.add(frozenset((u, v)))
+        self._components -= 1
+
+    def _rebuild(self):
+        count("dynamic.rebuilds")
+        self._parent = {v: v for v in self._G}
+        self._size = dict.fromkeys(self._G, 1)
+        self._forest = set()
+        self._components = len(self._G)
+        for u, v in self._G.edges():
+            if u != v:
+                self._union(u, v)
+        self._stale = False
+
+    def _degree_changed(self, v, degree):
+        if degree % 2:
+            self._odd.add(v)
+        else:
+            self._odd.discard(v)
+        if degree == 0:
+            self._isolated.add(v)
+        else:
+            self._isolated.discard(v)
+        if degree < 2:
+            self._low_degree.add(v)
+        else:
+            self._low_degree.discard(v)
+
+    def add_node(self, v):
+        if v in self._G:
+            return
+        self._G.add_node(v)
+        self._degree_changed(v, 0)
+        self._parent[v] = v
+        self._size[v] = 1
+        self._components += 1
+
+    def add_nodes_from(self, nodes):
+        for v in nodes:
+            self.add_node(v)
+
+    def remove_node(self, v):
+        """
+        Remove a node and its edges.
+
+        Raises:
+            NetworkXError: If v is not in the graph.
+        """
+        if v not in self._G:
+            raise nx.NetworkXError(f"The node {v} is not in the graph.")
+        for w in list(self._G[v]):
+            self.remove_edge(v, w)
+        self._G.remove_node(v)
+        for vertices in (self._odd, self._isolated, self._low_degree):
+            vertices.discard(v)
+        if not self._stale:
+            # Without edges, v is alone in its union-find set
+            del self._parent[v], self._size[v]
+            self._components -= 1
+
+    def add_edge(self, u, v):
+        """
+        Insert the edge u-v, adding missing endpoints; inserting an existing edge does nothing.
+        """
+        self.add_node(u)
+        self.add_node(v)
+        if self._G.has_edge(u, v):
+            return
+        self._G.add_edge(u, v)
+        self._degree_changed(u, self._G.degree(u))
+        if u != v:
+            self._degree_changed(v, self._G.degree(v))
+            if not self._stale:
+                self._union(u, v)
+
+    def remove_edge(self, u, v):
+        """
+        Delete the edge u-v.
+
+        Raises:
+            NetworkXError: If the edge is not in the graph.
+        """
+        self._G.remove_edge(u, v)
+        self._degree_changed(u, self._G.degree(u))
+        if u != v:
+            self._degree_changed(v, self._G.degree(v))
+            edge = frozenset((u, v))
+            if edge in self._forest:
+                self._forest.discard(edge)
+                self._stale = True
+
+    def add_edges_from(self, edges):
+        for u, v in edges:
+            self.add_edge(u, v)
+
+    def remove_edges_from(self, edges):
+        for u, v in edges:
+            self.remove_edge(u, v)
+
+    def update(self, added=(), removed=()):
+        """
+        Apply a batch of changes, the deletions first; connectivity is brought up to date once, on the next query.
+
+        Args:
+            added (iterable, optional): Edges (u, v) to insert: Defaults to ().
+            removed (iterable, optional): Edges (u, v) to delete: Defaults to ().
+        """
+        self.remove_edges_from(removed)
+        self.add_edges_from(added)
+
+    def __len__(self):
+        return len(self._G)
+
+    def __contains__(self, v):
+        return v in self._G
+
+    def number_of_nodes(self):
+        return len(self._G)
+
+    def number_of_edges(self):
+        return self._G.number_of_edges()
+
+    def has_edge(self, u, v):
+        return self._G.has_edge(u, v)
+
+    def degree(self, v):
+        return self._G.degree(v)
+
+    def to_networkx(self):
+        """
+        Return a copy of the current graph, e.g. for analyze_graph.
+        """
+        return self._G.copy()
+
+    @property
+    def num_odd(self):
+        return len(self._odd)
+
+    @property
+    def num_isolated(self):
+        return len(self._isolated)
+
+    @property
+    def num_components(self):
+        if self._stale:
+            self._rebuild()
+        return self._components
+
+    @property
+    def is_connected(self):
+        return len(self._G) > 0 and self.num_components == 1
+
+    @property
+    def all_even(self):
+        return not self._odd
+
+    @property
+    def is_closed(self):
+        return not self._isolated
+
+    @property
+    def has_eulerian(self):
+        """
+        Check if the graph has an Eulerian circuit: it is connected and every degree is even.
+        """
+        return len(self._G) > 0 and not self._odd and self.is_connected
+
+    def connected(self, u, v):
+        """
+        Check if u and v are in the same connected component.
+        """
+        if self._stale:
+            self._rebuild()
+        return self._find(u) == self._find(v)
+
+    def check_conditions(self, conditions):
+        """
+        Check the condition flags of check_graph_conditons from the maintained counts.
+
+        The checks run in the order of ConditionPipeline and give the same
+        reasons. Every flag is answered in O(1), except connectivity right
+        after a forest edge was deleted and must_have_hamiltonian, whose
+        search runs on a copy of the graph once the cheap checks pass.
+
+        Args:
+            conditions (dict): Dictionary with condition flags
+
+        Returns:
+            bool: True if all conditions are met, False otherwise.
+            str: Reason for failure if conditions are not met.
+        """
+        hamiltonian = conditions.get('must_have_hamiltonian', False)
+        if hamiltonian and self._low_degree:
+            v = next(iter(self._low_degree))
+            return False, f"Node {v} has degree {self._G.degree(v)}, so the graph has no Hamiltonian cycle."
+        if not hamiltonian and conditions.get('must_be_closed', False) and self._isolated:
+            return False, f"Node {next(iter(self._isolated))} has no edges."
+        if conditions.get('all_verticies_even_degree', False) and self._odd:
+            return False, f"Node {next(iter(self._odd))} has an odd degree."
+        if (hamiltonian or conditions.get('must_be_connected', False)) and not self.is_connected:
+            return False, "Graph is not connected."
+        if hamiltonian:
+            has_cycle, _ = has_hamiltonian_cycle(self._G)
+            if not has_cycle:
+                return False, "Graph does not have a Hamiltonian cycle"
+        return True, "all conditions met"
+
+    def __repr__(self):
+        return f"DynamicGraph(nodes={len(self._G)}, edges={self._G.number_of_edges()})"
@@ -0,0 +1,373 @@
+import math
+from statistics import NormalDist
+import numpy as np
+from .budget import make_budget
+from .circuits import _is_canonical, _trail_adjacency
+from .compact import as_compact
+from .counting import _biconnected_components
+from .profiling import count, stage
+
+# Default number of random walks per estimate
+ESTIMATE_SAMPLES = 1000
+
+# Walks advanced together by the vectorised cycle estimator
+WALK_BATCH = 256
+
+# Above this many nodes each step of the vectorised walks (on n x n and
+# samples x n boolean matrices) costs more than walking with int bitsets
+VECTORIZED_MAX_NODES = 500
+
+
+class CountEstimate:
+    """
+    Unbiased estimate of a count from random walks, with its variance and a confidence interval.
+
+    estimate is the mean of samples independent unbiased estimates, variance
+    the variance of that mean, interval the normal approximation confidence
+    interval (clipped at 0) and by_length the estimated counts keyed by
+    length. With few samples or a very skewed search tree the variance can
+    itself be badly underestimated, so treat narrow intervals from small
+    samples with care. reason is set if the budget stopped the sampling
+    early; the estimate is then still unbiased, from fewer samples. Counts
+    beyond the float range (about 1e308) come out as inf.
+    """
+
+    def __init__(self, estimate, variance, confidence, samples, by_length, reason=None):
+        self.estimate = estimate
+        self.variance = variance
+        self.confidence = confidence
+        self.samples = samples
+        self.by_length = by_length
+        self.reason = reason
+        if math.isfinite(estimate) and math.isfinite(variance):
+            half_width = NormalDist().inv_cdf((1 + confidence) / 2) * math.sqrt(variance)
+            self.interval = (max(estimate - half_width, 0.0), estimate + half_width)
+        else:
+            self.interval = (0.0, math.inf)
+
+    @property
+    def partial(self):
+        return self.reason is not None
+
+    @property
+    def stderr(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        return {"estimate": self.estimate, "variance": self.variance, "stderr": self.stderr,
+                "confidence": self.confidence, "interval": list(self.interval), "samples": self.samples,
+                "by_length": self.by_length, "reason": self.reason}
+
+    def __str__(self):
+        low, high = self.interval
+        return f"≈ {self.estimate:.6g} ({self.confidence:.0%} interval {low:.6g} to {high:.6g})"
+
+    def __repr__(self):
+        return (f"CountEstimate({self.estimate!r}, variance={self.variance!r}, "
+                f"interval={self.interval!r}, samples={self.samples})")
+
+
+def _summarize(values, per_length, roots, scale, exact, confidence, reason):
+    """
+    Turn per-walk contributions into a CountEstimate.
+
+    Args:
+        values (numpy.ndarray): (samples, lengths) contributions of each walk by length
+        per_length (int): Number of lengths
+        roots (int): Number of search trees a walk picked its root from
+        scale (float): Factor applied to every estimate, e.g. 1/2 for cycles found twice
+        exact (dict): Counts known exactly (e.g. self-loops) added to the estimate
+    """
+    samples = len(values)
+    by_length = dict(exact)
+    if not samples:
+        total = float(sum(exact.values()))
+        return CountEstimate(total, math.inf if roots else 0.0, confidence, 0, by_length, reason)
+
+    with np.errstate(over="ignore"):
+        values = values * (roots * scale)
+        means = values.mean(axis=0)
+        totals = values.sum(axis=1)
+    for length in range(per_length):
+        if means[length]:
+            by_length[length] = by_length.get(length, 0) + float(means[length])
+    by_length = dict(sorted(by_length.items()))
+    variance = math.inf
+    if samples > 1 and np.isfinite(totals).all():
+        variance = float(totals.var(ddof=1)) / samples
+    return CountEstimate(float(totals.mean()) + sum(exact.values()), variance, confidence, samples,
+                         by_length, reason)
+
+
+def _cycle_roots(adj):
+    """
+    List the search trees of the exact cycle count (see counting._count_component).
+
+    A tree is rooted at a vertex s with the region of larger vertices it may
+    use: the 2-core of its biconnected component above s. Regions are peeled
+    incrementally as s grows, in O(E) per component.
+
+    Returns:
+        list: (s, region bitset without s) pairs, for the s whose region holds a cycle.
+    """
+    roots = []
+    for component in _biconnected_components(adj):
+        if component.bit_count() < 3:
+            continue
+        region = component
+        degree = {}
+        rest = component
+        while rest:
+            low_bit = rest & -rest
+            v = low_bit.bit_length() - 1
+            degree[v] = (adj[v] & region).bit_count()
+            rest ^= low_bit
+
+        rest = component
+        while rest:
+            low_bit = rest & -rest
+            s = low_bit.bit_length() - 1
+            rest ^= low_bit
+            if not region & low_bit:
+                continue
+            region ^= low_bit
+            if region:
+                roots.append((s, region))
+            queue = [s]
+            while queue:
+                nbrs = adj[queue.pop()] & region
+                while nbrs:
+                    w_bit = nbrs & -nbrs
+                    w = w_bit.bit_length() - 1
+                    degree[w] -= 1
+                    if degree[w] < 2:
+                        region ^= w_bit
+                        queue.append(w)
+                    nbrs ^= w_bit
+    return roots
+
+
+def _nth_bit(bits, index):
+    for _ in range(index):
+        bits &= bits - 1
+    return (bits & -bits).bit_length() - 1
+
+
+def _cycle_walk(adj, s, allowed, max_length, rng, values):
+    """
+    One Knuth random walk down the search tree of s, adding its estimates to values by length.
+
+    Each step picks a child uniformly and multiplies the walk's weight by the
+    number of children, so weight times a node's cycle count is an unbiased
+    estimate of the cycles below the root.
+    """
+    s_bit = 1 << s
+    targets = adj[s] & allowed
+    visited = s_bit
+    candidates = targets
+    weight = 1.0
+    depth = 1
+    steps = 0
+    while candidates:
+        choices = candidates.bit_count()
+        weight *= choices
+        w = _nth_bit(candidates, int(rng.integers(choices)))
+        visited |= 1 << w
+        depth += 1
+        steps += 1
+        if depth >= 3 and adj[w] & s_bit:
+            values[depth] += weight
+        if (max_length is not None and depth >= max_length) or not targets & ~visited:
+            break
+        candidates = adj[w] & allowed & ~visited
+    return steps
+
+
+def _bool_rows(bitsets, n):
+    """
+    Unpack int bitsets into a (len(bitsets), n) boolean matrix.
+    """
+    size = (n + 7) // 8
+    packed = np.frombuffer(b"".join(bits.to_bytes(size, "little") for bits in bitsets), dtype=np.uint8)
+    return np.unpackbits(packed.reshape(len(bitsets), size), axis=1, bitorder="little")[:, :n].astype(bool)
+
+
+def _vectorized_cycle_walks(matrix, starts, regions, max_length, rng, batch):
+    """
+    Run a batch of Knuth walks at once on boolean matrices, like _cycle_walk.
+
+    Returns:
+        numpy.ndarray: (batch, n + 1) contributions of each walk by length.
+    """
+    n = matrix.shape[0]
+    values = np.zeros((batch, n + 1))
+    chosen = rng.integers(len(starts), size=batch)
+    rows = np.arange(batch)
+    s = starts[chosen]
+    allowed = regions[chosen]
+    visited = np.zeros((batch, n), dtype=bool)
+    visited[rows, s] = True
+    targets = matrix[s] & allowed
+    candidates = targets.copy()
+    weight = np.ones(batch)
+    depth = 1
+    while len(rows):
+        choices = candidates.sum(axis=1)
+        keep = choices > 0
+        if not keep.all():
+            rows, s, allowed, visited, targets, candidates, weight, choices = (
+                rows[keep], s[keep], allowed[keep], visited[keep], targets[keep], candidates[keep],
+                weight[keep], choices[keep])
+            if not len(rows):
+                break
+        count("estimate.walk_steps", len(rows))
+        with np.errstate(over="ignore"):
+            weight = weight * choices
+        pick = (rng.random(len(rows)) * choices).astype(np.int64)
+        w = (np.cumsum(candidates, axis=1) > pick[:, None]).argmax(axis=1)
+        visited[np.arange(len(rows)), w] = True
+        depth += 1
+        if depth >= 3:
+            closes = matrix[w, s]
+            values[rows[closes], depth] += weight[closes]
+        if max_length is not None and depth >= max_length:
+            break
+        open_targets = (targets & ~visited).any(axis=1)
+        candidates = matrix[w] & allowed & ~visited
+        candidates[~open_targets] = False
+    return values
+
+
+def estimate_cycle_count(G, samples=ESTIMATE_SAMPLES, seed=None, confidence=0.95, max_length=None,
+                         timeout=None, budget=None, vectorized=True):
+    """
+    Estimate the number of simple cycles of a graph without enumerating them.
+
+    Knuth's tree size estimator on the search of count_cycles_by_length:
+    every walk picks a root (a smallest vertex s) uniformly and descends the
+    pruned search tree along uniformly random children. Weighted by the
+    branching factors, the cycles closed along the way give an unbiased
+    estimate of the total. Each walk costs O(n) steps, so the time is bounded
+    by samples; timeout or budget stop the sampling early. Self-loops
+    (length 1) are counted exactly.
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph, directed graphs are treated as undirected
+        samples (int, optional): Number of random walks: Defaults to ESTIMATE_SAMPLES.
+        seed (int or numpy.random.Generator, optional): Seed for reproducible estimates: Defaults to None.
+        confidence (float, optional): Coverage of the confidence interval: Defaults to 0.95.
+        max_length (int, optional): Only count cycles with at most this many nodes: Defaults to None (unlimited).
+        timeout (float, optional): Stop sampling after this many seconds: Defaults to None (unlimited).
+        budget (Budget, optional): Budget with a cancellation token, used instead of timeout: Defaults to None.
+        vectorized (bool, optional): Advance WALK_BATCH walks at a time with NumPy, for graphs up
+            to VECTORIZED_MAX_NODES nodes: Defaults to True.
+
+    Returns:
+        CountEstimate: The estimate, its variance and confidence interval, and estimates by length.
+    """
+    graph = as_compact(G).to_undirected()
+    n = len(graph)
+    adj = graph.adj
+    rng = np.random.default_rng(seed)
+    budget = make_budget(budget, timeout=timeout)
+    exact = {1: len(graph.loops)} if graph.loops else {}
+
+    with stage("cycles.estimate"):
+        roots = _cycle_roots(adj)
+        if not roots:
+            return CountEstimate(float(sum(exact.values())), 0.0, confidence, 0, exact)
+
+        walks = []
+        if vectorized and n <= VECTORIZED_MAX_NODES:
+            matrix = _bool_rows(adj, n)
+            starts = np.array([s for s, _ in roots])
+            regions = _bool_rows([region for _, region in roots], n)
+            done = 0
+            while done < samples:
+                batch = min(WALK_BATCH, samples - done)
+                if budget is not None and not budget.spend(batch):
+                    break
+                walks.append(_vectorized_cycle_walks(matrix, starts, regions, max_length, rng, batch))
+                done += batch
+        else:
+            for _ in range(samples):
+                if budget is not None and not budget.spend(1):
+                    break
+                values = np.zeros(n + 1)
+                s, region = roots[int(rng.integers(len(roots)))]
+                count("estimate.walk_steps", _cycle_walk(adj, s, region, max_length, rng, values))
+                walks.append(values[None, :])
+
+    values = np.concatenate(walks) if walks else np.zeros((0, n + 1))
+    reason = budget.reason if budget is not None and len(values) < samples else None
+    # Every cycle is found once in each direction
+    return _summarize(values, n + 1, len(roots), 0.5, exact, confidence, reason)
+
+
+def _trail_walk(adjacency, start, max_length, rng, values):
+    """
+    One Knuth random walk down the circuit search tree of start (see circuits._trails_from).
+    """
+    free = sum(1 for w, _ in adjacency[start] if w > start)
+    used = set()
+    path = [start]
+    weight = 1.0
+    while max_length is None or len(path) - 1 < max_length:
+        v = path[-1]
+        options = [(w, eid) for w, eid in adjacency[v] if w >= start and eid not in used]
+        if not options:
+            break
+        weight *= len(options)
+        w, eid = options[int(rng.integers(len(options)))]
+        used.add(eid)
+        path.append(w)
+        if start in (v, w) and v != w:
+            free -= 1
+        if w == start:
+            if _is_canonical(path):
+                values[len(path) - 1] += weight
+        elif free == 0:
+            break
+    return len(path) - 1
+
+
+def estimate_circuit_count(G, samples=ESTIMATE_SAMPLES, seed=None, confidence=0.95, max_length=None,
+                           timeout=None, budget=None):
+    """
+    Estimate the number of circuits (closed trails) of a graph without enumerating them.
+
+    Knuth's tree size estimator on the search of count_circuits_by_length,
+    see estimate_cycle_count. Each walk costs O(E) steps.
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph, directed graphs are treated as undirected
+        samples (int, optional): Number of random walks: Defaults to ESTIMATE_SAMPLES.
+        seed (int or numpy.random.Generator, optional): Seed for reproducible estimates: Defaults to None.
+        confidence (float, optional): Coverage of the confidence interval: Defaults to 0.95.
+        max_length (int, optional): Maximum number of edges in a circuit: Defaults to None (unlimited).
+        timeout (float, optional): Stop sampling after this many seconds: Defaults to None (unlimited).
+        budget (Budget, optional): Budget with a cancellation token, used instead of timeout: Defaults to None.
+
+    Returns:
+        CountEstimate: The estimate, its variance and confidence interval, and estimates by length.
+    """
+    nodes, adjacency, num_edges = _trail_adjacency(G)
+    rng = np.random.default_rng(seed)
+    budget = make_budget(budget, timeout=timeout)
+    roots = [start for start, nbrs in enumerate(adjacency) if any(w >= start for w, _ in nbrs)]
+    if not roots:
+        return CountEstimate(0.0, 0.0, confidence, 0, {})
+
+    walks = []
+    with stage("circuits.estimate"):
+        for _ in range(samples):
+            if budget is not None and not budget.spend(1):
+                break
+            values = np.zeros(num_edges + 1)
+            start = roots[int(rng.integers(len(roots)))]
+            count("estimate.walk_steps", _trail_walk(adjacency, start, max_length, rng, values))
+            walks.append(values)
+
+    values = np.array(walks).reshape(-1, num_edges + 1)
+    reason = budget.reason if budget is not None and len(values) < samples else None
+    return _summarize(values, num_edges + 1, len(roots), 1.0, {}, confidence, reason)
@@ -0,0 +1,206 @@
+from array import array
+import networkx as nx
+from .compact import CompactGraph
+
+
+class EdgeArrays:
+    """
+    Array-backed incidence structure used by the Hierholzer routines.
+
+    Edges are numbered 0..m-1 with endpoints in tails/heads. The edges leaving
+    vertex v (all incident edges for undirected graphs, a self-loop once) are
+    incident[offsets[v]:offsets[v + 1]]. Parallel edges of multigraphs get
+    their own numbers. Building it never modifies or copies G, and a
+    CompactGraph is read through its index pairs directly.
+    """
+
+    def __init__(self, G):
+        self.directed = G.is_directed()
+        if isinstance(G, CompactGraph):
+            self.nodes = list(G.nodes)
+            pairs = G.edges()
+        else:
+            self.nodes = list(G.nodes())
+            index = {node: i for i, node in enumerate(self.nodes)}
+            pairs = ((index[u], index[v]) for u, v in G.edges())
+        n = len(self.nodes)
+
+        self.tails = array('l')
+        self.heads = array('l')
+        self.degree = [0] * n if not self.directed else None
+        self.out_degree = [0] * n if self.directed else None
+        self.in_degree = [0] * n if self.directed else None
+
+        counts = [0] * (n + 1)
+        for u, v in pairs:
+            self.tails.append(u)
+            self.heads.append(v)
+            counts[u + 1] += 1
+            if self.directed:
+                self.out_degree[u] += 1
+                self.in_degree[v] += 1
+            else:
+                self.degree[u] += 1
+                self.degree[v] += 1
+                if u != v:
+                    counts[v + 1] += 1
+
+        for v in range(n):
+            counts[v + 1] += counts[v]
+        self.offsets = array('l', counts)
+        self.incident = array('l', [0]) * counts[n]
+        fill = array('l', counts[:n])
+        for e in range(len(self.tails)):
+            u, v = self.tails[e], self.heads[e]
+            self.incident[fill[u]] = e
+            fill[u] += 1
+            if not self.directed and u != v:
+                self.incident[fill[v]] = e
+                fill[v] += 1
+
+    @property
+    def num_edges(self):
+        return len(self.tails)
+
+    def unbalanced_vertex(self):
+        """
+        Find a vertex that keeps the edges from splitting into circuits.
+
+        Returns:
+            The first node with odd degree (or in-degree != out-degree), or None.
+        """
+        for v, node in enumerate(self.nodes):
+            if self.directed:
+                if self.in_degree[v] != self.out_degree[v]:
+                    return node
+            elif self.degree[v] % 2:
+                return node
+        return None
+
+    def _other_end(self, e, v):
+        if self.directed or self.tails[e] == v:
+            return self.heads[e]
+        return self.tails[e]
+
+
+def hierholzer_circuit(edges, start=0):
+    """
+    Walk an Eulerian circuit with Hierholzer's algorithm in O(V + E).
+
+    Each vertex keeps a pointer into its incidence list and used edges are
+    marked in a bitmap, so every edge is looked at a constant number of times.
+
+    Args:
+        edges (EdgeArrays): The graph to walk
+        start (int, optional): Index of the start vertex: Defaults to 0.
+
+    Returns:
+        list: Vertex indices of the closed walk from start covering every edge
+        reachable from it (all edges if the graph is Eulerian).
+    """
+    offsets, incident = edges.offsets, edges.incident
+    pointer = array('l', offsets)
+    used = bytearray(edges.num_edges)
+    stack = [start]
+    circuit = []
+
+    while stack:
+        v = stack[-1]
+        p, end = pointer[v], offsets[v + 1]
+        while p < end and used[incident[p]]:
+            p += 1
+        if p == end:
+            pointer[v] = p
+            circuit.append(stack.pop())
+        else:
+            e = incident[p]
+            used[e] = 1
+            pointer[v] = p + 1
+            stack.append(edges._other_end(e, v))
+
+    circuit.reverse()
+    return circuit
+
+
+def eulerian_circuit(G):
+    """
+    Find an Eulerian circuit with the array-backed Hierholzer engine.
+
+    Works for graphs, digraphs and their multigraph variants. As before, every
+    vertex has to be reached (connected, or strongly connected for digraphs).
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph
+
+    Returns:
+        tuple: (True, circuit) with the circuit as a list of nodes, or (False, None).
+    """
+    edges = EdgeArrays(G)
+    n = len(edges.nodes)
+    if n == 0 or edges.unbalanced_vertex() is not None:
+        return False, None
+    if edges.num_edges == 0:
+        return (True, [edges.nodes[0]]) if n == 1 else (False, None)
+
+    circuit = hierholzer_circuit(edges)
+    if len(circuit) != edges.num_edges + 1 or len(set(circuit)) != n:
+        return False, None
+    return True, [edges.nodes[v] for v in circuit]
+
+
+def cycle_decomposition(G):
+    """
+    Split the edges of a graph into edge-disjoint simple cycles in O(V + E).
+
+    Walks unused edges Hierholzer-style and cuts a cycle off the current path
+    whenever the walk returns to a vertex already on it. Balanced degrees make
+    a dead end impossible, so every edge ends up in exactly one cycle.
+
+    Args:
+        G (object): A NetworkX graph object (directed and multigraphs allowed)
+
+    Returns:
+        list: Cycles as lists of nodes that start and end at the same node.
+        Raises NetworkXError if a vertex has odd degree (or unequal in/out degree),
+        in which case no such decomposition exists.
+    """
+    edges = EdgeArrays(G)
+    bad = edges.unbalanced_vertex()
+    if bad is not None:
+        kind = "unequal in and out degree" if edges.directed else "odd degree"
+        raise nx.NetworkXError(f"Node {bad} has {kind}, so the edges cannot be split into circuits.")
+
+    offsets, incident = edges.offsets, edges.incident
+    pointer = array('l', offsets)
+    used = bytearray(edges.num_edges)
+    position = [-1] * len(edges.nodes)
+    cycles = []
+
+    for start in range(len(edges.nodes)):
+        path = [start]
+        position[start] = 0
+        while True:
+            v = path[-1]
+            p, end = pointer[v], offsets[v + 1]
+            while p < end and used[incident[p]]:
+                p += 1
+            pointer[v] = p
+            if p == end:
+                break
+            e = incident[p]
+            used[e] = 1
+            pointer[v] = p + 1
+            w = edges._other_end(e, v)
+
+            i = position[w]
+            if i >= 0:
+                cycles.append([edges.nodes[u] for u in path[i:]] + [edges.nodes[w]])
+                for u in path[i + 1:]:
+                    position[u] = -1
+                del path[i + 1:]
+            else:
+                position[w] = len(path)
+                path.append(w)
+        position[start] = -1
+
+    return cycles
@@ -1,26 +1,118 @@
-import random
 import networkx as nx
+import numpy as np
 
-def generate_random_graph(num_nodes, edge_probability = 0.5):
+# Edge probabilities at or above this draw one uniform number per node pair;
+# below it, geometric skips jump straight from one edge to the next.
+DENSE_THRESHOLD = 0.2
+
+
+def _pair_from_index(k, num_nodes):
+    """
+    Map linear indices into the row-major upper triangle back to (i, j) pairs with i < j.
+    """
+    b = 2 * num_nodes - 1
+    i = np.floor((b - np.sqrt(b * b - 8.0 * k)) / 2).astype(np.int64)
+    # Correct the rare off-by-one from floating point rounding
+    offset = i * (b - i) // 2
+    i = np.where(offset > k, i - 1, i)
+    offset = i * (b - i) // 2
+    row_end = offset + (num_nodes - 1 - i)
+    i = np.where(k >= row_end, i + 1, i)
+    offset = i * (b - i) // 2
+    j = k - offset + i + 1
+    return np.column_stack((i, j))
+
+
+def random_edge_array(num_nodes, edge_probability=0.5, seed=None):
+    """
+    Sample the edges of a G(n, p) random graph without building a graph.
+
+    Dense probabilities compare one uniform draw per node pair against an upper
+    triangle mask. Sparse probabilities use Batagelj-Brandes geometric skipping,
+    so the work is proportional to the number of edges rather than n^2.
+
+    Args:
+        num_nodes (integer): Number of nodes in the graph.
+        edge_probability (float, optional): Probability of creating an edge between any two vertices: Defaults to 0.5.
+        seed (int or numpy.random.Generator, optional): Seed or generator for reproducible graphs: Defaults to None.
+
+    Returns:
+        numpy.ndarray: An (m, 2) integer array of edges (i, j) with i < j, sorted.
+    """
+    rng = np.random.default_rng(seed)
+    total = num_nodes * (num_nodes - 1) // 2
+    if total == 0 or edge_probability <= 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    if edge_probability >= DENSE_THRESHOLD:
+        i, j = np.triu_indices(num_nodes, 1)
+        mask = rng.random(total) < edge_probability
+        return np.column_stack((i[mask], j[mask])).astype(np.int64)
+
+    expected = total * edge_probability
+    chunk = int(expected + 5 * np.sqrt(expected)) + 16
+    indices = []
+    position = -1
+    while position < total:
+        steps = np.cumsum(rng.geometric(edge_probability, size=chunk)) + position
+        indices.append(steps[steps < total])
+        position = steps[-1]
+    k = np.concatenate(indices)
+    return _pair_from_index(k, num_nodes)
+
+
+def random_graph_csr(num_nodes, edge_probability=0.5, seed=None):
+    """
+    Sample a G(n, p) random graph as a CSR adjacency structure.
+
+    Args:
+        num_nodes (integer): Number of nodes in the graph.
+        edge_probability (float, optional): Probability of creating an edge between any two vertices: Defaults to 0.5.
+        seed (int or numpy.random.Generator, optional): Seed or generator for reproducible graphs: Defaults to None.
+
+    Returns:
+        indptr: Array of length num_nodes + 1, the neighbours of i are indices[indptr[i]:indptr[i + 1]]
+        indices: Sorted neighbour array, each undirected edge appears once in each direction
+    """
+    return edges_to_csr(num_nodes, random_edge_array(num_nodes, edge_probability, seed))
+
+
+def edges_to_csr(num_nodes, edges):
+    """
+    Build a symmetric CSR adjacency structure from an (m, 2) edge array.
+
+    Args:
+        num_nodes (integer): Number of nodes in the graph.
+        edges (numpy.ndarray): An (m, 2) integer array of undirected edges.
+
+    Returns:
+        indptr: Array of length num_nodes + 1
+        indices: Neighbour array sorted within each row
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    sources = np.concatenate((edges[:, 0], edges[:, 1]))
+    targets = np.concatenate((edges[:, 1], edges[:, 0]))
+    order = np.lexsort((targets, sources))
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=num_nodes), out=indptr[1:])
+    return indptr, targets[order]
+
+
+def generate_random_graph(num_nodes, edge_probability = 0.5, seed=None):
     """
     Generate a random graph with num_veritices and random edges
 
     Args:
         num_nodes (integer): Number of nodes in the graph.
         edge_probability (float, optional): Probability of creating an edge between any two vertices: Defaults to 0.5.
+        seed (int or numpy.random.Generator, optional): Seed or generator for reproducible graphs: Defaults to None.
 
     Returns:
         G: A NetworkX graph object
     """
 
     G = nx.Graph()
+    G.add_nodes_from(range(num_nodes))
+    G.add_edges_from(random_edge_array(num_nodes, edge_probability, seed).tolist())
 
-    for i in range(num_nodes):
-        G.add_node(i)
-
-    for i in range(num_nodes):
-        for j in range(i + 1, num_nodes):
-            if random.random() < edge_probability:
-                G.add_edge(i, j)
-
-    return G
\ No newline at end of file
+    return G
@@ -0,0 +1,360 @@
+import contextlib
+import gzip
+import io
+import json
+import mmap
+import os
+import sys
+import networkx as nx
+import numpy as np
+from .compact import CompactGraph
+
+FORMATS = ("edgelist", "graph6", "sparse6", "ndjson")
+
+# Read buffer for graph files; large buffers keep multi-GB corpora I/O bound
+BUFFER_SIZE = 1 << 20
+
+_EXTENSIONS = {
+    ".g6": "graph6", ".graph6": "graph6",
+    ".s6": "sparse6", ".sparse6": "sparse6",
+    ".ndjson": "ndjson", ".jsonl": "ndjson",
+}
+
+_HEADERS = {b">>graph6<<": "graph6", b">>sparse6<<": "sparse6"}
+
+
+def guess_format(path):
+    """
+    Guess the format of a graph file from its extension (ignoring .gz), edge list by default.
+    """
+    if path == "-" or not isinstance(path, (str, os.PathLike)):
+        return "edgelist"
+    root, extension = os.path.splitext(os.fspath(path).lower())
+    if extension == ".gz":
+        extension = os.path.splitext(root)[1]
+    return _EXTENSIONS.get(extension, "edgelist")
+
+
+@contextlib.contextmanager
+def _open_lines(source, use_mmap, buffer_size):
+    """
+    Yield an iterator over the lines of a graph source as bytes.
+    """
+    if hasattr(source, "read"):
+        if isinstance(source, io.TextIOBase):
+            yield (line.encode() for line in source)
+        else:
+            yield iter(source)
+    elif source == "-":
+        yield iter(sys.stdin.buffer)
+    elif os.fspath(source).endswith(".gz"):
+        with gzip.open(source, "rb") as f:
+            yield iter(io.BufferedReader(f, buffer_size))
+    else:
+        with open(source, "rb", buffering=buffer_size) as f:
+            if use_mmap and os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    yield iter(mapped.readline, b"")
+            else:
+                yield iter(f)
+
+
+@contextlib.contextmanager
+def _open_output(destination):
+    """
+    Yield a binary write function for a path, "-" (stdout) or an open file.
+    """
+    if hasattr(destination, "write"):
+        if isinstance(destination, io.TextIOBase):
+            yield lambda data: destination.write(data.decode())
+        else:
+            yield destination.write
+    elif destination == "-":
+        yield sys.stdout.buffer.write
+        sys.stdout.buffer.flush()
+    elif os.fspath(destination).endswith(".gz"):
+        with gzip.open(destination, "wb") as f:
+            yield f.write
+    else:
+        with open(destination, "wb", buffering=BUFFER_SIZE) as f:
+            yield f.write
+
+
+def _parse_node(token):
+    try:
+        return int(token)
+    except ValueError:
+        return token.decode()
+
+
+def _build(nodes, edges, compact):
+    """
+    Build a graph from node labels and (u, v) label pairs.
+    """
+    if compact:
+        index = {node: i for i, node in enumerate(nodes)}
+        return CompactGraph(nodes, [(index[u], index[v]) for u, v in edges])
+    G = nx.Graph()
+    G.add_nodes_from(nodes)
+    G.add_edges_from(edges)
+    return G
+
+
+def _graph_pairs(G):
+    """
+    Return the node list of a graph and its edges as (i, j) index pairs.
+    """
+    if isinstance(G, CompactGraph):
+        return list(G.nodes), list(G.edges())
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    return nodes, [(index[u], index[v]) for u, v in G.edges()]
+
+
+def _read_edgelist(lines, compact):
+    """
+    Parse edge list blocks: one "u v" pair per line (further columns are ignored),
+    a lone "u" for an isolated node, "#" comments, graphs separated by blank lines.
+    """
+    nodes = {}
+    edges = []
+    for line in lines:
+        tokens = line.split(b"#", 1)[0].split()
+        if not tokens:
+            if not line.strip() and nodes:
+                yield _build(list(nodes), edges, compact)
+                nodes, edges = {}, []
+            continue
+        u = _parse_node(tokens[0])
+        nodes.setdefault(u, None)
+        if len(tokens) > 1:
+            v = _parse_node(tokens[1])
+            nodes.setdefault(v, None)
+            edges.append((u, v))
+    if nodes:
+        yield _build(list(nodes), edges, compact)
+
+
+def _write_edgelist(G, write):
+    nodes, edges = _graph_pairs(G)
+    labels = [str(node) for node in nodes]
+    lines = [f"{labels[i]} {labels[j]}\n" for i, j in edges]
+    touched = set()
+    for i, j in edges:
+        touched.add(i)
+        touched.add(j)
+    lines.extend(f"{labels[i]}\n" for i in range(len(nodes)) if i not in touched)
+    lines.append("\n")
+    write("".join(lines).encode())
+
+
+def _decode_size(data):
+    """
+    Decode the graph6/sparse6 node count, returning (n, number of bytes used).
+    """
+    if data[0] != 126:
+        return data[0] - 63, 1
+    if data[1] != 126:
+        return ((data[1] - 63) << 12) | ((data[2] - 63) << 6) | (data[3] - 63), 4
+    n = 0
+    for byte in data[2:8]:
+        n = (n << 6) | (byte - 63)
+    return n, 8
+
+
+def _encode_size(n):
+    if n < 63:
+        return bytes([n + 63])
+    if n < 258048:
+        return bytes([126] + [((n >> shift) & 63) + 63 for shift in (12, 6, 0)])
+    return bytes([126, 126] + [((n >> shift) & 63) + 63 for shift in (30, 24, 18, 12, 6, 0)])
+
+
+def graph6_edge_array(line):
+    """
+    Decode one graph6 line into its node count and edge array, without building a graph.
+
+    Args:
+        line (bytes): A graph6 string, optionally with header and trailing newline
+
+    Returns:
+        tuple: (n, edges) with edges an (m, 2) numpy array of index pairs i < j.
+    """
+    line = line.strip()
+    if line.startswith(b">>graph6<<"):
+        line = line[10:]
+    data = np.frombuffer(line, dtype=np.uint8)
+    n, used = _decode_size(line)
+    # Six bits per byte, most significant first, over the upper triangle column by column
+    bits = np.unpackbits((data[used:] - 63).reshape(-1, 1), axis=1)[:, 2:].ravel()
+    positions = np.flatnonzero(bits[:n * (n - 1) // 2])
+    j = ((1 + np.sqrt(1 + 8 * positions)) // 2).astype(np.int64)
+    # Correct floating point rounding of the triangular root
+    j -= j * (j - 1) // 2 > positions
+    j += (j + 1) * j // 2 <= positions
+    i = positions - j * (j - 1) // 2
+    return n, np.column_stack((i, j))
+
+
+def _read_graph6(lines, compact):
+    for line in lines:
+        if not line.strip():
+            continue
+        n, edges = graph6_edge_array(line)
+        if compact:
+            yield CompactGraph(range(n), edges)
+        else:
+            G = nx.Graph()
+            G.add_nodes_from(range(n))
+            G.add_edges_from(edges.tolist())
+            yield G
+
+
+def graph6_bytes(G):
+    """
+    Encode a simple undirected graph as one graph6 line (nodes in G's order).
+    """
+    nodes, edges = _graph_pairs(G)
+    n = len(nodes)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if G.is_directed() or (len(edges) and (edges[:, 0] == edges[:, 1]).any()):
+        raise nx.NetworkXError("graph6 only stores simple undirected graphs, use sparse6")
+    low, high = np.minimum(edges[:, 0], edges[:, 1]), np.maximum(edges[:, 0], edges[:, 1])
+    bits = np.zeros(-(-(n * (n - 1) // 2) // 6) * 6, dtype=np.uint8)
+    bits[high * (high - 1) // 2 + low] = 1
+    groups = np.packbits(np.pad(bits.reshape(-1, 6), ((0, 0), (2, 0))), axis=1).ravel() + 63
+    return _encode_size(n) + groups.astype(np.uint8).tobytes() + b"\n"
+
+
+def _read_sparse6(lines, compact):
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith(b">>sparse6<<"):
+            line = line[11:]
+        G = nx.from_sparse6_bytes(line)
+        if compact:
+            yield CompactGraph.from_networkx(G)
+        else:
+            yield G
+
+
+def _write_sparse6(G, write):
+    if isinstance(G, CompactGraph):
+        G = G.to_networkx()
+    write(nx.to_sparse6_bytes(nx.convert_node_labels_to_integers(G), header=False))
+
+
+def graph_to_record(G, **fields):
+    """
+    Build an NDJSON record {"nodes": [...], "edges": [[u, v], ...]} for a graph, plus any extra fields.
+    """
+    if isinstance(G, CompactGraph):
+        nodes = list(G.nodes)
+        edges = [[nodes[i], nodes[j]] for i, j in G.edges()]
+    else:
+        nodes = list(G.nodes())
+        edges = [list(edge) for edge in G.edges()]
+    record = dict(fields)
+    record["nodes"] = nodes
+    record["edges"] = edges
+    return record
+
+
+def graph_from_record(record, compact=False):
+    """
+    Build the graph of an NDJSON record, see graph_to_record.
+    """
+    nodes = {}
+    for node in record.get("nodes", ()):
+        nodes.setdefault(node, None)
+    edges = [tuple(edge[:2]) for edge in record["edges"]]
+    for u, v in edges:
+        nodes.setdefault(u, None)
+        nodes.setdefault(v, None)
+    return _build(list(nodes), edges, compact)
+
+
+def _read_ndjson(lines, compact):
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if "edges" in record:
+            yield graph_from_record(record, compact)
+
+
+def _write_ndjson(G, write):
+    write(json.dumps(graph_to_record(G)).encode() + b"\n")
+
+
+_READERS = {"edgelist": _read_edgelist, "graph6": _read_graph6, "sparse6": _read_sparse6, "ndjson": _read_ndjson}
+_WRITERS = {"edgelist": _write_edgelist, "graph6": lambda G, write: write(graph6_bytes(G)),
+            "sparse6": _write_sparse6, "ndjson": _write_ndjson}
+
+
+def _check_format(format):
+    if format not in FORMATS:
+        raise ValueError(f"Unknown graph format {format!r}, expected one of {', '.join(FORMATS)}")
+
+
+def read_graphs(source, format=None, compact=False, use_mmap=False, buffer_size=BUFFER_SIZE):
+    """
+    Stream the graphs stored in a file one at a time.
+
+    Only the graph being parsed is held in memory, so arbitrarily large
+    collections can be fed through analyze_graph. graph6 and sparse6 files
+    may start with their >>graph6<< / >>sparse6<< header; .gz files are
+    decompressed on the fly.
+
+    Args:
+        source (str, path or file): File path, "-" for stdin, or an open file
+        format (str, optional): One of FORMATS: Defaults to a guess from the file extension.
+        compact (bool, optional): Yield CompactGraph objects instead of NetworkX graphs: Defaults to False.
+        use_mmap (bool, optional): Read an uncompressed file through a read-only memory map: Defaults to False.
+        buffer_size (int, optional): Read buffer size in bytes: Defaults to BUFFER_SIZE.
+
+    Yields:
+        object: Each graph in the file, as a NetworkX Graph or CompactGraph.
+    """
+    format = format or guess_format(source)
+    _check_format(format)
+    with _open_lines(source, use_mmap, buffer_size) as lines:
+        first = next(lines, None)
+        if first is None:
+            return
+        for header, header_format in _HEADERS.items():
+            if first.startswith(header):
+                format = header_format
+        if format == "graph6" and first.startswith(b":"):
+            format = "sparse6"
+        yield from _READERS[format](_chain(first, lines), compact)
+
+
+def _chain(first, lines):
+    yield first
+    yield from lines
+
+
+def write_graphs(graphs, destination, format=None):
+    """
+    Write graphs one at a time, consuming any iterable (e.g. a generator) lazily.
+
+    Args:
+        graphs (iterable): NetworkX graphs or CompactGraphs
+        destination (str, path or file): File path, "-" for stdout, or an open file
+        format (str, optional): One of FORMATS: Defaults to a guess from the file extension.
+
+    Returns:
+        int: Number of graphs written.
+    """
+    format = format or guess_format(destination)
+    _check_format(format)
+    writer = _WRITERS[format]
+    count = 0
+    with _open_output(destination) as write:
+        for G in graphs:
+            writer(G, write)
+            count += 1
+    return count
@@ -0,0 +1,717 @@
+from .budget import BudgetExhausted, make_budget
+from .compact import as_compact
+from .directed import _reach, strongly_connected_components
+from .parallel import run_tasks
+from .profiling import count, enabled, stage
+
+# Above this many nodes the Held-Karp table (2^(n-1) entries) gets too big
+# and the pruned backtracking search is used instead.
+HELD_KARP_MAX_NODES = 16
+
+# Path prefixes handed out per worker by the parallel search, so workers that
+# draw quickly refuted subtrees pick up new ones instead of idling
+PREFIXES_PER_WORKER = 8
+
+# Largest graph whose 2-vertex cuts are all tried by the toughness pre-filter
+TOUGHNESS_MAX_NODES = 40
+
+# Tiers that can decide hamiltonian_decision, in the order they are tried:
+# sufficient conditions, necessary conditions, then the exact searches
+TIERS = ("trivial", "dirac", "ore", "chvatal", "closure", "min_degree", "forced_edges", "biconnected",
+         "strongly_connected", "bipartite", "toughness", "held_karp", "backtrack")
+
+
+def adjacency_bitsets(G):
+    """
+    Relabel the nodes of a graph to 0..n-1 and build integer adjacency bitsets.
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph, directed graphs are treated as undirected
+
+    Returns:
+        nodes: List of the original nodes, indexed by their new label
+        adj: List of ints where bit j of adj[i] is set if i and j are adjacent
+    """
+    graph = as_compact(G).to_undirected()
+    return list(graph.nodes), list(graph.adj)
+
+
+def _lowest_index(bits):
+    return (bits & -bits).bit_length() - 1
+
+
+def _bits(bits):
+    while bits:
+        low_bit = bits & -bits
+        yield low_bit.bit_length() - 1
+        bits ^= low_bit
+
+
+def _is_biconnected(adj, mask, root_nbrs):
+    """
+    Check that a virtual root plus the vertices in mask form a 2-connected graph.
+
+    The root is given index len(adj) and is adjacent to the vertices in
+    root_nbrs. Every other vertex only sees its neighbours inside mask.
+
+    Returns:
+        bool: True if every vertex is reachable from the root and there are no articulation points.
+    """
+    root = len(adj)
+    root_bit = 1 << root
+
+    def neighbours(v):
+        if v == root:
+            return root_nbrs
+        nbrs = adj[v] & mask
+        if root_nbrs >> v & 1:
+            nbrs |= root_bit
+        return nbrs
+
+    disc = [-1] * (root + 1)
+    low = [0] * (root + 1)
+    disc[root] = 0
+    counter = 1
+    root_children = 0
+    stack = [[root, -1, neighbours(root)]]
+
+    while stack:
+        frame = stack[-1]
+        v, parent, pending = frame
+        if pending:
+            w = _lowest_index(pending)
+            frame[2] = pending & (pending - 1)
+            if disc[w] >= 0:
+                if w != parent and disc[w] < low[v]:
+                    low[v] = disc[w]
+            else:
+                disc[w] = low[w] = counter
+                counter += 1
+                if v == root:
+                    root_children += 1
+                stack.append([w, v, neighbours(w)])
+        else:
+            stack.pop()
+            if stack:
+                p = stack[-1][0]
+                if low[v] < low[p]:
+                    low[p] = low[v]
+                if p != root and low[v] >= disc[p]:
+                    return False
+
+    return root_children <= 1 and counter == mask.bit_count() + 1
+
+
+def held_karp_cycle(adj, budget=None, in_adj=None):
+    """
+    Find a Hamiltonian cycle with the Held-Karp bitmask dynamic program.
+
+    dp[s] is the bitset of vertices v such that some path starting at vertex 0
+    visits exactly {0} and the vertices in s (bit i of s stands for vertex i + 1)
+    and ends at v. Runs in O(2^n * n) bit operations.
+
+    Args:
+        adj (list): Adjacency bitsets as returned by adjacency_bitsets
+        budget (Budget, optional): Search budget: Defaults to None.
+        in_adj (list, optional): In-neighbour bitsets of a directed graph, whose adj then
+            holds the out-neighbours: Defaults to None (undirected).
+
+    Returns:
+        list or None: Vertex indices of a Hamiltonian cycle starting at 0, None if there is none
+        Raises BudgetExhausted if the budget runs out first.
+    """
+    n = len(adj)
+    predecessors = adj if in_adj is None else in_adj
+    size = 1 << (n - 1)
+    dp = [0] * size
+    dp[0] = 1
+
+    s = 0
+    try:
+        for s in range(1, size):
+            if budget is not None:
+                budget.check()
+            ends = 0
+            rest = s
+            while rest:
+                low_bit = rest & -rest
+                v = low_bit.bit_length()
+                if dp[s ^ low_bit] & predecessors[v]:
+                    ends |= 1 << v
+                rest ^= low_bit
+            dp[s] = ends
+    finally:
+        count("hamiltonian.states", s)
+
+    s = size - 1
+    closing = dp[s] & predecessors[0]
+    if not closing:
+        return None
+
+    v = _lowest_index(closing)
+    cycle = [v]
+    while s:
+        s ^= 1 << (v - 1)
+        v = _lowest_index(dp[s] & predecessors[v])
+        cycle.append(v)
+    cycle.reverse()
+    return cycle
+
+
+def _closure(adj):
+    """
+    Compute the Bondy-Chvátal closure: join non-adjacent u and v while deg(u) + deg(v) >= n.
+
+    The graph is Hamiltonian exactly when its closure is. Only vertices that
+    could reach the threshold with the largest degree are tried, so sparse
+    graphs are dismissed in O(n).
+
+    Returns:
+        tuple: (closure bitsets, the (u, v) edges added, in the order they were added).
+    """
+    n = len(adj)
+    closure = list(adj)
+    degree = [bits.bit_count() for bits in adj]
+    added = []
+    grew = True
+    while grew:
+        grew = False
+        top = max(degree)
+        eligible = 0
+        for v in range(n):
+            if degree[v] + top >= n:
+                eligible |= 1 << v
+        for u in _bits(eligible):
+            for v in _bits(eligible & ~closure[u] & ~((2 << u) - 1)):
+                if degree[u] + degree[v] >= n:
+                    closure[u] |= 1 << v
+                    closure[v] |= 1 << u
+                    degree[u] += 1
+                    degree[v] += 1
+                    added.append((u, v))
+                    grew = True
+    return closure, added
+
+
+def _closure_cycle(closure, added):
+    """
+    Turn a Hamiltonian cycle of a complete closure into one of the original graph.
+
+    The added edges are taken out again, last first. When the cycle uses the
+    edge u-v being removed, it is a path from u to v in the graph at the time
+    u-v was added, where deg(u) + deg(v) >= n guarantees some i with u ~ path[i + 1]
+    and path[i] ~ v; the path then closes into a new cycle without u-v.
+    Takes O(n) per repaired edge.
+    """
+    n = len(closure)
+    graph = list(closure)
+    cycle = list(range(n))
+    position = list(range(n))
+    for u, v in reversed(added):
+        graph[u] ^= 1 << v
+        graph[v] ^= 1 << u
+        gap = (position[u] - position[v]) % n
+        if gap == 1:
+            path = [cycle[(position[u] + k) % n] for k in range(n)]
+        elif gap == n - 1:
+            path = [cycle[(position[u] - k) % n] for k in range(n)]
+        else:
+            continue
+        first, last = graph[u], graph[v]
+        for i in range(1, n - 1):
+            if first >> path[i + 1] & 1 and last >> path[i] & 1:
+                break
+        cycle = [u] + path[i + 1:] + path[i:0:-1]
+        for k, w in enumerate(cycle):
+            position[w] = k
+    return cycle
+
+
+def _sufficient_tier(adj):
+    """
+    Try the sufficient conditions of Dirac, Ore and Chvátal, and the Bondy-Chvátal closure.
+
+    Returns:
+        tuple: (tier, Hamiltonian cycle of vertex indices) for the first condition
+        that holds, (None, None) if none does.
+    """
+    n = len(adj)
+    degree = [bits.bit_count() for bits in adj]
+    ordered = sorted(degree)
+    if ordered[-1] + ordered[-2] < n:
+        # The closure adds no edge and the graph is not complete
+        return None, None
+
+    full = (1 << n) - 1
+    if 2 * ordered[0] >= n:
+        tier = "dirac"
+    elif all(degree[u] + degree[v] >= n for u in range(n) for v in _bits(full & ~adj[u] & ~((2 << u) - 1))):
+        tier = "ore"
+    elif all(ordered[i - 1] > i or ordered[n - i - 1] >= n - i for i in range(1, (n + 1) // 2)):
+        tier = "chvatal"
+    else:
+        tier = "closure"
+    closure, added = _closure(adj)
+    if any(bits | 1 << v != full for v, bits in enumerate(closure)):
+        return None, None
+    return tier, _closure_cycle(closure, added)
+
+
+def _forced_edge_conflict(adj):
+    """
+    Check the edges forced by degree-2 vertices, both of whose edges every Hamiltonian cycle uses.
+
+    Returns:
+        bool: True if some vertex has more than two forced edges or the forced
+        edges close a cycle through fewer than all vertices.
+    """
+    n = len(adj)
+    pairs = 0
+    for v, bits in enumerate(adj):
+        if bits.bit_count() == 2:
+            pairs |= 1 << v
+    if not pairs:
+        return False
+
+    for v, bits in enumerate(adj):
+        forced = bits if pairs >> v & 1 else bits & pairs
+        if forced.bit_count() > 2:
+            return True
+
+    parent = list(range(n))
+    size = [1] * n
+    for v in _bits(pairs):
+        for w in _bits(adj[v]):
+            if w < v and pairs >> w & 1:
+                continue
+            root_v, root_w = v, w
+            while parent[root_v] != root_v:
+                root_v = parent[root_v]
+            while parent[root_w] != root_w:
+                root_w = parent[root_w]
+            if root_v == root_w:
+                return size[root_v] < n
+            if size[root_v] < size[root_w]:
+                root_v, root_w = root_w, root_v
+            parent[root_w] = root_v
+            size[root_v] += size[root_w]
+    return False
+
+
+def _unbalanced_bipartite(adj):
+    """
+    Check if a connected graph is bipartite with sides of different sizes, which rules out a Hamiltonian cycle.
+    """
+    sides = [0, 0]
+    seen = frontier = 1
+    side = 0
+    while frontier:
+        sides[side] |= frontier
+        reached = 0
+        for v in _bits(frontier):
+            reached |= adj[v]
+        if reached & sides[side]:
+            return False
+        frontier = reached & ~seen
+        seen |= frontier
+        side ^= 1
+    return sides[0].bit_count() != sides[1].bit_count()
+
+
+def _tough_cut(adj):
+    """
+    Look for two vertices whose removal leaves more than two components.
+
+    A Hamiltonian graph is 1-tough: removing any k vertices leaves at most k
+    components. Cuts of one vertex are covered by the biconnectivity check.
+    """
+    n = len(adj)
+    full = (1 << n) - 1
+    for a in range(n):
+        for b in range(a + 1, n):
+            rest = full ^ (1 << a) ^ (1 << b)
+            components = 0
+            while rest:
+                components += 1
+                if components > 2:
+                    return True
+                rest &= ~_reach(adj, _lowest_index(rest), rest)
+    return False
+
+
+def _necessary_tier(adj, in_adj=None):
+    """
+    Try the necessary conditions, cheapest first.
+
+    Returns:
+        str or None: The tier of the first condition that fails, which rules out
+        a Hamiltonian cycle, or None if all hold.
+    """
+    n = len(adj)
+    if in_adj is not None:
+        if not all(adj) or not all(in_adj):
+            return "min_degree"
+        if len(strongly_connected_components(adj)) > 1:
+            return "strongly_connected"
+        return None
+    if any(bits.bit_count() < 2 for bits in adj):
+        return "min_degree"
+    if _forced_edge_conflict(adj):
+        return "forced_edges"
+    if not _is_biconnected(adj, ((1 << n) - 1) ^ 1, adj[0]):
+        return "biconnected"
+    if _unbalanced_bipartite(adj):
+        return "bipartite"
+    if n <= TOUGHNESS_MAX_NODES and _tough_cut(adj):
+        return "toughness"
+    return None
+
+
+def _next_moves(adj, start, cur, unvisited):
+    """
+    Prune the search state and list the moves worth trying from cur.
+
+    The remaining path has to run from cur through every unvisited vertex and
+    close at start. Each unvisited vertex therefore needs at least two usable
+    neighbours, a vertex whose only usable neighbours include cur must be
+    visited next (a forced degree-2 edge), start can take only one more forced
+    edge, and merging cur with start must leave a 2-connected graph.
+
+    Returns:
+        list: Candidate next vertices, least constrained last; empty if the state is dead.
+    """
+    cur_bit = 1 << cur
+    start_bit = 1 << start
+    open_bits = unvisited | cur_bit | start_bit
+
+    if not adj[start] & unvisited:
+        return []
+
+    forced = 0
+    start_forced = 0
+    options = []
+    rest = unvisited
+    while rest:
+        low_bit = rest & -rest
+        w = low_bit.bit_length() - 1
+        degree = (adj[w] & open_bits).bit_count()
+        if degree < 2:
+            return []
+        if adj[w] & cur_bit:
+            if degree == 2:
+                forced |= low_bit
+            options.append((degree, w))
+        if degree == 2 and adj[w] & start_bit:
+            start_forced += 1
+        rest ^= low_bit
+
+    if forced & (forced - 1) or start_forced > 1:
+        return []
+
+    if unvisited & (unvisited - 1):
+        if not _is_biconnected(adj, unvisited, (adj[cur] | adj[start]) & unvisited):
+            return []
+
+    if forced:
+        return [_lowest_index(forced)]
+    options.sort(reverse=True)
+    return [w for _, w in options]
+
+
+def _next_directed_moves(adj, in_adj, start, cur, unvisited):
+    """
+    Prune the search state of a directed graph and list the moves worth trying from cur.
+
+    Each unvisited vertex needs an arc in from cur or another unvisited
+    vertex and an arc out to start or another unvisited vertex, start needs
+    an arc in from an unvisited vertex, a vertex that only cur can enter must
+    be visited next and only one vertex may be left with start as its only exit.
+
+    Returns:
+        list: Candidate next vertices, least constrained last; empty if the state is dead.
+    """
+    start_bit = 1 << start
+    sources = unvisited | (1 << cur)
+    targets = unvisited | start_bit
+
+    if not in_adj[start] & unvisited:
+        return []
+
+    forced = 0
+    start_forced = 0
+    options = []
+    rest = unvisited
+    while rest:
+        low_bit = rest & -rest
+        w = low_bit.bit_length() - 1
+        exits = adj[w] & targets
+        entries = in_adj[w] & sources
+        if not exits or not entries:
+            return []
+        if exits == start_bit:
+            start_forced += 1
+        if adj[cur] & low_bit:
+            if entries == 1 << cur:
+                forced |= low_bit
+            options.append((exits.bit_count(), w))
+        rest ^= low_bit
+
+    if forced & (forced - 1) or start_forced > 1:
+        return []
+    if forced:
+        return [_lowest_index(forced)]
+    options.sort(reverse=True)
+    return [w for _, w in options]
+
+
+def _start_vertex(adj):
+    return min(range(len(adj)), key=lambda v: adj[v].bit_count())
+
+
+def _moves(adj, path, unvisited, in_adj=None):
+    """
+    List the moves worth trying after a path from the start vertex, least constrained last.
+    """
+    if len(path) == 1:
+        return sorted(_bits(adj[path[0]]), key=lambda v: -adj[v].bit_count())
+    if in_adj is not None:
+        return _next_directed_moves(adj, in_adj, path[0], path[-1], unvisited)
+    return _next_moves(adj, path[0], path[-1], unvisited)
+
+
+def backtrack_cycle(adj, budget=None, prefix=None, in_adj=None):
+    """
+    Find a Hamiltonian cycle with a pruned depth-first search over adjacency bitsets.
+
+    The search starts from a minimum degree vertex, tries the most constrained
+    neighbour first and prunes with the checks in _next_moves, or
+    _next_directed_moves for directed graphs.
+
+    Args:
+        adj (list): Adjacency bitsets as returned by adjacency_bitsets
+        budget (Budget, optional): Search budget: Defaults to None.
+        prefix (list, optional): Only search the cycles that start with this path, as
+            listed by path_prefixes: Defaults to None (the whole search).
+        in_adj (list, optional): In-neighbour bitsets of a directed graph, whose adj then
+            holds the out-neighbours: Defaults to None (undirected).
+
+    Returns:
+        list or None: Vertex indices of a Hamiltonian cycle, None if there is none
+        Raises BudgetExhausted if the budget runs out first.
+    """
+    n = len(adj)
+    path = [_start_vertex(adj)] if prefix is None else list(prefix)
+    start_bit = 1 << path[0]
+    unvisited = (1 << n) - 1
+    for v in path:
+        unvisited ^= 1 << v
+
+    stack = [_moves(adj, path, unvisited, in_adj)]
+    nodes = 0
+
+    try:
+        while stack:
+            moves = stack[-1]
+            if not moves:
+                stack.pop()
+                unvisited |= 1 << path.pop()
+                continue
+            if budget is not None:
+                budget.check()
+
+            nodes += 1
+            w = moves.pop()
+            path.append(w)
+            unvisited ^= 1 << w
+            if not unvisited:
+                if adj[w] & start_bit:
+                    return path
+                stack.append([])
+            else:
+                stack.append(_moves(adj, path, unvisited, in_adj))
+    finally:
+        count("hamiltonian.nodes", nodes)
+
+    return None
+
+
+def path_prefixes(adj, number, in_adj=None):
+    """
+    Split the backtracking search into independent subtrees, one per path prefix.
+
+    The search tree of backtrack_cycle is expanded level by level until it
+    has at least number open paths (or the paths are one vertex short of a
+    cycle). Every Hamiltonian cycle the search can find starts with exactly
+    one of the prefixes, and the prefixes are listed in the order the search
+    would try them.
+
+    Args:
+        adj (list): Adjacency bitsets as returned by adjacency_bitsets
+        number (int): Number of prefixes wanted
+        in_adj (list, optional): In-neighbour bitsets of a directed graph: Defaults to None (undirected).
+
+    Returns:
+        list: Paths of vertex indices from the start vertex, empty if every branch is dead.
+    """
+    n = len(adj)
+    frontier = [[_start_vertex(adj)]]
+    while frontier and len(frontier) < number and len(frontier[0]) < n - 1:
+        expanded = []
+        for path in frontier:
+            unvisited = (1 << n) - 1
+            for v in path:
+                unvisited ^= 1 << v
+            expanded.extend(path + [w] for w in reversed(_moves(adj, path, unvisited, in_adj)))
+        frontier = expanded
+    return frontier
+
+
+def _prefix_task(adj, in_adj, prefix, budget):
+    """
+    Search the subtree of one path prefix as a parallel task.
+
+    Returns:
+        list or None: A Hamiltonian cycle, None if the subtree has none or the budget ran out.
+    """
+    try:
+        return backtrack_cycle(adj, budget, prefix, in_adj)
+    except BudgetExhausted:
+        return None
+
+
+def hamiltonian_cycle_from_bitsets(nodes, adj, max_steps=None, timeout=None, budget=None, workers=None,
+                                   in_adj=None):
+    """
+    Exactly decide whether a graph given as adjacency bitsets has a Hamiltonian cycle.
+
+    The single entry point behind hamiltonian_decision, which describes the
+    pre-filters tried before the search. With workers, a backtracking search
+    is split into PREFIXES_PER_WORKER path prefixes per worker (see
+    path_prefixes), searched across a process pool. The first worker to find
+    a cycle stops all the others.
+
+    Args:
+        nodes (list): The original nodes, indexed by their bitset label
+        adj (list): Adjacency bitsets as returned by adjacency_bitsets
+        max_steps (int, optional): Maximum number of search steps: Defaults to None (unlimited).
+        timeout (float, optional): Maximum search time in seconds: Defaults to None (unlimited).
+        budget (Budget, optional): Budget with a cancellation token, used instead of max_steps and timeout: Defaults to None.
+        workers (int, optional): Number of worker processes: Defaults to None (search in this process).
+        in_adj (list, optional): In-neighbour bitsets of a directed graph, whose adj then
+            holds the out-neighbours: Defaults to None (undirected).
+
+    Returns:
+        tuple: (has_cycle, cycle, tier), see hamiltonian_decision.
+    """
+    has_cycle, cycle, tier = _run_tiers(nodes, adj, max_steps, timeout, budget, workers, in_adj)
+    if enabled():
+        count(f"hamiltonian.tier.{tier}")
+    return has_cycle, cycle, tier
+
+
+def _run_tiers(nodes, adj, max_steps, timeout, budget, workers, in_adj):
+    n = len(nodes)
+    if n < (2 if in_adj is not None else 3):
+        return False, None, "trivial"
+    with stage("hamiltonian.prefilter"):
+        if in_adj is None:
+            tier, cycle = _sufficient_tier(adj)
+            if tier is not None:
+                return True, [nodes[i] for i in cycle], tier
+        tier = _necessary_tier(adj, in_adj)
+        if tier is not None:
+            return False, None, tier
+
+    budget = make_budget(budget, timeout=timeout, max_steps=max_steps)
+    tier = "held_karp" if n <= HELD_KARP_MAX_NODES else "backtrack"
+    with stage("hamiltonian.search"):
+        if workers is not None and workers > 1 and n > HELD_KARP_MAX_NODES:
+            return (*_parallel_backtrack(nodes, adj, budget, workers, in_adj), tier)
+        try:
+            if n <= HELD_KARP_MAX_NODES:
+                cycle = held_karp_cycle(adj, budget, in_adj)
+            else:
+                cycle = backtrack_cycle(adj, budget, in_adj=in_adj)
+        except BudgetExhausted:
+            return None, None, tier
+
+    if cycle is None:
+        return False, None, tier
+    return True, [nodes[i] for i in cycle], tier
+
+
+def _parallel_backtrack(nodes, adj, budget, workers, in_adj=None):
+    tasks = [(adj, in_adj, prefix) for prefix in path_prefixes(adj, workers * PREFIXES_PER_WORKER, in_adj)]
+    results = run_tasks(_prefix_task, tasks, workers, budget)
+    for cycle in results:
+        if cycle is not None:
+            # Closing the iterator sets the shared flag that stops the other workers
+            results.close()
+            return True, [nodes[i] for i in cycle]
+    if budget is not None and budget.exhausted:
+        return None, None
+    return False, None
+
+
+def hamiltonian_decision(G, max_steps=None, timeout=None, budget=None, workers=None):
+    """
+    Exactly decide whether a graph has a Hamiltonian cycle, recording which tier decided.
+
+    Polynomial tiers run first. The sufficient conditions (Dirac, Ore,
+    Chvátal, then a complete Bondy-Chvátal closure) prove a cycle exists and
+    one is built from the closure in O(n) per removed closure edge. Then the
+    necessary conditions (minimum degree 2, edges forced by degree-2 vertices,
+    2-connectivity, balanced sides of a bipartite graph, no 2-vertex cut
+    leaving three components) can rule a cycle out. Only when no tier settles
+    it does the exponential search run: Held-Karp up to HELD_KARP_MAX_NODES
+    nodes, the pruned backtracking search beyond. Directed graphs only have
+    the minimum in/out degree and strong connectivity checks.
+
+    Every decision adds 1 to the profiling counter "hamiltonian.tier.<tier>",
+    so a Profile shows how much of a workload the pre-filters settle.
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph, directed or undirected
+        max_steps (int, optional): Maximum number of search steps: Defaults to None (unlimited).
+        timeout (float, optional): Maximum search time in seconds: Defaults to None (unlimited).
+        budget (Budget, optional): Budget with a cancellation token, used instead of max_steps and timeout: Defaults to None.
+        workers (int, optional): Number of worker processes for the backtracking search: Defaults to None
+            (search in this process).
+
+    Returns:
+        tuple: (has_cycle, cycle, tier) with has_cycle and cycle as in find_hamiltonian_cycle
+        and tier the name from TIERS of the check or search that decided.
+    """
+    graph = as_compact(G)
+    if graph.directed:
+        return hamiltonian_cycle_from_bitsets(list(graph.nodes), list(graph.adj), max_steps, timeout, budget,
+                                              workers, list(graph.in_adj))
+    nodes, adj = adjacency_bitsets(graph)
+    return hamiltonian_cycle_from_bitsets(nodes, adj, max_steps, timeout, budget, workers)
+
+
+def find_hamiltonian_cycle(G, max_steps=None, timeout=None, budget=None, workers=None):
+    """
+    Exactly decide whether a graph has a Hamiltonian cycle.
+
+    Polynomial sufficient and necessary conditions are tried first (see
+    hamiltonian_decision). Otherwise graphs with at most HELD_KARP_MAX_NODES
+    nodes are solved with the Held-Karp dynamic program, larger ones with the
+    pruned backtracking search. For a directed graph the cycle follows the
+    arcs, and two nodes with arcs both ways form a Hamiltonian cycle.
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph, directed or undirected
+        max_steps (int, optional): Maximum number of search steps: Defaults to None (unlimited).
+        timeout (float, optional): Maximum search time in seconds: Defaults to None (unlimited).
+        budget (Budget, optional): Budget with a cancellation token, used instead of max_steps and timeout: Defaults to None.
+        workers (int, optional): Number of worker processes for the backtracking search: Defaults to None
+            (search in this process).
+
+    Returns:
+        tuple: (True, cycle) if a Hamiltonian cycle exists, (False, None) if none exists
+        and (None, None) if the budget ran out before the search could decide.
+    """
+    has_cycle, cycle, _ = hamiltonian_decision(G, max_steps=max_steps, timeout=timeout, budget=budget,
+                                               workers=workers)
+    return has_cycle, cycle
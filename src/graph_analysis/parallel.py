@@ -0,0 +1,119 @@
+import contextlib
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from .budget import Budget, CancellationToken
+
+# Seconds between two checks of the caller's budget while the workers search
+POLL_INTERVAL = 0.05
+
+# Tasks queued per worker, so a worker never waits for the parent to submit more
+TASKS_PER_WORKER = 2
+
+# Set in each worker process by _init_worker
+_worker_cancel = None
+
+
+def _init_worker(event):
+    global _worker_cancel
+    _worker_cancel = CancellationToken(event)
+
+
+def worker_token():
+    """
+    Return the CancellationToken shared by the workers of worker_pool, None outside a worker.
+    """
+    return _worker_cancel
+
+
+@contextlib.contextmanager
+def worker_pool(workers):
+    """
+    Start a process pool whose workers share one cancellation flag.
+
+    Tasks read the flag through worker_token(). Leaving the block sets it, so
+    running tasks stop within a few steps, and drops the tasks not started yet.
+
+    Args:
+        workers (int): Number of worker processes
+
+    Yields:
+        tuple: (ProcessPoolExecutor, the shared multiprocessing Event).
+    """
+    context = multiprocessing.get_context()
+    stop = context.Event()
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                   initializer=_init_worker, initargs=(stop,))
+    try:
+        yield executor, stop
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_task(function, args, max_steps):
+    """
+    Run one task in a worker under a budget that stops with the shared flag.
+
+    Returns:
+        tuple: (result, steps spent, reason the task's budget ran out or None).
+    """
+    budget = Budget(max_steps=max_steps, cancel=worker_token())
+    result = function(*args, budget)
+    return result, budget.steps, budget.reason
+
+
+def run_tasks(function, tasks, workers=None, budget=None):
+    """
+    Run function(*task, budget) for every task, splitting one search across processes.
+
+    Each task must return its result even when its budget runs out, so the
+    caller can merge partial results. Tasks are submitted in order (put the
+    most expensive first) and results are yielded as they complete.
+
+    The workers share one early-exit flag. It is set when the caller's budget
+    runs out (its timeout or cancellation token is polled every POLL_INTERVAL
+    seconds) and when the caller stops iterating, e.g. once one task found
+    what it was looking for, so every running task stops within a few steps.
+    A step limit is split loosely: each task may spend the steps left when it
+    was submitted, and the steps of finished tasks are charged to budget.
+    Afterwards budget.exhausted tells whether every task ran to completion.
+
+    Args:
+        function (callable): Module level function taking the task arguments and a Budget
+        tasks (iterable): Argument tuples, one per task
+        workers (int, optional): Number of worker processes, 1 or None runs the tasks in this
+            process under budget: Defaults to None.
+        budget (Budget, optional): Budget of the whole search: Defaults to None (unlimited).
+
+    Yields:
+        object: The result of each task, in completion order.
+    """
+    tasks = iter(tasks)
+    if not workers or workers == 1:
+        for args in tasks:
+            yield function(*args, budget)
+            if budget is not None and budget.exhausted:
+                return
+        return
+
+    running = set()
+    with worker_pool(workers) as (executor, stop):
+        while True:
+            while not stop.is_set() and len(running) < workers * TASKS_PER_WORKER:
+                args = next(tasks, None)
+                if args is None:
+                    break
+                max_steps = None
+                if budget is not None and budget.max_steps is not None:
+                    max_steps = max(budget.max_steps - budget.steps, 0)
+                running.add(executor.submit(_run_task, function, args, max_steps))
+            if not running:
+                break
+            done, running = wait(running, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            if budget is not None and not budget.spend(0):
+                stop.set()
+            for future in done:
+                result, steps, _ = future.result()
+                if budget is not None and not budget.spend(steps):
+                    stop.set()
+                yield result
@@ -0,0 +1,153 @@
+import contextlib
+import json
+import marshal
+import threading
+import time
+
+# Profiles currently collecting, shared by every thread; while it is empty
+# stage() and count() do nothing
+_active = []
+
+# Per-thread stack of open stages as [name, start time, seconds spent in nested stages]
+_local = threading.local()
+
+# Serialises the updates of the active profiles from concurrent threads
+_lock = threading.RLock()
+
+_DISABLED = contextlib.nullcontext()
+
+
+class Profile:
+    """
+    Collect the stage timers and counters of everything run while it is active.
+
+    Used as a context manager; profiles can be nested and each one sees
+    every event. Stages nest per thread, and a profile collects the events
+    of every thread of the process while it is active. Only the current
+    process is measured, so searches split across worker processes report
+    their stage times but not their counters.
+
+    timers maps a stage name to {"calls", "seconds", "own_seconds"}, own
+    time excluding nested stages, and counters maps a counter name to its
+    total. Stage and counter names are dotted, e.g. "hamiltonian.nodes".
+    """
+
+    def __init__(self, callback=None):
+        """
+        Args:
+            callback (callable, optional): Called as callback(name, seconds) whenever a stage ends: Defaults to None.
+        """
+        self.callback = callback
+        self.timers = {}
+        self.counters = {}
+        # (caller, stage) -> [calls, seconds, own seconds], for the pstats dump
+        self._calls = {}
+
+    def __enter__(self):
+        with _lock:
+            _active.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        with _lock:
+            _active.remove(self)
+
+    def _record(self, name, caller, seconds, own):
+        timer = self.timers.setdefault(name, {"calls": 0, "seconds": 0.0, "own_seconds": 0.0})
+        timer["calls"] += 1
+        timer["seconds"] += seconds
+        timer["own_seconds"] += own
+        call = self._calls.setdefault((caller, name), [0, 0.0, 0.0])
+        call[0] += 1
+        call[1] += seconds
+        call[2] += own
+        if self.callback is not None:
+            self.callback(name, seconds)
+
+    def to_dict(self):
+        return {"timers": self.timers, "counters": self.counters}
+
+    def write_json(self, path):
+        """
+        Write the timers and counters as a JSON object.
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    def dump_stats(self, path):
+        """
+        Write the stage timers as a pstats file, one pseudo-function per stage.
+
+        The file loads with pstats.Stats(path) and the usual viewers (e.g.
+        snakeviz), nested stages showing up as callees of their parent.
+        """
+        def key(name):
+            return ("graph_analysis", 0, name)
+
+        stats = {}
+        for (caller, name), (calls, seconds, own) in self._calls.items():
+            cc, nc, tt, ct, callers = stats.get(key(name), (0, 0, 0.0, 0.0, {}))
+            if caller is not None:
+                callers[key(caller)] = (calls, calls, own, seconds)
+            stats[key(name)] = (cc + calls, nc + calls, tt + own, ct + seconds, callers)
+        with open(path, "wb") as f:
+            marshal.dump(stats, f)
+
+
+def _open_stages():
+    stages = getattr(_local, "stages", None)
+    if stages is None:
+        stages = _local.stages = []
+    return stages
+
+
+class _Stage:
+    __slots__ = ("name", "stages")
+
+    def __init__(self, name):
+        self.name = name
+        self.stages = _open_stages()
+
+    def __enter__(self):
+        self.stages.append([self.name, time.perf_counter(), 0.0])
+
+    def __exit__(self, *exc_info):
+        stages = self.stages
+        name, start, nested = stages.pop()
+        seconds = time.perf_counter() - start
+        caller = None
+        if stages:
+            stages[-1][2] += seconds
+            caller = stages[-1][0]
+        with _lock:
+            for profile in _active:
+                profile._record(name, caller, seconds, seconds - nested)
+
+
+def stage(name):
+    """
+    Time a block as one call of the stage name, when a Profile is active.
+
+    Returns:
+        A context manager; a shared no-op one when nothing is being profiled.
+    """
+    if not _active:
+        return _DISABLED
+    return _Stage(name)
+
+
+def count(name, amount=1):
+    """
+    Add amount to the counter name of every active Profile.
+    """
+    with _lock:
+        for profile in _active:
+            profile.counters[name] = profile.counters.get(name, 0) + amount
+
+
+def enabled():
+    """
+    Check if a Profile is active, to skip gathering numbers nobody collects.
+    """
+    return bool(_active)
@@ -1,63 +1,416 @@
-import matplotlib.pyplot as plt
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
 import networkx as nx
+import numpy as np
+from .compact import as_compact, graph_fingerprint
 
-def visualize_graph(G, is_connected, degrees, hamiltonian_cycle=None, eulerian_circuit=None, output_path=None):
+LAYOUTS = ("auto", "circular", "shell", "spring")
+
+# Up to this many nodes "spring" is NetworkX's exact, seeded Fruchterman-Reingold
+SPRING_EXACT_MAX_NODES = 500
+
+# Iterations of the approximate spring layout used above SPRING_EXACT_MAX_NODES
+SPRING_ITERATIONS = 50
+
+# Nodes per grid cell of the approximate spring layout; cells further away act as one mass
+SPRING_CELL_SIZE = 8
+
+# Above this many nodes labels are dropped and nodes and edges drawn thin
+LARGE_GRAPH_NODES = 200
+
+# Layouts computed for each graph, dropped with the graph
+_layouts = weakref.WeakKeyDictionary()
+
+
+def _edge_array(graph):
     """
-    Visualize the graph and display connectivity and degree information
+    Return the edges of a compact graph (self-loops left out) as an (m, 2) index array.
+    """
+    rows = np.repeat(np.arange(len(graph)), np.diff(graph.indptr))
+    keep = rows < graph.indices
+    return np.column_stack((rows[keep], graph.indices[keep]))
+
+
+def _repulsion(pos, k, cells):
+    """
+    Approximate the Fruchterman-Reingold repulsion k^2 / d between all pairs of nodes.
+
+    The nodes are split into cells x cells rectangles holding about the same
+    number of nodes (columns by x rank, then rows by y rank within each
+    column). Each node is pushed exactly by the other nodes of its own cell,
+    and by every other cell as a single mass at the cell's centroid (a one
+    level Barnes-Hut approximation), so an iteration takes O(n^2 / SPRING_CELL_SIZE)
+    cheap matrix operations rather than O(n^2) pairs.
+    """
+    n = len(pos)
+    column = np.empty(n, dtype=np.int64)
+    column[np.argsort(pos[:, 0], kind="stable")] = np.arange(n) * cells // n
+    order = np.lexsort((pos[:, 1], column))
+    column_size = np.bincount(column, minlength=cells)
+    column_start = np.concatenate(([0], np.cumsum(column_size)[:-1]))
+    rank = np.arange(n) - column_start[column[order]]
+    cell = np.empty(n, dtype=np.int64)
+    cell[order] = column[order] * cells + rank * cells // column_size[column[order]]
+
+    mass = np.bincount(cell, minlength=cells * cells)
+    occupied = np.flatnonzero(mass)
+    centres = np.column_stack((np.bincount(cell, pos[:, 0], cells * cells)[occupied],
+                               np.bincount(cell, pos[:, 1], cells * cells)[occupied])) / mass[occupied, None]
+    weight = k * k * mass[occupied]
+
+    # sum_c w_c (p - c_c) / |p - c_c|^2 as matrix products, in blocks of nodes to bound memory
+    force = np.zeros_like(pos)
+    block = max(1, (1 << 20) // len(occupied))
+    centre_norms = (centres ** 2).sum(axis=1)
+    slot = np.searchsorted(occupied, cell)
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        part = pos[start:stop]
+        dist2 = (part ** 2).sum(axis=1)[:, None] + centre_norms[None, :] - 2 * part @ centres.T
+        scale = weight / np.maximum(dist2, 1e-9)
+        scale[np.arange(stop - start), slot[start:stop]] = 0.0
+        force[start:stop] = part * scale.sum(axis=1)[:, None] - scale @ centres
+
+    # Exact pushes inside each cell, all cells at once padded to the largest one
+    by_cell = np.argsort(cell, kind="stable")
+    cell_start = np.concatenate(([0], np.cumsum(mass)[:-1]))
+    members = np.full((cells * cells, mass.max()), -1)
+    members[cell[by_cell], np.arange(n) - cell_start[cell[by_cell]]] = by_cell
+    members = members[occupied]
+    valid = members >= 0
+    points = pos[members]
+    delta = points[:, :, None, :] - points[:, None, :, :]
+    dist2 = (delta ** 2).sum(axis=3)
+    dist2[~(valid[:, :, None] & valid[:, None, :])] = np.inf
+    dist2[:, np.arange(members.shape[1]), np.arange(members.shape[1])] = np.inf
+    near = (delta * (k * k / np.maximum(dist2, 1e-9))[:, :, :, None]).sum(axis=2)
+    force[members[valid]] += near[valid]
+    return force
+
+
+def _approximate_spring_layout(graph, seed, iterations=SPRING_ITERATIONS):
+    """
+    Seeded Fruchterman-Reingold layout with grid approximated repulsion, for large graphs.
+
+    Returns:
+        numpy.ndarray: (n, 2) positions by node index, scaled to [-1, 1].
+    """
+    n = len(graph)
+    pos = np.random.default_rng(seed).random((n, 2))
+    if n < 2:
+        return pos
+    edges = _edge_array(graph)
+    u, v = edges[:, 0], edges[:, 1]
+    k = 1.0 / np.sqrt(n)
+    cells = max(1, int(np.sqrt(n / SPRING_CELL_SIZE)))
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        force = _repulsion(pos, k, cells)
+        delta = pos[u] - pos[v]
+        pull = delta * (np.sqrt((delta ** 2).sum(axis=1)) / k)[:, None]
+        np.add.at(force, u, -pull)
+        np.add.at(force, v, pull)
+        length = np.maximum(np.sqrt((force ** 2).sum(axis=1)), 1e-9)
+        pos += force * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+    return nx.rescale_layout(pos)
+
+
+def _cycle_order(graph):
+    """
+    Return the node indices of a graph that is one cycle in order around it, else None.
+    """
+    if len(graph) < 3 or graph.loops or not (graph.degrees == 2).all() or not graph.is_connected():
+        return None
+    order = [0]
+    previous = -1
+    while True:
+        a, b = graph.neighbors(order[-1]).tolist()
+        step = b if a == previous else a
+        if step == 0:
+            return order
+        previous = order[-1]
+        order.append(step)
+
+
+def _shells(graph):
+    """
+    Group node indices into shells by breadth-first distance from the highest degree node of each component.
+    """
+    shells = []
+    seen = np.zeros(len(graph), dtype=bool)
+    degrees = graph.degrees
+    for component in sorted(graph.components(), key=len, reverse=True):
+        root = max(component, key=lambda i: degrees[i])
+        frontier = [root]
+        seen[root] = True
+        depth = 0
+        while frontier:
+            if depth == len(shells):
+                shells.append([])
+            shells[depth].extend(frontier)
+            following = []
+            for i in frontier:
+                for j in graph.neighbors(i).tolist():
+                    if not seen[j]:
+                        seen[j] = True
+                        following.append(j)
+            frontier = following
+            depth += 1
+    return shells
+
+
+def _compute_layout(G, graph, layout, seed, order):
+    n = len(graph)
+    if layout == "auto":
+        if order is not None or _cycle_order(graph) is not None:
+            layout = "circular"
+        else:
+            layout = "spring"
+
+    pos = np.zeros((n, 2))
+    if layout == "circular":
+        if order is None:
+            order = _cycle_order(graph)
+        placed = list(order) if order is not None else []
+        in_order = set(placed)
+        placed.extend(i for i in range(n) if i not in in_order)
+        angles = 2 * np.pi * np.arange(n) / max(n, 1)
+        pos[placed] = np.column_stack((np.cos(angles), np.sin(angles)))
+    elif layout == "shell":
+        shells = _shells(graph)
+        for depth, shell in enumerate(shells):
+            radius = depth / max(len(shells) - 1, 1) if len(shells) > 1 else 0.0
+            angles = 2 * np.pi * np.arange(len(shell)) / len(shell)
+            pos[shell] = radius * np.column_stack((np.cos(angles), np.sin(angles)))
+    elif n <= SPRING_EXACT_MAX_NODES:
+        H = G if isinstance(G, nx.Graph) else graph.to_networkx()
+        exact = nx.spring_layout(H, seed=seed)
+        pos = np.array([exact[node] for node in graph.nodes]).reshape(-1, 2)
+    else:
+        pos = _approximate_spring_layout(graph, seed)
+    return pos
+
+
+def graph_layout(G, layout="auto", seed=0, cycle=None):
+    """
+    Compute (or reuse) the node positions of a graph.
+
+    "circular" places the nodes on a circle, in the order of cycle if given
+    (e.g. a Hamiltonian cycle, which then draws as the circle itself) or around
+    the graph when it is a single cycle. "shell" places them on concentric
+    circles by distance from a hub. "spring" is a seeded force-directed layout,
+    exact up to SPRING_EXACT_MAX_NODES nodes and grid approximated (Barnes-Hut
+    style) above. "auto" picks circular for cycles and spring otherwise.
+
+    Layouts are remembered per graph, layout, seed and cycle while the graph
+    is unchanged, so rendering the same graph again skips the layout.
 
     Args:
-        G (object): A NetworkX graph object
-        is_connected (bool): Boolean indicating if the graph is connected
-        degrees (dict): A dictionary of vertex degrees
-        hamiltonian_cycle (list, optional): List of nodes forming a Hamiltonian cycle
-        eulerian_circuit (list, optional): List of nodes forming an Eulerian circuit
-        output_path (path, optional): Optional path to save the graph image: Defaults to None.
+        G (object): A NetworkX graph object or CompactGraph
+        layout (str, optional): One of LAYOUTS: Defaults to "auto".
+        seed (int, optional): Random seed of the spring layout: Defaults to 0.
+        cycle (list, optional): Nodes to place in order around the circular layout: Defaults to None.
 
     Returns:
-        None
+        dict: (x, y) numpy position keyed by node.
     """
-    plt.figure(figsize=(10, 8))
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}, expected one of {', '.join(LAYOUTS)}")
+    return dict(zip(as_compact(G).nodes, _layout_array(G, layout, seed, cycle)))
 
-    pos = nx.spring_layout(G)
 
-    nx.draw(G, pos, with_labels=True, node_color='lightblue', node_size=500, edge_color='gray', width=1, alpha=0.7)
+def _layout_array(G, layout, seed, cycle):
+    """
+    Return the cached (n, 2) positions by node index of graph_layout.
+    """
+    graph = as_compact(G).to_undirected()
+    key = (layout, seed, None if cycle is None else tuple(cycle))
+    fingerprint = graph_fingerprint(G)
+    try:
+        cached = _layouts.setdefault(G, {})
+    except TypeError:
+        cached = {}
+    entry = cached.get(key)
+    if entry is not None and entry[0] == fingerprint:
+        return entry[1]
 
-    if hamiltonian_cycle:
-        hamiltonian_edges = list(zip(hamiltonian_cycle, hamiltonian_cycle[1:] + [hamiltonian_cycle[0]]))
-        nx.draw_networkx_edges(G, pos, edgelist=hamiltonian_edges, 
-                              width=2.5, edge_color='red', style='dotted', alpha=0.8)
+    order = None if cycle is None else [graph.index[node] for node in cycle]
+    pos = _compute_layout(G, graph, layout, seed, order)
+    cached[key] = (fingerprint, pos)
+    return pos
+
+
+def _path_segments(graph, pos, path, closed):
+    """
+    Return the line segments of the edges along a node path that exist in the graph.
+    """
+    index = [graph.index[node] for node in path]
+    pairs = list(zip(index, index[1:] + index[:1] if closed else index[1:]))
+    pairs = [(i, j) for i, j in pairs if i != j and graph.adj[i] >> j & 1]
+    if not pairs:
+        return np.zeros((0, 2, 2))
+    pairs = np.array(pairs)
+    return np.stack((pos[pairs[:, 0]], pos[pairs[:, 1]]), axis=1)
 
+
+def draw_graph(G, ax, hamiltonian_cycle=None, eulerian_circuit=None, title=None, layout="auto", seed=0):
+    """
+    Draw a graph onto matplotlib axes, every group of edges as one LineCollection.
+
+    Graphs with more than LARGE_GRAPH_NODES nodes are drawn without labels,
+    with small markers and thin, rasterized edges.
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph
+        ax (object): matplotlib Axes to draw on
+        hamiltonian_cycle (list, optional): List of nodes forming a Hamiltonian cycle, drawn dotted red
+        eulerian_circuit (list, optional): List of nodes forming an Eulerian circuit, drawn green
+        title (str, optional): Axes title: Defaults to None.
+        layout (str, optional): One of LAYOUTS, see graph_layout: Defaults to "auto".
+        seed (int, optional): Random seed of the spring layout: Defaults to 0.
+    """
+    from matplotlib.collections import LineCollection
+
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}, expected one of {', '.join(LAYOUTS)}")
+    graph = as_compact(G).to_undirected()
+    pos = _layout_array(G, layout, seed, hamiltonian_cycle if layout in ("auto", "circular") else None)
+    large = len(graph) > LARGE_GRAPH_NODES
+
+    edges = _edge_array(graph)
+    ax.add_collection(LineCollection(np.stack((pos[edges[:, 0]], pos[edges[:, 1]]), axis=1),
+                                     colors="gray", linewidths=0.3 if large else 1.0,
+                                     alpha=0.4 if large else 0.7, rasterized=large, zorder=1))
+    if hamiltonian_cycle:
+        ax.add_collection(LineCollection(_path_segments(graph, pos, hamiltonian_cycle, closed=True),
+                                         colors="red", linewidths=2.5, linestyles="dotted", alpha=0.8, zorder=2))
     if eulerian_circuit and len(eulerian_circuit) > 1:
-        print(f"Eulerian circuit nodes: {eulerian_circuit}")
-        eulerian_edges = []
-        for i in range(len(eulerian_circuit) - 1):
-            source = eulerian_circuit[i]
-            target = eulerian_circuit[i + 1]
-            # Ensure the edge exists in the graph
-            if G.has_edge(source, target):
-                eulerian_edges.append((source, target))
-            else:
-                print(f"Warning: Edge ({source}, {target}) not found in graph")
-        
-        print(f"Eulerian edges to draw: {eulerian_edges}")
-        if eulerian_edges:  # Only draw if we have valid edges
-            nx.draw_networkx_edges(G, pos, edgelist=eulerian_edges, 
-                                width=2.0, edge_color='green', alpha=0.8)
+        ax.add_collection(LineCollection(_path_segments(graph, pos, eulerian_circuit, closed=False),
+                                         colors="green", linewidths=2.0, alpha=0.8, zorder=2))
+
+    ax.scatter(pos[:, 0], pos[:, 1], s=4 if large else 500, c="lightblue",
+               edgecolors="none", alpha=0.9, zorder=3)
+    if not large:
+        for node, (x, y) in zip(graph.nodes, pos.tolist()):
+            ax.text(x, y, str(node), ha="center", va="center", fontsize=10, zorder=4)
 
+    ax.set_aspect("equal")
+    ax.autoscale_view()
+    ax.margins(0.05)
+    ax.set_axis_off()
+    if title:
+        ax.set_title(title, fontsize=16)
+
+
+def _title(is_connected, hamiltonian_cycle, eulerian_circuit):
     title = "Connected Graph" if is_connected else "Disconnected Graph"
     if hamiltonian_cycle:
         title += " (Has Hamiltonian Cycle)"
     if eulerian_circuit:
         title += " (Has Eulerian Circuit)"
-    plt.title(title, fontsize=16)
+    return title
+
+
+def save_graph_image(G, output_path, is_connected=None, hamiltonian_cycle=None, eulerian_circuit=None,
+                     layout="auto", seed=0, dpi=100):
+    """
+    Render a graph straight to an image file with the Agg canvas, without pyplot.
+
+    Nothing global is touched (no pyplot figure manager, no backend switch),
+    so this works headless and in worker processes.
+
+    Args:
+        G (object): A NetworkX graph object or CompactGraph
+        output_path (path): Image file, its extension picks the format
+        is_connected (bool, optional): Connectivity for the title: Defaults to None (computed).
+        hamiltonian_cycle (list, optional): List of nodes forming a Hamiltonian cycle
+        eulerian_circuit (list, optional): List of nodes forming an Eulerian circuit
+        layout (str, optional): One of LAYOUTS, see graph_layout: Defaults to "auto".
+        seed (int, optional): Random seed of the spring layout: Defaults to 0.
+        dpi (int, optional): Resolution of raster images: Defaults to 100.
+
+    Returns:
+        path: output_path.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    if is_connected is None:
+        is_connected = as_compact(G).is_connected()
+    figure = Figure(figsize=(10, 8))
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    draw_graph(G, ax, hamiltonian_cycle, eulerian_circuit, _title(is_connected, hamiltonian_cycle, eulerian_circuit),
+               layout=layout, seed=seed)
+    figure.tight_layout()
+    figure.savefig(output_path, dpi=dpi)
+    return output_path
+
+
+def _save_job(job, layout, seed):
+    G, output_path, *options = job
+    return save_graph_image(G, output_path, **(options[0] if options else {}), layout=layout, seed=seed)
 
-    plt.tight_layout()
 
+def render_graphs(jobs, workers=None, layout="auto", seed=0):
+    """
+    Save many graph images across a process pool.
+
+    Args:
+        jobs (iterable): (G, output_path) or (G, output_path, options) tuples, options being
+            keyword arguments of save_graph_image (is_connected, hamiltonian_cycle, ...)
+        workers (int, optional): Number of worker processes, 1 renders in this process: Defaults to os.cpu_count().
+        layout (str, optional): One of LAYOUTS, see graph_layout: Defaults to "auto".
+        seed (int, optional): Random seed of the spring layouts: Defaults to 0.
+
+    Returns:
+        list: The output paths, in the order of jobs.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [_save_job(job, layout, seed) for job in jobs]
+    jobs = list(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_save_job, jobs, [layout] * len(jobs), [seed] * len(jobs),
+                                 chunksize=max(1, len(jobs) // (4 * workers))))
+
+
+def visualize_graph(G, is_connected, degrees, hamiltonian_cycle=None, eulerian_circuit=None, output_path=None,
+                    layout="auto", seed=0):
+    """
+    Visualize the graph and display connectivity and degree information
+
+    With output_path the image is saved headless through save_graph_image,
+    otherwise it is shown in a pyplot window.
+
+    Args:
+        G (object): A NetworkX graph object
+        is_connected (bool): Boolean indicating if the graph is connected
+        degrees (dict): A dictionary of vertex degrees
+        hamiltonian_cycle (list, optional): List of nodes forming a Hamiltonian cycle
+        eulerian_circuit (list, optional): List of nodes forming an Eulerian circuit
+        output_path (path, optional): Optional path to save the graph image: Defaults to None.
+        layout (str, optional): One of LAYOUTS, see graph_layout: Defaults to "auto".
+        seed (int, optional): Random seed of the spring layout: Defaults to 0.
+
+    Returns:
+        None
+    """
     if output_path:
-        plt.savefig(output_path)
-        plt.close()
-    else:
-        plt.show()
+        save_graph_image(G, output_path, is_connected, hamiltonian_cycle, eulerian_circuit, layout=layout, seed=seed)
+        return
+
+    # Imported here so that analysing graphs never pays for matplotlib
+    import matplotlib.pyplot as plt
+
+    figure, ax = plt.subplots(figsize=(10, 8))
+    draw_graph(G, ax, hamiltonian_cycle, eulerian_circuit, _title(is_connected, hamiltonian_cycle, eulerian_circuit),
+               layout=layout, seed=seed)
+    figure.tight_layout()
+    plt.show()
 
 def print_graph_info(is_connected, degrees, cycle_count, circuit_count, has_hamiltonian, has_eulerian, hamiltonian_cycle=None, eulerian_circuit=None):
     """
@@ -66,8 +419,9 @@ def print_graph_info(is_connected, degrees, cycle_count, circuit_count, has_hami
     Args:
         is_connected (bool): Boolean indicating if the graph is connected
         degrees (dict): A dictionary of vertex degrees
-        cycle_count (int): Number of cycles in the graph
-        has_hamiltonian (bool): Boolean indicating if the graph has a Hamiltonian cycle
+        cycle_count (int): Number of cycles in the graph, a PartialCount prints as "≥ N (reason)"
+        circuit_count (int): Number of circuits in the graph
+        has_hamiltonian (bool): Boolean indicating if the graph has a Hamiltonian cycle, None if undecided
         has_eulerian (bool): Boolean indicating if the graph has an Eulerian circuit
         hamiltonian_cycle (list, optional): List of nodes forming a Hamiltonian cycle
         eulerian_circuit (list, optional): List of nodes forming an Eulerian circuit
@@ -78,7 +432,10 @@ def print_graph_info(is_connected, degrees, cycle_count, circuit_count, has_hami
     print(f"Graph is {'connected' if is_connected else 'disconnected'}")
     print(f"Total number of cycles: {cycle_count}")
     print(f"Total number of circuits: {circuit_count}")
-    print(f"Has Hamiltonian cycle: {'Yes' if has_hamiltonian else 'No'}")
+    if has_hamiltonian is None:
+        print("Has Hamiltonian cycle: Unknown (search stopped early)")
+    else:
+        print(f"Has Hamiltonian cycle: {'Yes' if has_hamiltonian else 'No'}")
     print(f"Has Eulerian circuit: {'Yes' if has_eulerian else 'No'}")
     
     if hamiltonian_cycle:
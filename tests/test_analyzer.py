@@ -0,0 +1,65 @@
+import networkx as nx
+import pytest
+
+from graph_analysis.analyzer import METRICS, GraphAnalysis, analyze_graph
+from graph_analysis.budget import is_partial
+from graph_analysis.compact import CompactGraph
+
+
+def test_legacy_tuple():
+    is_connected, degrees, cycle_count, circuit_count, has_hamiltonian, cycle, has_eulerian, circuit = \
+        analyze_graph(nx.cycle_graph(5))
+    assert is_connected and has_hamiltonian and has_eulerian
+    assert cycle_count == 1 and circuit_count == 1
+    assert sorted(cycle) == list(range(5)) and circuit[0] == circuit[-1]
+
+
+@pytest.mark.parametrize("metrics", [["connectivity"], ["degrees", "cycles"], ["hamiltonian", "eulerian"]])
+def test_only_requested_fields_are_returned(metrics):
+    result = analyze_graph(nx.petersen_graph(), metrics=metrics)
+    assert isinstance(result, GraphAnalysis)
+    assert result.metrics == tuple(metrics)
+    full = analyze_graph(nx.petersen_graph(), metrics=METRICS).to_dict()
+    returned = result.to_dict()
+    assert returned and all(returned[field] == full[field] for field in returned)
+    others = [name for name in METRICS if name not in metrics]
+    for field in analyze_graph(nx.petersen_graph(), metrics=others).to_dict():
+        assert field not in returned
+
+
+def test_unknown_metric_is_rejected():
+    with pytest.raises(ValueError):
+        analyze_graph(nx.cycle_graph(4), metrics=["girth"])
+
+
+def test_results_are_reused_until_the_graph_changes():
+    G = nx.complete_graph(5)
+    first = analyze_graph(G, metrics=["cycles"])
+    assert "cycles" in first.timings
+    again = analyze_graph(G, metrics=["cycles"])
+    assert "cycles" not in again.timings and again.cycle_count == first.cycle_count == 37
+
+    G.remove_edge(0, 1)
+    changed = analyze_graph(G, metrics=["cycles"])
+    assert "cycles" in changed.timings
+    assert changed.cycle_count == len(list(nx.simple_cycles(G)))
+
+
+def test_partial_results_are_recorded_and_not_reused():
+    G = nx.complete_graph(12)
+    result = analyze_graph(G, metrics=["cycles", "connectivity"], timeout=0.01)
+    assert result.partial == ("cycles",)
+    assert is_partial(result.cycle_count)
+    again = analyze_graph(G, metrics=["cycles"], timeout=0.01)
+    assert "cycles" in again.timings and again.partial == ("cycles",)
+
+
+def test_compact_graphs_give_the_same_analysis():
+    G = nx.dodecahedral_graph()
+    metrics = ["connectivity", "degrees", "cycles", "hamiltonian", "eulerian", "cyclomatic"]
+    expected = analyze_graph(G, metrics=metrics).to_dict()
+    result = analyze_graph(CompactGraph.from_networkx(G), metrics=metrics).to_dict()
+    assert result["cycle_count"] == expected["cycle_count"]
+    assert result["is_connected"] == expected["is_connected"]
+    assert result["has_hamiltonian"] == expected["has_hamiltonian"]
+    assert result["cyclomatic_number"] == expected["cyclomatic_number"]
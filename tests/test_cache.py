@@ -0,0 +1,138 @@
+import random
+
+import networkx as nx
+import pytest
+
+from graph_analysis.analyzer import analyze_graph
+from graph_analysis.cache import AnalysisCache
+
+METRICS = ["connectivity", "cycles", "hamiltonian", "eulerian"]
+
+
+def shuffled_copy(G, seed=0):
+    nodes = list(G)
+    labels = [f"n{k}" for k in range(len(nodes))]
+    random.Random(seed).shuffle(labels)
+    H = nx.Graph()
+    H.add_nodes_from(random.Random(seed + 1).sample(labels, len(labels)))
+    H.add_edges_from((labels[u], labels[v]) for u, v in G.edges())
+    return H
+
+
+def results_of(G):
+    result = analyze_graph(G, metrics=METRICS)
+    return {
+        "connectivity": {"is_connected": result.is_connected, "num_components": result.num_components},
+        "cycles": {"cycle_count": result.cycle_count, "cycle_lengths": result.cycle_lengths},
+        "hamiltonian": {"has_hamiltonian": result.has_hamiltonian, "hamiltonian_cycle": result.hamiltonian_cycle,
+                        "hamiltonian_tier": result.hamiltonian_tier},
+        "eulerian": {"has_eulerian": result.has_eulerian, "eulerian_circuit": result.eulerian_circuit},
+    }
+
+
+def is_closed_walk(G, walk):
+    return all(G.has_edge(walk[k - 1], walk[k]) for k in range(1, len(walk)))
+
+
+def test_isomorphic_graph_hits_with_relabelled_witnesses():
+    G = nx.circulant_graph(8, [1, 2])
+    cache = AnalysisCache()
+    cache.store(G, results_of(G))
+    H = shuffled_copy(G)
+    found = cache.lookup(H)
+    assert set(found) == set(METRICS)
+    assert found["cycles"]["cycle_count"] == len(list(nx.simple_cycles(G)))
+    cycle = found["hamiltonian"]["hamiltonian_cycle"]
+    assert sorted(cycle) == sorted(H) and is_closed_walk(H, cycle + cycle[:1])
+    circuit = found["eulerian"]["eulerian_circuit"]
+    assert circuit[0] == circuit[-1] and len(circuit) == H.number_of_edges() + 1 and is_closed_walk(H, circuit)
+
+
+def test_analyze_graph_uses_the_cache():
+    cache = AnalysisCache()
+    G = nx.petersen_graph()
+    analyze_graph(G, metrics=METRICS, cache=cache)
+    result = analyze_graph(shuffled_copy(G), metrics=METRICS, cache=cache)
+    assert result.timings == {}
+    assert result.has_hamiltonian is False and result.cycle_count == 57
+
+
+def test_wl_hash_collision_is_a_miss():
+    # Both are 2-regular on 6 nodes, which Weisfeiler-Lehman cannot tell apart
+    cycle, triangles = nx.cycle_graph(6), nx.disjoint_union(nx.cycle_graph(3), nx.cycle_graph(3))
+    cache = AnalysisCache()
+    cache.store(cycle, results_of(cycle))
+    assert cache.lookup(triangles) == {}
+    assert cache.collisions == 1
+    cache.store(triangles, results_of(triangles))
+    assert cache.lookup(triangles)["connectivity"]["num_components"] == 2
+    assert cache.lookup(cycle)["connectivity"]["num_components"] == 1
+    assert len(cache) == 2
+
+
+def test_least_recently_used_bucket_is_evicted():
+    graphs = [nx.cycle_graph(n) for n in (4, 5, 6)]
+    cache = AnalysisCache(maxsize=2)
+    cache.store(graphs[0], results_of(graphs[0]))
+    cache.store(graphs[1], results_of(graphs[1]))
+    assert cache.lookup(graphs[0])
+    cache.store(graphs[2], results_of(graphs[2]))
+    assert cache.lookup(graphs[1]) == {}
+    assert cache.lookup(graphs[0]) and cache.lookup(graphs[2])
+
+
+def test_lookup_misses_do_not_evict():
+    G = nx.cycle_graph(5)
+    cache = AnalysisCache(maxsize=2)
+    cache.store(G, results_of(G))
+    for n in range(2, 6):
+        assert cache.lookup(nx.path_graph(n)) == {}
+    assert cache.lookup(G)["cycles"]["cycle_count"] == 1
+
+
+def test_hit_and_miss_counters():
+    G = nx.complete_graph(4)
+    cache = AnalysisCache()
+    assert cache.hit_rate is None
+    cache.lookup(G)
+    cache.store(G, {"cycles": results_of(G)["cycles"]})
+    assert cache.lookup(G, ["cycles"])
+    # Only some of the requested metrics are cached
+    cache.lookup(G, ["cycles", "hamiltonian"])
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.stats["hit_rate"] == pytest.approx(1 / 3)
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+
+def test_shelve_round_trip(tmp_path):
+    path = str(tmp_path / "cache")
+    G = nx.dodecahedral_graph()
+    with AnalysisCache(path=path) as cache:
+        cache.store(G, results_of(G))
+    H = shuffled_copy(G, seed=3)
+    with AnalysisCache(path=path) as cache:
+        found = cache.lookup(H)
+    assert found["cycles"]["cycle_count"] == results_of(G)["cycles"]["cycle_count"]
+    cycle = found["hamiltonian"]["hamiltonian_cycle"]
+    assert sorted(cycle) == sorted(H) and is_closed_walk(H, cycle + cycle[:1])
+
+
+def test_disk_only_cache(tmp_path):
+    with AnalysisCache(maxsize=0, path=str(tmp_path / "cache")) as cache:
+        first = analyze_graph(nx.cycle_graph(5), metrics=["cycles"], cache=cache)
+        second = analyze_graph(shuffled_copy(nx.cycle_graph(5)), metrics=["cycles"], cache=cache)
+        assert first.cycle_count == second.cycle_count == 1
+        assert cache.hits == 1 and len(cache) == 0
+
+
+def test_negative_maxsize_is_rejected():
+    with pytest.raises(ValueError):
+        AnalysisCache(maxsize=-1)
+
+
+def test_directed_graphs_are_not_cached():
+    cache = AnalysisCache()
+    D = nx.DiGraph([(0, 1), (1, 2), (2, 0)])
+    cache.store(D, {"cycles": {"cycle_count": 1}})
+    assert cache.lookup(D) == {} and len(cache) == 0
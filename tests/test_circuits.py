@@ -0,0 +1,59 @@
+import random
+
+import networkx as nx
+
+from graph_analysis.circuits import count_circuits, count_circuits_by_length, find_circuits, iter_circuits
+
+
+def normalize(circuit):
+    body = list(circuit[:-1])
+    forms = []
+    for sequence in (body, body[::-1]):
+        for i in range(len(sequence)):
+            forms.append(tuple(sequence[i:] + sequence[:i]))
+    return min(forms)
+
+
+def brute_force_circuits(G):
+    found = set()
+
+    def extend(path, used):
+        for w in G[path[-1]]:
+            edge = frozenset((path[-1], w))
+            if edge in used:
+                continue
+            if w == path[0]:
+                found.add(normalize(path + [w]))
+            extend(path + [w], used | {edge})
+
+    for v in G:
+        extend([v], frozenset())
+    return found
+
+
+def random_graphs(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        n = rng.randint(3, 6)
+        yield nx.gnp_random_graph(n, rng.choice([0.4, 0.6]), seed=rng.randrange(2 ** 32))
+
+
+def test_iter_circuits_matches_brute_force():
+    for G in random_graphs(60):
+        circuits = list(iter_circuits(G))
+        assert all(circuit[0] == circuit[-1] == min(circuit) for circuit in circuits)
+        normalized = [normalize(circuit) for circuit in circuits]
+        assert len(normalized) == len(set(normalized))
+        assert set(normalized) == brute_force_circuits(G)
+
+
+def test_counts_and_limits():
+    for G in random_graphs(30, seed=1):
+        expected = {}
+        for circuit in brute_force_circuits(G):
+            expected[len(circuit)] = expected.get(len(circuit), 0) + 1
+        assert count_circuits_by_length(G) == dict(sorted(expected.items()))
+        assert count_circuits(G) == sum(expected.values())
+        assert all(len(circuit) - 1 <= 4 for circuit in find_circuits(G, max_length=4))
+        assert len(find_circuits(G, max_length=4)) == sum(n for length, n in expected.items() if length <= 4)
+        assert len(find_circuits(G, max_count=2)) == min(2, sum(expected.values()))
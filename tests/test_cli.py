@@ -0,0 +1,105 @@
+import json
+import pstats
+
+import networkx as nx
+import pytest
+
+from graph_analysis.cli import DEFAULT_METRICS, main
+from graph_analysis.graph_io import write_graphs
+
+
+def run(capsys, *argv):
+    status = main(list(argv))
+    lines = capsys.readouterr().out.splitlines()
+    return status, [json.loads(line) for line in lines]
+
+
+def test_default_metrics_skip_the_exponential_ones(capsys):
+    status, records = run(capsys, "generate", "--nodes", "8", "--seed", "1")
+    assert status == 0 and len(records) == 1
+    record = records[0]
+    G = nx.Graph(record["edges"])
+    G.add_nodes_from(record["nodes"])
+    assert (record["num_nodes"], record["num_edges"]) == (8, G.number_of_edges())
+    assert record["attempts"] >= 1 and "generate" in record["timings"]
+    assert set(record["timings"]["metrics"]) <= {"prepare", *DEFAULT_METRICS}
+    analysis = record["analysis"]
+    assert analysis["is_connected"] == nx.is_connected(G)
+    assert analysis["cyclomatic_number"] == G.number_of_edges() - G.number_of_nodes() + nx.number_connected_components(G)
+    assert "cycle_count" not in analysis and "has_hamiltonian" not in analysis and "cycle_estimate" not in analysis
+
+
+def test_named_metrics_are_analysed(capsys):
+    status, [record] = run(capsys, "generate", "--nodes", "7", "--probability", "0.6", "--seed", "2",
+                           "--metrics", "cycles,hamiltonian")
+    G = nx.Graph(record["edges"])
+    assert status == 0
+    assert record["analysis"]["cycle_count"] == len(list(nx.simple_cycles(G)))
+    assert "has_hamiltonian" in record["analysis"] and "is_connected" not in record["analysis"]
+
+
+def test_generate_several_graphs_meeting_conditions(capsys):
+    status, records = run(capsys, "generate", "--nodes", "8", "--count", "3", "--seed", "3", "--workers", "1",
+                          "--connected", "--even", "--no-analysis")
+    assert status == 0
+    assert [record["index"] for record in records] == [0, 1, 2]
+    for record in records:
+        G = nx.Graph(record["edges"])
+        G.add_nodes_from(record["nodes"])
+        assert nx.is_connected(G) and all(degree % 2 == 0 for _, degree in G.degree())
+
+
+def test_failed_generation_exits_with_an_error_record(capsys):
+    status, records = run(capsys, "generate", "--nodes", "6", "--probability", "0", "--connected",
+                          "--strategy", "rejection", "--max-attempts", "3", "--no-analysis")
+    assert status == 1
+    assert records == [{"error": "generated 0 of 1 graphs within 3 attempts per graph"}]
+
+
+def test_analyze_reads_graph_files(capsys, tmp_path):
+    path = str(tmp_path / "graphs.ndjson")
+    write_graphs([nx.cycle_graph(5), nx.path_graph(4)], path)
+    status, records = run(capsys, "analyze", path, "--metrics", "connectivity,eulerian")
+    assert status == 0
+    assert [(record["index"], record["source"]) for record in records] == [(0, path), (1, path)]
+    assert [record["analysis"]["has_eulerian"] for record in records] == [True, False]
+
+
+def test_batch_reports_every_job(capsys, tmp_path):
+    spec = tmp_path / "jobs.json"
+    spec.write_text(json.dumps([
+        {"nodes": 6, "seed": 4, "count": 2},
+        {"nodes": 6, "probability": 0, "conditions": {"must_be_connected": True}, "strategy": "rejection",
+         "max_attempts": 2},
+    ]))
+    status, records = run(capsys, "batch", str(spec), "--no-analysis", "--workers", "1")
+    assert status == 1
+    assert [(record["job"], record.get("index")) for record in records] == [(0, 0), (0, 1), (1, None)]
+    assert "error" in records[-1]
+
+
+def test_profile_json_fields(capsys, tmp_path):
+    path = tmp_path / "profile.json"
+    status, _ = run(capsys, "generate", "--nodes", "8", "--seed", "5", "--metrics", "connectivity,cycles",
+                    "--profile", str(path))
+    profile = json.loads(path.read_text())
+    assert status == 0
+    assert set(profile) == {"timers", "counters"}
+    for name in ("generate.sample", "analyze.prepare", "analyze.connectivity", "analyze.cycles"):
+        assert set(profile["timers"][name]) == {"calls", "seconds", "own_seconds"}
+    assert profile["counters"]["generate.attempts"] >= 1
+
+
+def test_profile_pstats_dump(capsys, tmp_path):
+    path = str(tmp_path / "profile.prof")
+    status, _ = run(capsys, "generate", "--nodes", "8", "--seed", "6", "--profile", path)
+    stats = pstats.Stats(path)
+    assert status == 0
+    assert ("graph_analysis", 0, "analyze.connectivity") in stats.stats
+
+
+def test_unknown_metric_is_a_usage_error(capsys):
+    with pytest.raises(SystemExit) as error:
+        main(["generate", "--metrics", "cycles,girth"])
+    assert error.value.code == 2
+    assert "unknown metrics girth" in capsys.readouterr().err
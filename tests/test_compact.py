@@ -0,0 +1,70 @@
+import random
+
+import networkx as nx
+import pytest
+
+from graph_analysis.compact import CompactGraph, as_compact, graph_fingerprint
+
+
+def random_graphs(count, directed=False, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        G = nx.gnp_random_graph(rng.randint(0, 15), rng.choice([0.1, 0.4]), seed=rng.randrange(2 ** 32),
+                                directed=directed)
+        G = nx.relabel_nodes(G, {v: f"v{v}" for v in G})
+        if len(G) and rng.random() < 0.5:
+            v = rng.choice(list(G))
+            G.add_edge(v, v)
+        yield G
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_networkx_round_trip(directed):
+    for G in random_graphs(40, directed):
+        graph = CompactGraph.from_networkx(G)
+        assert graph.directed == directed
+        assert graph.number_of_nodes() == len(G) and graph.number_of_edges() == G.number_of_edges()
+        assert graph.degrees.tolist() == [G.degree(v) for v in G]
+        assert nx.utils.graphs_equal(graph.to_networkx(), G)
+
+
+def test_adjacency_views_agree():
+    for G in random_graphs(20, directed=True, seed=1):
+        graph = CompactGraph.from_networkx(G)
+        for i, v in enumerate(graph.nodes):
+            out = {graph.index[w] for w in G.successors(v) if w != v}
+            into = {graph.index[w] for w in G.predecessors(v) if w != v}
+            assert set(graph.neighbors(i).tolist()) == out
+            assert {j for j in range(len(graph)) if graph.adj[i] >> j & 1} == out
+            assert {j for j in range(len(graph)) if graph.in_adj[i] >> j & 1} == into
+
+
+def test_duplicate_edges_collapse():
+    graph = CompactGraph(range(3), [(0, 1), (1, 0), (0, 1), (1, 2), (2, 2)])
+    assert sorted(graph.edges()) == [(0, 1), (1, 2), (2, 2)]
+
+
+def test_compact_graphs_refuse_mutation():
+    graph = as_compact(nx.path_graph(4))
+    with pytest.raises(AttributeError):
+        graph.nodes = (0, 1)
+    with pytest.raises(AttributeError):
+        graph.loops = (0,)
+    with pytest.raises(ValueError):
+        graph.indices[0] = 3
+    assert as_compact(graph) is graph
+
+
+def test_fingerprint_tracks_structure():
+    G = nx.cycle_graph(4)
+    before = graph_fingerprint(G)
+    assert graph_fingerprint(G.copy()) == before
+    # Node order decides the compact indices, so reordered nodes count as a change
+    assert graph_fingerprint(nx.Graph([(1, 2), (2, 3), (3, 0), (0, 1)])) != before
+    G.nodes[0]["colour"] = "red"
+    assert graph_fingerprint(G) == before
+    G.add_edge(0, 2)
+    assert graph_fingerprint(G) != before
+    D = nx.DiGraph([(0, 1)])
+    assert graph_fingerprint(D) != graph_fingerprint(nx.DiGraph([(1, 0)]))
+    assert graph_fingerprint(CompactGraph.from_networkx(G)) is None
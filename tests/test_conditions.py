@@ -0,0 +1,159 @@
+import multiprocessing
+import time
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from graph_analysis import conditions as conditions_module
+from graph_analysis.budget import CancellationToken
+from graph_analysis.compact import CompactGraph
+from graph_analysis.conditions import (ConditionPipeline, check_graph_conditons, construct_graph_with_conditions,
+                                       generate_graph_with_conditions, generate_graphs_with_conditions)
+from graph_analysis.generator import generate_random_graph
+from graph_analysis.hamiltonian import find_hamiltonian_cycle
+
+FLAGS = ["must_be_connected", "all_verticies_even_degree", "must_be_closed", "must_have_hamiltonian"]
+
+
+def meets(G, conditions):
+    """
+    Check the conditions directly with NetworkX, independently of ConditionPipeline.
+    """
+    if conditions.get("must_be_connected") and not nx.is_connected(G):
+        return False
+    if conditions.get("all_verticies_even_degree") and any(degree % 2 for _, degree in G.degree()):
+        return False
+    if conditions.get("must_be_closed") and any(degree == 0 for _, degree in G.degree()):
+        return False
+    if conditions.get("must_have_hamiltonian") and not find_hamiltonian_cycle(G)[0]:
+        return False
+    return True
+
+
+@pytest.mark.parametrize("strategy", ["constructive", "hybrid"])
+@pytest.mark.parametrize("flag", FLAGS)
+def test_generated_graphs_meet_each_flag(strategy, flag):
+    conditions = {flag: True}
+    for seed in range(5):
+        G, attempts, _ = generate_graph_with_conditions(14, 0.1, conditions, max_attempts=200, strategy=strategy,
+                                                        seed=seed)
+        assert G is not None and len(G) == 14
+        assert meets(G, conditions)
+
+
+@pytest.mark.parametrize("strategy", ["constructive", "hybrid"])
+def test_sparse_connected_even_graphs(strategy):
+    # Rejection practically never finds these at p = 0.02
+    conditions = {"must_be_connected": True, "all_verticies_even_degree": True, "must_be_closed": True}
+    for seed in range(5):
+        G, _, _ = generate_graph_with_conditions(40, 0.02, conditions, max_attempts=500, strategy=strategy, seed=seed)
+        assert G is not None
+        assert meets(G, conditions)
+
+
+def test_planted_hamiltonian_cycle_survives_parity_repair():
+    conditions = {"must_have_hamiltonian": True, "all_verticies_even_degree": True}
+    for seed in range(10):
+        G = construct_graph_with_conditions(12, 0.05, conditions, seed=seed)
+        assert G is not None
+        assert meets(G, conditions)
+
+
+def test_constructive_generation_is_seeded():
+    conditions = {"must_be_connected": True, "all_verticies_even_degree": True}
+    first, _, _ = generate_graph_with_conditions(20, 0.1, conditions, strategy="constructive", seed=3)
+    second, _, _ = generate_graph_with_conditions(20, 0.1, conditions, strategy="constructive", seed=3)
+    assert sorted(first.edges()) == sorted(second.edges())
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        generate_graph_with_conditions(5, 0.5, {}, strategy="greedy")
+    with pytest.raises(ValueError):
+        next(generate_graphs_with_conditions(1, 5, 0.5, {}, workers=1, strategy="greedy"))
+
+
+BATCH_CONDITIONS = {"must_be_connected": True, "all_verticies_even_degree": True}
+
+
+def edge_lists(batch):
+    return [sorted(G.edges()) for G, _, _ in batch]
+
+
+def test_batch_is_the_same_for_any_number_of_workers():
+    serial = edge_lists(generate_graphs_with_conditions(6, 8, 0.5, BATCH_CONDITIONS, workers=1, seed=4))
+    parallel = edge_lists(generate_graphs_with_conditions(6, 8, 0.5, BATCH_CONDITIONS, workers=2, seed=4))
+    assert len(serial) == 6
+    assert serial == parallel
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("strategy", ["rejection", "hybrid"])
+def test_batch_yields_n_graphs_meeting_the_conditions(workers, strategy):
+    batch = list(generate_graphs_with_conditions(5, 8, 0.5, BATCH_CONDITIONS, workers=workers, seed=1,
+                                                 strategy=strategy))
+    assert len(batch) == 5
+    assert all(meets(G, BATCH_CONDITIONS) and len(G) == 8 for G, _, _ in batch)
+
+
+def test_cancelled_token_stops_generation():
+    token = CancellationToken()
+    token.cancel()
+    G, attempts, _ = generate_graph_with_conditions(10, 0.3, {}, cancel=token)
+    assert G is None and attempts == 0
+
+
+def test_tasks_stop_once_the_pool_flag_is_set(monkeypatch):
+    token = CancellationToken()
+    token.cancel()
+    monkeypatch.setattr(conditions_module, "worker_token", lambda: token)
+    edges, attempts, _ = conditions_module._generate_chunk(300, 0.5, BATCH_CONDITIONS, 64, "rejection", 0)
+    assert edges is None and attempts == 0
+
+
+def test_closing_the_batch_early_shuts_the_pool_down():
+    batch = generate_graphs_with_conditions(50, 30, 0.5, {"must_be_closed": True}, workers=2, seed=0)
+    next(batch)
+    batch.close()
+    deadline = time.perf_counter() + 10
+    while multiprocessing.active_children() and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    assert not multiprocessing.active_children()
+
+
+def condition_sets():
+    for mask in range(16):
+        yield {flag: True for k, flag in enumerate(FLAGS) if mask >> k & 1}
+
+
+def test_pipeline_matches_the_direct_checks():
+    rng = np.random.default_rng(0)
+    graphs = [generate_random_graph(int(rng.integers(1, 9)), float(rng.choice([0.2, 0.5, 0.8])), seed=rng)
+              for _ in range(60)]
+    for conditions in condition_sets():
+        pipeline = ConditionPipeline(conditions)
+        for G in graphs:
+            expected = meets(G, conditions)
+            assert pipeline(G)[0] == expected
+            assert pipeline(CompactGraph.from_networkx(G))[0] == expected
+            assert check_graph_conditons(G, conditions)[0] == expected
+
+
+def test_pipeline_records_rejections():
+    pipeline = ConditionPipeline({"must_be_connected": True, "all_verticies_even_degree": True})
+    graphs = [nx.cycle_graph(5), nx.path_graph(5), nx.Graph([(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3)])]
+    verdicts = [pipeline(G) for G in graphs]
+    assert verdicts[0] == (True, "all conditions met")
+    assert verdicts[1] == (False, "Node 0 has an odd degree.")
+    assert verdicts[2] == (False, "Graph is not connected.")
+    assert pipeline.stats == {"parity": {"checked": 3, "rejected": 1}, "connected": {"checked": 2, "rejected": 1}}
+    assert pipeline.graphs_checked == 3 and pipeline.graphs_passed == 1
+    assert pipeline.pass_rate == pytest.approx(1 / 3)
+
+
+def test_hamiltonian_pipeline_checks_cheap_conditions_first():
+    pipeline = ConditionPipeline({"must_have_hamiltonian": True})
+    assert [name for name, _ in pipeline.checks] == ["min_degree", "connected", "hamiltonian"]
+    assert pipeline(nx.path_graph(5))[0] is False
+    assert pipeline.stats["hamiltonian"]["checked"] == 0
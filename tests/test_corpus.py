@@ -0,0 +1,114 @@
+import multiprocessing
+import time
+
+import networkx as nx
+import pytest
+
+from graph_analysis import corpus
+from graph_analysis.analyzer import analyze_graph
+from graph_analysis.compact import CompactGraph
+from graph_analysis.corpus import analyze_many, estimated_cost
+
+METRICS = ["connectivity", "degrees", "cycles", "circuits", "hamiltonian", "eulerian", "cyclomatic"]
+
+# Fields that do not depend on which of several valid witnesses is found
+FIELDS = ("is_connected", "num_components", "degrees", "cycle_count", "cycle_lengths", "circuit_count",
+          "circuit_lengths", "has_hamiltonian", "has_eulerian", "cyclomatic_number")
+
+
+def mixed_corpus():
+    looped = nx.cycle_graph(4)
+    looped.add_edge(2, 2)
+    return [
+        nx.petersen_graph(),
+        nx.path_graph(5),
+        nx.relabel_nodes(nx.cycle_graph(6), {k: f"v{k}" for k in range(6)}),
+        nx.complete_graph(5),
+        nx.disjoint_union(nx.cycle_graph(3), nx.cycle_graph(4)),
+        nx.DiGraph([(0, 1), (1, 2), (2, 0), (2, 3), (3, 0)]),
+        CompactGraph.from_networkx(nx.wheel_graph(6)),
+        looped,
+        nx.empty_graph(3),
+        nx.gnp_random_graph(9, 0.4, seed=1),
+    ]
+
+
+def fields(analysis):
+    return {field: getattr(analysis, field) for field in FIELDS}
+
+
+@pytest.mark.parametrize("workers, chunksize", [(1, "auto"), (2, "auto"), (2, 3)])
+def test_results_match_serial_analysis(workers, chunksize):
+    graphs = mixed_corpus()
+    results = list(analyze_many(graphs, workers=workers, chunksize=chunksize, metrics=METRICS))
+    assert sorted(index for index, _ in results) == list(range(len(graphs)))
+    for index, analysis in results:
+        G = graphs[index]
+        assert fields(analysis) == fields(analyze_graph(G, metrics=METRICS)), index
+        cycle = analysis.hamiltonian_cycle
+        if cycle is not None:
+            assert sorted(cycle, key=str) == sorted(G.nodes if isinstance(G, CompactGraph) else G, key=str)
+
+
+def test_serial_run_dispatches_most_expensive_first():
+    graphs = [nx.path_graph(4), nx.complete_graph(5), nx.cycle_graph(9), nx.complete_graph(6), nx.path_graph(7)]
+    order = [index for index, _ in analyze_many(graphs, workers=1, metrics=["connectivity"])]
+    assert order == sorted(range(len(graphs)), key=lambda k: tuple(-c for c in estimated_cost(graphs[k])) + (k,))
+
+
+def test_lookahead_bounds_the_reordering():
+    graphs = [nx.path_graph(4), nx.complete_graph(5), nx.path_graph(3), nx.complete_graph(6)]
+    order = [index for index, _ in analyze_many(graphs, workers=1, metrics=["connectivity"], lookahead=2)]
+    # Graph 3 is only read once two earlier graphs have been dispatched
+    assert order == [1, 0, 3, 2]
+
+
+def record_chunks(monkeypatch):
+    chunks = []
+    original = corpus._chunks
+
+    def recording(pending, chunksize, workers):
+        chunk = original(pending, chunksize, workers)
+        chunks.append((chunksize, [index for index, _ in chunk]))
+        return chunk
+
+    monkeypatch.setattr(corpus, "_chunks", recording)
+    return chunks
+
+
+def test_fixed_chunksize(monkeypatch):
+    chunks = record_chunks(monkeypatch)
+    graphs = [nx.cycle_graph(n) for n in range(3, 13)]
+    results = list(analyze_many(graphs, workers=2, chunksize=4, metrics=["cycles"]))
+    assert len(results) == len(graphs)
+    assert all(size == 4 for size, _ in chunks)
+    assert sorted(len(indices) for _, indices in chunks) == [2, 4, 4]
+
+
+def test_auto_chunksize_sends_expensive_graphs_alone(monkeypatch):
+    chunks = record_chunks(monkeypatch)
+    graphs = [nx.complete_graph(7)] + [nx.cycle_graph(n) for n in range(3, 43)]
+    results = dict(analyze_many(graphs, workers=2, metrics=["connectivity"]))
+    assert sorted(results) == list(range(len(graphs)))
+    assert chunks[0] == ("auto", [0])
+    assert all(size == "auto" for size, _ in chunks)
+    assert max(len(indices) for _, indices in chunks) > 1
+
+
+@pytest.mark.parametrize("chunksize", [0, -1, 1.5, "big"])
+def test_invalid_chunksize(chunksize):
+    with pytest.raises(ValueError):
+        next(analyze_many([nx.path_graph(3)], chunksize=chunksize))
+
+
+def test_closing_early_stops_the_workers():
+    # K9 has far too many circuits to count, so its worker only stops through the shared token
+    graphs = [nx.complete_graph(9)] + [nx.path_graph(4) for _ in range(4)]
+    results = analyze_many(graphs, workers=2, metrics=["circuits"])
+    index, analysis = next(results)
+    results.close()
+    assert index >= 1 and analysis.circuit_count == 0
+    deadline = time.perf_counter() + 10
+    while multiprocessing.active_children() and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    assert not multiprocessing.active_children()
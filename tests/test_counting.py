@@ -0,0 +1,44 @@
+import random
+
+import networkx as nx
+
+from graph_analysis.budget import Budget, is_partial
+from graph_analysis.counting import count_cycles_by_length
+
+
+def networkx_counts(G, length_bound=None):
+    counts = {}
+    for cycle in nx.simple_cycles(G, length_bound=length_bound):
+        counts[len(cycle)] = counts.get(len(cycle), 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def random_graphs(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        n = rng.randint(3, 12)
+        yield nx.gnp_random_graph(n, rng.choice([0.2, 0.35, 0.5]), seed=rng.randrange(2 ** 32))
+
+
+def test_counts_match_networkx():
+    for G in random_graphs(80):
+        assert count_cycles_by_length(G) == networkx_counts(G)
+
+
+def test_max_length_matches_networkx():
+    for G in random_graphs(40, seed=1):
+        assert count_cycles_by_length(G, max_length=4) == networkx_counts(G, length_bound=4)
+
+
+def test_self_loops_and_separate_components():
+    G = nx.disjoint_union(nx.complete_graph(5), nx.cycle_graph(6))
+    G.add_edge(0, 0)
+    assert count_cycles_by_length(G) == networkx_counts(G)
+
+
+def test_budget_returns_lower_bounds():
+    G = nx.complete_graph(9)
+    counts = count_cycles_by_length(G, budget=Budget(max_steps=2000))
+    assert is_partial(counts)
+    expected = networkx_counts(G)
+    assert all(counts.get(length, 0) <= number for length, number in expected.items())
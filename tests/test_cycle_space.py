@@ -0,0 +1,66 @@
+import random
+
+import networkx as nx
+
+from graph_analysis.cycle_space import CycleSpace, cycle_basis, cyclomatic_number, minimum_cycle_basis
+
+
+def random_graphs(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        n = rng.randint(1, 14)
+        G = nx.gnp_random_graph(n, rng.choice([0.15, 0.3, 0.5]), seed=rng.randrange(2 ** 32))
+        for u, v in G.edges():
+            G[u][v]["weight"] = rng.randint(1, 9)
+        yield G
+
+
+def rank(vectors):
+    pivots = {}
+    for vector in vectors:
+        while vector:
+            top = vector.bit_length() - 1
+            if top not in pivots:
+                pivots[top] = vector
+                break
+            vector ^= pivots[top]
+    return len(pivots)
+
+
+def check_basis(G, space, cycles):
+    for cycle in cycles:
+        assert len(cycle) == len(set(cycle)) >= 3
+        assert all(G.has_edge(cycle[k - 1], cycle[k]) for k in range(len(cycle)))
+    assert rank([space.vector(cycle) for cycle in cycles]) == len(cycles)
+
+
+def weight_of(G, cycle, weight):
+    return sum(G[cycle[k - 1]][cycle[k]].get(weight, 1) if weight else 1 for k in range(len(cycle)))
+
+
+def test_cyclomatic_number_matches_networkx():
+    for G in random_graphs(60):
+        expected = len(nx.cycle_basis(G))
+        assert cyclomatic_number(G) == expected
+        assert cyclomatic_number(G) == G.number_of_edges() - len(G) + nx.number_connected_components(G)
+
+
+def test_cycle_basis_is_a_basis():
+    for G in random_graphs(60, seed=1):
+        space = CycleSpace(G)
+        cycles = cycle_basis(G)
+        assert len(cycles) == len(nx.cycle_basis(G)) == space.dimension
+        check_basis(G, space, cycles)
+        assert all(space.contains(vector) for vector in space.fundamental_basis())
+
+
+def test_minimum_cycle_basis_matches_networkx_weight():
+    for G in random_graphs(60, seed=2):
+        space = CycleSpace(G)
+        for weight in (None, "weight"):
+            cycles = minimum_cycle_basis(G, weight=weight)
+            expected = nx.minimum_cycle_basis(G, weight=weight)
+            assert len(cycles) == len(expected)
+            check_basis(G, space, cycles)
+            assert (sum(weight_of(G, cycle, weight) for cycle in cycles)
+                    == sum(weight_of(G, cycle, weight) for cycle in expected))
@@ -0,0 +1,63 @@
+import random
+
+import networkx as nx
+
+from graph_analysis.compact import as_compact
+from graph_analysis.cycles import count_cycles, find_cycles
+from graph_analysis.directed import count_directed_cycles_by_length, iter_directed_cycles, strongly_connected_components
+
+
+def random_digraphs(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        n = rng.randint(1, 10)
+        G = nx.gnp_random_graph(n, rng.choice([0.15, 0.3, 0.45]), seed=rng.randrange(2 ** 32), directed=True)
+        if rng.random() < 0.3:
+            v = rng.randrange(n)
+            G.add_edge(v, v)
+        yield G
+
+
+def rotate(cycle):
+    k = cycle.index(min(cycle))
+    return tuple(cycle[k:] + cycle[:k])
+
+
+def networkx_counts(G, length_bound=None):
+    counts = {}
+    for cycle in nx.simple_cycles(G, length_bound=length_bound):
+        counts[len(cycle)] = counts.get(len(cycle), 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def test_strongly_connected_components_match_networkx():
+    for G in random_digraphs(60):
+        graph = as_compact(G)
+        components = {frozenset(graph.nodes[v] for v in range(len(graph)) if bits >> v & 1)
+                      for bits in strongly_connected_components(graph.adj)}
+        assert components == {frozenset(c) for c in nx.strongly_connected_components(G)}
+
+
+def test_counts_match_networkx():
+    for G in random_digraphs(80, seed=1):
+        assert count_directed_cycles_by_length(G) == networkx_counts(G)
+        assert count_cycles(G) == sum(networkx_counts(G).values())
+
+
+def test_max_length_matches_networkx():
+    for G in random_digraphs(40, seed=2):
+        for length_bound in (1, 2, 3):
+            assert count_directed_cycles_by_length(G, max_length=length_bound) == networkx_counts(G, length_bound)
+
+
+def test_enumeration_matches_networkx():
+    for G in random_digraphs(60, seed=3):
+        cycles = [rotate(cycle) for cycle in iter_directed_cycles(G)]
+        assert len(cycles) == len(set(cycles))
+        assert set(cycles) == {rotate(cycle) for cycle in nx.simple_cycles(G)}
+        assert sorted(map(rotate, find_cycles(G))) == sorted(cycles)
+
+
+def test_workers_match_serial_counts():
+    G = nx.gnp_random_graph(12, 0.3, seed=5, directed=True)
+    assert count_directed_cycles_by_length(G, workers=2) == count_directed_cycles_by_length(G)
@@ -0,0 +1,75 @@
+import random
+
+import networkx as nx
+import pytest
+
+from graph_analysis.conditions import check_graph_conditons
+from graph_analysis.dynamic import DynamicGraph
+
+CONDITIONS = [
+    {"must_be_connected": True},
+    {"must_be_closed": True},
+    {"all_verticies_even_degree": True},
+    {"must_be_connected": True, "all_verticies_even_degree": True},
+    {"must_have_hamiltonian": True},
+]
+
+
+def assert_matches(dynamic, G, rng):
+    assert dynamic.number_of_edges() == G.number_of_edges()
+    assert dynamic.num_components == nx.number_connected_components(G)
+    assert dynamic.is_connected == (len(G) > 0 and nx.is_connected(G))
+    assert dynamic.num_odd == sum(1 for _, degree in G.degree() if degree % 2)
+    assert dynamic.num_isolated == sum(1 for _, degree in G.degree() if degree == 0)
+    assert dynamic.has_eulerian == (len(G) > 0 and nx.is_eulerian(G))
+    nodes = list(G)
+    if nodes:
+        u, v = rng.choice(nodes), rng.choice(nodes)
+        assert dynamic.connected(u, v) == nx.has_path(G, u, v)
+    for conditions in CONDITIONS:
+        assert check_graph_conditons(dynamic, conditions)[0] == check_graph_conditons(G, conditions)[0]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_update_stream_matches_networkx(seed):
+    rng = random.Random(seed)
+    n = 9
+    G = nx.gnp_random_graph(n, 0.3, seed=seed)
+    dynamic = DynamicGraph(G)
+    assert_matches(dynamic, G, rng)
+    for _ in range(300):
+        u, v = rng.randrange(n), rng.randrange(n)
+        action = rng.random()
+        if action < 0.45 and u != v:
+            G.add_edge(u, v)
+            dynamic.add_edge(u, v)
+        elif action < 0.9 and G.number_of_edges():
+            u, v = rng.choice(list(G.edges()))
+            G.remove_edge(u, v)
+            dynamic.remove_edge(u, v)
+        elif action < 0.95 and u in G:
+            G.remove_node(u)
+            dynamic.remove_node(u)
+        else:
+            G.add_node(u)
+            dynamic.add_node(u)
+        assert_matches(dynamic, G, rng)
+
+
+def test_batch_update():
+    G = nx.cycle_graph(8)
+    dynamic = DynamicGraph(G)
+    removed = [(0, 1), (4, 5)]
+    added = [(0, 4), (1, 5)]
+    dynamic.update(added=added, removed=removed)
+    G.remove_edges_from(removed)
+    G.add_edges_from(added)
+    assert_matches(dynamic, G, random.Random(0))
+    assert nx.utils.graphs_equal(dynamic.to_networkx(), G)
+
+
+def test_rejects_directed_graphs_and_missing_edges():
+    with pytest.raises(ValueError):
+        DynamicGraph(nx.DiGraph([(0, 1)]))
+    with pytest.raises(nx.NetworkXError):
+        DynamicGraph(nx.path_graph(3)).remove_edge(0, 2)
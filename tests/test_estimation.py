@@ -0,0 +1,108 @@
+import networkx as nx
+import pytest
+
+from graph_analysis.budget import Budget
+from graph_analysis.circuits import count_circuits_by_length
+from graph_analysis.compact import CompactGraph
+from graph_analysis.counting import count_cycles_by_length
+from graph_analysis.estimation import VECTORIZED_MAX_NODES, estimate_circuit_count, estimate_cycle_count
+
+
+def looped_petersen():
+    G = nx.petersen_graph()
+    G.add_edges_from([(0, 0), (4, 4)])
+    return G
+
+
+GRAPHS = {
+    "petersen-loops": looped_petersen,
+    "complete-6": lambda: nx.complete_graph(6),
+    "grid-3x4": lambda: nx.grid_2d_graph(3, 4),
+    "wheel-8": lambda: nx.wheel_graph(8),
+    "gnp-11-0.4": lambda: nx.gnp_random_graph(11, 0.4, seed=7),
+    "two-blocks": lambda: nx.disjoint_union(nx.complete_graph(5), nx.cycle_graph(6)),
+}
+
+
+# Graphs with few enough circuits to count them exactly
+CIRCUIT_GRAPHS = {
+    "petersen": nx.petersen_graph,
+    "complete-5": lambda: nx.complete_graph(5),
+    "grid-3x4": lambda: nx.grid_2d_graph(3, 4),
+    "wheel-8": lambda: nx.wheel_graph(8),
+    "two-blocks": lambda: nx.disjoint_union(nx.complete_graph(5), nx.cycle_graph(6)),
+}
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+@pytest.mark.parametrize("name", GRAPHS)
+def test_exact_cycle_count_lies_in_the_interval(name, vectorized):
+    G = GRAPHS[name]()
+    exact = count_cycles_by_length(G)
+    estimate = estimate_cycle_count(G, samples=4000, seed=11, confidence=0.999, vectorized=vectorized)
+    low, high = estimate.interval
+    assert low <= sum(exact.values()) <= high
+    assert estimate.samples == 4000 and not estimate.partial
+    assert set(estimate.by_length) <= set(exact)
+    assert estimate.by_length.get(1) == exact.get(1)
+
+
+@pytest.mark.parametrize("name", CIRCUIT_GRAPHS)
+def test_exact_circuit_count_lies_in_the_interval(name):
+    G = CIRCUIT_GRAPHS[name]()
+    exact = sum(count_circuits_by_length(G).values())
+    low, high = estimate_circuit_count(G, samples=4000, seed=13, confidence=0.999).interval
+    assert low <= exact <= high
+
+
+@pytest.mark.parametrize("name", ["complete-6", "grid-3x4", "gnp-11-0.4"])
+def test_vectorized_and_scalar_walks_agree(name):
+    G = GRAPHS[name]()
+    vectorized = estimate_cycle_count(G, samples=4000, seed=3, vectorized=True)
+    scalar = estimate_cycle_count(G, samples=4000, seed=3, vectorized=False)
+    # Independent estimates of the same mean: their difference is within a few standard errors
+    assert abs(vectorized.estimate - scalar.estimate) <= 4 * (vectorized.variance + scalar.variance) ** 0.5
+    assert vectorized.samples == scalar.samples
+
+
+def test_max_length_limits_the_estimate():
+    G = nx.complete_graph(6)
+    exact = sum(count for length, count in count_cycles_by_length(G).items() if length <= 4)
+    for vectorized in (True, False):
+        estimate = estimate_cycle_count(G, samples=4000, seed=5, max_length=4, confidence=0.999, vectorized=vectorized)
+        assert max(estimate.by_length) <= 4
+        assert estimate.interval[0] <= exact <= estimate.interval[1]
+
+
+def test_estimates_are_reproducible():
+    G = GRAPHS["gnp-11-0.4"]()
+    for vectorized in (True, False):
+        first = estimate_cycle_count(G, samples=500, seed=9, vectorized=vectorized)
+        second = estimate_cycle_count(CompactGraph.from_networkx(G), samples=500, seed=9, vectorized=vectorized)
+        assert (first.estimate, first.variance) == (second.estimate, second.variance)
+    first, second = (estimate_circuit_count(G, samples=500, seed=9) for _ in range(2))
+    assert first.estimate == second.estimate
+
+
+def test_large_graphs_fall_back_to_scalar_walks():
+    G = nx.circulant_graph(VECTORIZED_MAX_NODES + 10, [1, 50])
+    vectorized = estimate_cycle_count(G, samples=200, seed=2, max_length=8, vectorized=True)
+    scalar = estimate_cycle_count(G, samples=200, seed=2, max_length=8, vectorized=False)
+    assert vectorized.estimate == scalar.estimate
+
+
+@pytest.mark.parametrize("G, count", [(nx.cycle_graph(7), 1.0), (nx.balanced_tree(2, 3), 0.0), (nx.empty_graph(4), 0.0)])
+def test_single_search_paths_are_exact(G, count):
+    for vectorized in (True, False):
+        estimate = estimate_cycle_count(G, samples=50, seed=0, vectorized=vectorized)
+        assert estimate.estimate == count and estimate.variance == 0.0
+        assert estimate.interval == (count, count)
+
+
+def test_budget_stops_sampling_early():
+    G = nx.complete_graph(8)
+    for vectorized in (True, False):
+        estimate = estimate_cycle_count(G, samples=2000, seed=1, budget=Budget(max_steps=300), vectorized=vectorized)
+        assert estimate.partial and 0 < estimate.samples < 2000
+    estimate = estimate_circuit_count(G, samples=2000, seed=1, budget=Budget(max_steps=300))
+    assert estimate.partial and estimate.samples == 300
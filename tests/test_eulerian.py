@@ -0,0 +1,62 @@
+import random
+from collections import Counter
+
+import networkx as nx
+import pytest
+
+from graph_analysis.eulerian import cycle_decomposition, eulerian_circuit
+
+
+def edge_multiset(G, walk):
+    if G.is_directed():
+        return Counter(zip(walk, walk[1:]))
+    return Counter(frozenset(edge) for edge in zip(walk, walk[1:]))
+
+
+def graph_edges(G):
+    if G.is_directed():
+        return Counter(list(G.edges()))
+    return Counter(frozenset(edge) for edge in G.edges())
+
+
+def random_graphs(count, directed, seed=0):
+    rng = random.Random(seed)
+    graph_class = nx.MultiDiGraph if directed else nx.MultiGraph
+    for _ in range(count):
+        n = rng.randint(1, 9)
+        G = graph_class()
+        G.add_nodes_from(range(n))
+        # Unions of random closed walks are often Eulerian, random edges rarely
+        for _ in range(rng.randint(0, 3)):
+            walk = [rng.randrange(n) for _ in range(rng.randint(2, 6))]
+            nx.add_path(G, walk + walk[:1])
+        if rng.random() < 0.3 and n > 1:
+            G.add_edge(rng.randrange(n), rng.randrange(n))
+        yield G if rng.random() < 0.5 else (nx.DiGraph(G) if directed else nx.Graph(G))
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_eulerian_circuit_matches_networkx(directed):
+    for G in random_graphs(300, directed):
+        has_circuit, circuit = eulerian_circuit(G)
+        assert has_circuit == nx.is_eulerian(G)
+        if has_circuit:
+            assert circuit[0] == circuit[-1]
+            assert edge_multiset(G, circuit) == graph_edges(G)
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_cycle_decomposition_covers_every_edge_once(directed):
+    for G in random_graphs(300, directed, seed=1):
+        degrees_balanced = (all(G.in_degree(v) == G.out_degree(v) for v in G) if directed
+                            else all(degree % 2 == 0 for _, degree in G.degree()))
+        if not degrees_balanced:
+            with pytest.raises(nx.NetworkXError):
+                cycle_decomposition(G)
+            continue
+        used = Counter()
+        for cycle in cycle_decomposition(G):
+            assert cycle[0] == cycle[-1]
+            assert len(set(cycle[:-1])) == len(cycle) - 1
+            used += edge_multiset(G, cycle)
+        assert used == graph_edges(G)
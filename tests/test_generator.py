@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from graph_analysis.generator import (DENSE_THRESHOLD, _pair_from_index, generate_random_graph, random_edge_array,
+                                      random_graph_csr)
+
+PROBABILITIES = [DENSE_THRESHOLD / 4, DENSE_THRESHOLD, 0.6]
+
+
+@pytest.mark.parametrize("num_nodes", [2, 3, 7, 64, 1000])
+def test_pair_from_index_is_a_bijection_onto_upper_pairs(num_nodes):
+    total = num_nodes * (num_nodes - 1) // 2
+    pairs = _pair_from_index(np.arange(total, dtype=np.int64), num_nodes)
+    i, j = np.triu_indices(num_nodes, 1)
+    assert np.array_equal(pairs, np.column_stack((i, j)))
+
+
+@pytest.mark.parametrize("p", PROBABILITIES)
+def test_same_seed_gives_same_graph(p):
+    first = generate_random_graph(50, p, seed=7)
+    second = generate_random_graph(50, p, seed=7)
+    assert sorted(first.edges()) == sorted(second.edges())
+    assert list(first.nodes()) == list(range(50))
+    assert not np.array_equal(random_edge_array(50, p, seed=7), random_edge_array(50, p, seed=8))
+
+
+@pytest.mark.parametrize("p", PROBABILITIES)
+def test_edges_are_sorted_distinct_upper_pairs(p):
+    edges = random_edge_array(200, p, seed=1)
+    assert (edges[:, 0] < edges[:, 1]).all() and edges.max() < 200
+    keys = edges[:, 0] * 200 + edges[:, 1]
+    assert (np.diff(keys) > 0).all()
+
+
+@pytest.mark.parametrize("p", PROBABILITIES)
+def test_edge_counts_fit_the_binomial(p):
+    num_nodes, samples = 40, 400
+    total = num_nodes * (num_nodes - 1) // 2
+    rng = np.random.default_rng(3)
+    counts = np.array([len(random_edge_array(num_nodes, p, seed=rng)) for _ in range(samples)])
+    mean, variance = total * p, total * p * (1 - p)
+    assert abs(counts.mean() - mean) < 4 * np.sqrt(variance / samples)
+    assert 0.75 < counts.var(ddof=1) / variance < 1.25
+
+
+@pytest.mark.parametrize("p", PROBABILITIES)
+def test_every_pair_is_equally_likely(p):
+    num_nodes, samples = 12, 2000
+    rng = np.random.default_rng(4)
+    hits = np.zeros((num_nodes, num_nodes))
+    for _ in range(samples):
+        edges = random_edge_array(num_nodes, p, seed=rng)
+        hits[edges[:, 0], edges[:, 1]] += 1
+    frequencies = hits[np.triu_indices(num_nodes, 1)] / samples
+    assert np.abs(frequencies - p).max() < 5 * np.sqrt(p * (1 - p) / samples)
+
+
+def test_edge_cases():
+    assert random_edge_array(0, 0.5).shape == (0, 2)
+    assert random_edge_array(1, 0.5).shape == (0, 2)
+    assert random_edge_array(10, 0.0).shape == (0, 2)
+    assert len(random_edge_array(10, 1.0)) == 45
+
+
+def test_csr_is_symmetric():
+    indptr, indices = random_graph_csr(30, 0.3, seed=2)
+    G = generate_random_graph(30, 0.3, seed=2)
+    for v in range(30):
+        assert list(indices[indptr[v]:indptr[v + 1]]) == sorted(G[v])
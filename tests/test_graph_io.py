@@ -0,0 +1,63 @@
+import random
+
+import networkx as nx
+import pytest
+
+from graph_analysis.graph_io import FORMATS, graph6_bytes, graph6_edge_array, read_graphs, write_graphs
+
+
+def random_graphs(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        # Sizes on both sides of 63, where the graph6 size field grows
+        n = rng.choice([1, 2, 5, 17, 62, 63, 64, 100])
+        yield nx.gnp_random_graph(n, rng.choice([0.05, 0.3]), seed=rng.randrange(2 ** 32))
+
+
+def edge_set(G):
+    return {frozenset(edge) for edge in G.edges()}
+
+
+def test_graph6_bytes_matches_networkx():
+    for G in random_graphs(40):
+        assert graph6_bytes(G) == nx.to_graph6_bytes(G, header=False)
+
+
+def test_graph6_edge_array_decodes_networkx():
+    for G in random_graphs(40, seed=1):
+        n, edges = graph6_edge_array(nx.to_graph6_bytes(G))
+        assert n == len(G)
+        assert {frozenset(edge) for edge in edges.tolist()} == edge_set(G)
+        assert all(i < j for i, j in edges.tolist())
+
+
+def test_graph6_rejects_self_loops():
+    G = nx.path_graph(3)
+    G.add_edge(1, 1)
+    with pytest.raises(nx.NetworkXError):
+        graph6_bytes(G)
+
+
+@pytest.mark.parametrize("format", FORMATS)
+@pytest.mark.parametrize("suffix", ["", ".gz"])
+@pytest.mark.parametrize("compact", [False, True])
+def test_round_trip(tmp_path, format, suffix, compact):
+    graphs = list(random_graphs(12, seed=2))
+    path = tmp_path / f"graphs{suffix}"
+    assert write_graphs(iter(graphs), path, format=format) == len(graphs)
+    read = list(read_graphs(path, format=format, compact=compact))
+    assert len(read) == len(graphs)
+    for G, H in zip(graphs, read):
+        if compact:
+            H = H.to_networkx()
+        assert sorted(H.nodes()) == sorted(G.nodes())
+        assert edge_set(H) == edge_set(G)
+
+
+def test_sparse6_keeps_self_loops(tmp_path):
+    G = nx.cycle_graph(5)
+    G.add_edge(2, 2)
+    path = tmp_path / "graphs.s6"
+    write_graphs([G], path)
+    (H,) = read_graphs(path)
+    assert edge_set(H) == edge_set(G)
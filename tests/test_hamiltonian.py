@@ -0,0 +1,136 @@
+import itertools
+import random
+
+import networkx as nx
+import pytest
+
+from graph_analysis.budget import Budget, BudgetExhausted
+from graph_analysis.compact import as_compact
+from graph_analysis.hamiltonian import (TIERS, adjacency_bitsets, backtrack_cycle, find_hamiltonian_cycle,
+                                        hamiltonian_decision, held_karp_cycle)
+from graph_analysis.profiling import Profile
+
+
+def brute_force_hamiltonian(G):
+    nodes = list(G)
+    if len(nodes) < (2 if G.is_directed() else 3):
+        return False
+    first = nodes[0]
+    for rest in itertools.permutations(nodes[1:]):
+        cycle = (first,) + rest
+        if all(G.has_edge(cycle[i - 1], cycle[i]) for i in range(len(cycle))):
+            return True
+    return False
+
+
+def is_hamiltonian_cycle(G, cycle):
+    return (len(cycle) == len(G) == len(set(cycle))
+            and all(G.has_edge(cycle[i - 1], cycle[i]) for i in range(len(cycle))))
+
+
+def random_graphs(count, min_nodes=3, max_nodes=8, seed=0, directed=False):
+    rng = random.Random(seed)
+    for _ in range(count):
+        n = rng.randint(min_nodes, max_nodes)
+        yield nx.gnp_random_graph(n, rng.choice([0.3, 0.5, 0.7]), seed=rng.randrange(2 ** 32), directed=directed)
+
+
+@pytest.mark.parametrize("engine", [held_karp_cycle, backtrack_cycle])
+def test_engines_match_brute_force(engine):
+    for G in random_graphs(150):
+        nodes, adj = adjacency_bitsets(G)
+        cycle = engine(adj)
+        assert (cycle is not None) == brute_force_hamiltonian(G)
+        if cycle is not None:
+            assert is_hamiltonian_cycle(G, [nodes[i] for i in cycle])
+
+
+def test_find_hamiltonian_cycle_matches_brute_force():
+    for G in random_graphs(150, seed=1):
+        has_cycle, cycle = find_hamiltonian_cycle(G)
+        assert has_cycle == brute_force_hamiltonian(G)
+        if has_cycle:
+            assert is_hamiltonian_cycle(G, cycle)
+
+
+def test_backtracking_on_larger_graphs():
+    assert find_hamiltonian_cycle(nx.dodecahedral_graph())[0] is True
+    assert find_hamiltonian_cycle(nx.petersen_graph())[0] is False
+    nodes, adj = adjacency_bitsets(nx.petersen_graph())
+    assert backtrack_cycle(adj) is None
+
+
+def test_budget_leaves_the_check_undecided():
+    nodes, adj = adjacency_bitsets(nx.petersen_graph())
+    with pytest.raises(BudgetExhausted):
+        held_karp_cycle(adj, Budget(max_steps=10))
+    assert find_hamiltonian_cycle(nx.petersen_graph(), max_steps=10) == (None, None)
+
+
+def test_directed_graphs_follow_the_arcs():
+    for G in random_graphs(150, min_nodes=2, seed=2, directed=True):
+        has_cycle, cycle = find_hamiltonian_cycle(G)
+        assert has_cycle == brute_force_hamiltonian(G)
+        if has_cycle:
+            assert is_hamiltonian_cycle(G, cycle)
+    assert find_hamiltonian_cycle(nx.DiGraph([(0, 1), (1, 2), (0, 2)]))[0] is False
+
+
+@pytest.mark.parametrize("engine", [held_karp_cycle, backtrack_cycle])
+def test_directed_engines_match_brute_force(engine):
+    for G in random_graphs(150, seed=3, directed=True):
+        graph = as_compact(G)
+        cycle = engine(list(graph.adj), in_adj=list(graph.in_adj))
+        assert (cycle is not None) == brute_force_hamiltonian(G)
+        if cycle is not None:
+            assert is_hamiltonian_cycle(G, [graph.nodes[i] for i in cycle])
+
+
+def test_decision_matches_brute_force():
+    for G in random_graphs(300, max_nodes=9, seed=4):
+        has_cycle, cycle, tier = hamiltonian_decision(G)
+        assert tier in TIERS
+        assert has_cycle == brute_force_hamiltonian(G), tier
+        if has_cycle:
+            assert is_hamiltonian_cycle(G, cycle)
+
+
+def test_sufficient_tiers_build_valid_cycles():
+    rng = random.Random(5)
+    for _ in range(100):
+        G = nx.gnp_random_graph(rng.randint(10, 40), rng.uniform(0.4, 0.8), seed=rng.randrange(2 ** 32))
+        has_cycle, cycle, tier = hamiltonian_decision(G)
+        if tier in ("dirac", "ore", "chvatal", "closure"):
+            assert has_cycle and is_hamiltonian_cycle(G, cycle)
+
+
+def tough_cut_graph():
+    # Removing 0 and 1 leaves three triangles, although every degree is at least 4
+    G = nx.Graph()
+    for k in range(3):
+        triangle = [2 + 3 * k, 3 + 3 * k, 4 + 3 * k]
+        nx.add_cycle(G, triangle)
+        G.add_edges_from((hub, v) for hub in (0, 1) for v in triangle)
+    return G
+
+
+@pytest.mark.parametrize("G, expected", [
+    (nx.complete_graph(12), (True, "dirac")),
+    (nx.path_graph(6), (False, "min_degree")),
+    (nx.Graph([(0, 1), (1, 2), (2, 0), (0, 3), (3, 4), (4, 0)]), (False, "forced_edges")),
+    (nx.Graph([*nx.complete_graph(4).edges(), *nx.relabel_nodes(nx.complete_graph(4), lambda v: v + 3).edges()]),
+     (False, "biconnected")),
+    (nx.complete_bipartite_graph(3, 4), (False, "bipartite")),
+    (tough_cut_graph(), (False, "toughness")),
+    (nx.petersen_graph(), (False, "held_karp")),
+    (nx.dodecahedral_graph(), (True, "backtrack")),
+])
+def test_deciding_tier(G, expected):
+    has_cycle, _, tier = hamiltonian_decision(G)
+    assert (has_cycle, tier) == expected
+
+
+def test_tier_is_counted_while_profiling():
+    with Profile() as profile:
+        hamiltonian_decision(nx.complete_bipartite_graph(3, 4))
+    assert profile.counters["hamiltonian.tier.bipartite"] == 1
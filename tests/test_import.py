@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds a bare `import graph_analysis` may take in a fresh interpreter,
+# the budget the "import graph_analysis" benchmark case also enforces
+IMPORT_BUDGET = 0.05
+
+# Heavy dependencies that only the submodules behind a name may load
+FORBIDDEN = ("networkx", "numpy", "matplotlib")
+
+
+def import_package():
+    """
+    Import graph_analysis in a fresh interpreter.
+
+    Returns:
+        tuple: (names of the loaded modules, cumulative import time of graph_analysis in seconds)
+    """
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, "src"))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                             "import sys, graph_analysis; print('\\n'.join(sys.modules))"],
+                            capture_output=True, text=True, env=env, check=True)
+    seconds = None
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == "graph_analysis":
+            seconds = int(fields[1]) / 1e6
+    return set(result.stdout.split()), seconds
+
+
+def test_import_loads_no_heavy_dependencies():
+    modules, _ = import_package()
+    loaded = [name for name in FORBIDDEN if name in modules]
+    assert not loaded, f"import graph_analysis loads {', '.join(loaded)}"
+
+
+def test_import_stays_within_budget():
+    _, seconds = import_package()
+    assert seconds is not None
+    assert seconds <= IMPORT_BUDGET, f"import graph_analysis took {seconds:.3f}s, budget {IMPORT_BUDGET}s"
@@ -0,0 +1,119 @@
+import json
+import pstats
+import threading
+import time
+
+import pytest
+
+from graph_analysis import profiling
+from graph_analysis.profiling import Profile, count, enabled, stage
+
+
+def key(name):
+    return ("graph_analysis", 0, name)
+
+
+def test_nothing_is_recorded_without_a_profile():
+    assert not enabled()
+    assert stage("idle") is profiling._DISABLED
+    count("idle")
+    with Profile() as profile:
+        assert enabled()
+    assert not enabled() and profile.timers == {} and profile.counters == {}
+
+
+def test_nested_stages_split_their_own_time():
+    with Profile() as profile:
+        for _ in range(2):
+            with stage("outer"):
+                time.sleep(0.01)
+                with stage("inner"):
+                    time.sleep(0.02)
+    outer, inner = profile.timers["outer"], profile.timers["inner"]
+    assert outer["calls"] == inner["calls"] == 2
+    assert inner["own_seconds"] == inner["seconds"] >= 0.04
+    assert outer["seconds"] >= 0.06
+    assert outer["own_seconds"] == pytest.approx(outer["seconds"] - inner["seconds"])
+    assert outer["own_seconds"] >= 0.02
+
+
+def test_nested_profiles_and_callbacks():
+    ended = []
+    with Profile(callback=lambda name, seconds: ended.append(name)) as outer:
+        with stage("first"):
+            count("items", 2)
+        with Profile() as inner:
+            with stage("second"):
+                count("items")
+    assert set(outer.timers) == {"first", "second"} and outer.counters == {"items": 3}
+    assert set(inner.timers) == {"second"} and inner.counters == {"items": 1}
+    assert ended == ["first", "second"]
+
+
+def test_write_json(tmp_path):
+    path = tmp_path / "profile.json"
+    with Profile() as profile:
+        with stage("work"):
+            count("steps", 5)
+    profile.write_json(str(path))
+    assert json.loads(path.read_text()) == profile.to_dict()
+    assert json.loads(path.read_text())["counters"] == {"steps": 5}
+
+
+def test_dump_stats_loads_with_pstats(tmp_path):
+    path = str(tmp_path / "profile.prof")
+    with Profile() as profile:
+        with stage("parent"):
+            for _ in range(3):
+                with stage("child"):
+                    pass
+        with stage("child"):
+            pass
+    profile.dump_stats(path)
+    stats = pstats.Stats(path).stats
+    assert set(stats) == {key("parent"), key("child")}
+    calls, _, own, seconds, callers = stats[key("child")]
+    assert calls == 4 and callers[key("parent")][0] == 3
+    assert own == pytest.approx(profile.timers["child"]["own_seconds"])
+    assert stats[key("parent")][3] == pytest.approx(profile.timers["parent"]["seconds"])
+
+
+def test_threads_keep_their_own_stage_stacks():
+    barrier = threading.Barrier(2)
+
+    def work(name):
+        with stage(f"{name}.outer"):
+            barrier.wait()
+            with stage(f"{name}.inner"):
+                barrier.wait()
+                time.sleep(0.01)
+                count("steps", 100)
+                barrier.wait()
+            barrier.wait()
+
+    with Profile() as profile:
+        threads = [threading.Thread(target=work, args=(name,)) for name in "ab"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert profile.counters == {"steps": 200}
+    assert set(profile._calls) == {(None, "a.outer"), ("a.outer", "a.inner"), (None, "b.outer"), ("b.outer", "b.inner")}
+    for name in "ab":
+        outer, inner = profile.timers[f"{name}.outer"], profile.timers[f"{name}.inner"]
+        assert outer["own_seconds"] == pytest.approx(outer["seconds"] - inner["seconds"])
+
+
+def test_counters_from_many_threads_add_up():
+    def work():
+        for _ in range(2000):
+            count("steps")
+
+    with Profile() as profile:
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert profile.counters == {"steps": 8000}
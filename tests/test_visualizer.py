@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from graph_analysis import visualizer
+from graph_analysis.compact import CompactGraph
+from graph_analysis.visualizer import SPRING_EXACT_MAX_NODES, graph_layout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def count_layouts(monkeypatch):
+    calls = []
+    original = visualizer._compute_layout
+
+    def counting(*args):
+        calls.append(args[2])
+        return original(*args)
+
+    monkeypatch.setattr(visualizer, "_compute_layout", counting)
+    return calls
+
+
+def same_positions(first, second):
+    return first.keys() == second.keys() and all(np.array_equal(first[node], second[node]) for node in first)
+
+
+@pytest.mark.parametrize("build", [lambda: nx.petersen_graph(), lambda: nx.path_graph(SPRING_EXACT_MAX_NODES + 20)])
+def test_same_seed_gives_identical_positions(build):
+    first, second = graph_layout(build(), "spring", seed=3), graph_layout(build(), "spring", seed=3)
+    assert same_positions(first, second)
+    assert not same_positions(first, graph_layout(build(), "spring", seed=4))
+
+
+def test_layout_is_reused_while_the_graph_is_unchanged(monkeypatch):
+    calls = count_layouts(monkeypatch)
+    G = nx.petersen_graph()
+    first = graph_layout(G, seed=1)
+    second = graph_layout(G, seed=1)
+    assert calls == ["auto"] and same_positions(first, second)
+    graph_layout(G, seed=2)
+    graph_layout(G, "shell", seed=1)
+    assert calls == ["auto", "auto", "shell"]
+
+
+def test_mutating_the_graph_invalidates_the_layout(monkeypatch):
+    calls = count_layouts(monkeypatch)
+    G = nx.cycle_graph(6)
+    graph_layout(G)
+    G.add_edge(0, 3)
+    graph_layout(G)
+    G.add_node(6)
+    positions = graph_layout(G)
+    assert len(calls) == 3 and 6 in positions
+    graph_layout(G)
+    assert len(calls) == 3
+
+
+def test_compact_graphs_are_cached(monkeypatch):
+    calls = count_layouts(monkeypatch)
+    graph = CompactGraph.from_networkx(nx.wheel_graph(7))
+    assert same_positions(graph_layout(graph, "spring"), graph_layout(graph, "spring"))
+    assert len(calls) == 1
+
+
+def test_circular_layout_follows_the_cycle():
+    G = nx.complete_graph(5)
+    positions = graph_layout(G, "circular", cycle=[0, 2, 4, 1, 3])
+    angles = [np.arctan2(*positions[node][::-1]) % (2 * np.pi) for node in [0, 2, 4, 1, 3]]
+    assert angles == sorted(angles)
+
+
+def test_unknown_layout():
+    with pytest.raises(ValueError):
+        graph_layout(nx.path_graph(3), "radial")
+
+
+def test_visualizer_does_not_load_the_analyzer():
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, "src"))
+    result = subprocess.run([sys.executable, "-c", "import sys, graph_analysis.visualizer; "
+                             "print('\\n'.join(sys.modules))"], capture_output=True, text=True, env=env, check=True)
+    assert "graph_analysis.analyzer" not in result.stdout.split()
+    assert "matplotlib" not in result.stdout.split()